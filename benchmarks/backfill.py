@@ -0,0 +1,45 @@
+"""
+Backfill throughput against a fake node with per-request latency and a result cap.
+
+    python benchmarks/backfill.py --blocks 200000 --workers 8
+"""
+import argparse
+import time
+
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.testing import FakeNode, FakeProvider
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--blocks', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--window', type=int, default=10_000)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--max-results', type=int, default=5_000)
+    args = parser.parse_args()
+
+    node = FakeNode(latency=args.latency, max_results=args.max_results)
+    w3.provider = FakeProvider(node)
+    tellor = Tellor(Network.MAINNET)
+    start, end = tellor.genesis, tellor.genesis + args.blocks - 1
+
+    began = time.perf_counter()
+    count = 0
+    last = (0, -1)
+    for event in tellor.iter_logs(start, end, workers=args.workers, window=args.window):
+        key = (event['blockNumber'], event['logIndex'])
+        assert key > last, 'events out of order'
+        last = key
+        count += 1
+    elapsed = time.perf_counter() - began
+
+    print(f'{args.blocks} blocks, {count} logs, {len(node.requests)} requests in {elapsed:.2f}s')
+    print(f'{args.blocks / elapsed:,.0f} blocks/sec, {count / elapsed:,.0f} logs/sec')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Log decoding throughput of web3's ``get_event_data`` versus precompiled decoders.
+
+    python benchmarks/decode_logs.py --blocks 20000
+"""
+import argparse
+import time
+from copy import deepcopy
+from functools import partial
+
+from eth_abi.exceptions import DecodingError
+from eth_utils import event_abi_to_log_topic
+from web3 import Web3
+from web3._utils.events import get_event_data
+
+from tellor import log_decoders
+from tellor.constants import TELLOR_ABI
+from tellor.testing import FakeNode, FakeProvider
+
+
+def get_web3_decoders(w3):
+    """
+    Decoder table as it was built before precompiled decoders.
+    """
+
+    def decode_log_with_fallback(abis_to_try, log):
+        for abi in abis_to_try:
+            try:
+                log_with_replaced_topic = deepcopy(log)
+                log_with_replaced_topic['topics'][0] = event_abi_to_log_topic(abi)
+                return get_event_data(w3.codec, abi, log_with_replaced_topic)
+            except DecodingError:
+                pass
+        raise DecodingError('could not decode log')
+
+    decoders = {
+        event_abi_to_log_topic(abi): partial(get_event_data, w3.codec, abi)
+        for abi in TELLOR_ABI if abi['type'] == 'event'
+    }
+    nonce_string_abi = next(x for x in TELLOR_ABI if x.get('name') == 'NonceSubmitted')
+    nonce_bytes_abi = deepcopy(nonce_string_abi)
+    nonce_bytes_abi['inputs'][1]['type'] = 'bytes'
+    decoders[event_abi_to_log_topic(nonce_string_abi)] = partial(
+        decode_log_with_fallback, [nonce_string_abi, nonce_bytes_abi]
+    )
+    return decoders
+
+
+def bench(name, func, logs):
+    began = time.perf_counter()
+    result = func(logs)
+    elapsed = time.perf_counter() - began
+    print(f'{name:<24} {len(logs) / elapsed:>12,.0f} logs/sec')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--blocks', type=int, default=20_000)
+    args = parser.parse_args()
+
+    node = FakeNode()
+    w3 = Web3(FakeProvider(node))
+    logs = w3.eth.getLogs({'fromBlock': node.genesis, 'toBlock': node.genesis + args.blocks - 1})
+    print(f'{len(logs)} logs')
+
+    web3_decoders = get_web3_decoders(w3)
+    decoders = log_decoders.get_log_decoders()
+    expected = bench('get_event_data', partial(log_decoders.decode_logs, decoders=web3_decoders), logs)
+    result = bench('EventDecoder', partial(log_decoders.decode_logs, decoders=decoders), logs)
+    bench('EventDecoder tuples', partial(log_decoders.decode_log_tuples, decoders=decoders), logs)
+    assert result == expected
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Decoding throughput over a corpus of half valid string nonces and half malformed byte nonces.
+Compares the old copy-and-retry fallback with single pass decoding.
+
+    python benchmarks/decode_nonces.py --count 20000
+"""
+import argparse
+import time
+from copy import deepcopy
+
+from eth_abi import encode_abi
+from eth_abi.exceptions import DecodingError
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
+from web3 import Web3
+from web3._utils.abi import get_abi_input_names, get_abi_input_types, map_abi_data
+from web3._utils.events import get_event_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+
+from tellor import func_decoders, log_decoders
+from tellor.constants import TELLOR_ABI
+from tellor.testing import FakeNode, FakeProvider
+
+w3 = Web3()
+
+
+def string_and_bytes_abis(name, index):
+    string_abi = next(x for x in TELLOR_ABI if x.get('name') == name)
+    bytes_abi = deepcopy(string_abi)
+    bytes_abi['inputs'][index]['type'] = 'bytes'
+    return [string_abi, bytes_abi]
+
+
+def legacy_decode_log(abis_to_try, log):
+    for abi in abis_to_try:
+        try:
+            log_with_replaced_topic = deepcopy(log)
+            log_with_replaced_topic['topics'][0] = event_abi_to_log_topic(abi)
+            return get_event_data(w3.codec, abi, log_with_replaced_topic)
+        except DecodingError:
+            pass
+    raise DecodingError('could not decode log')
+
+
+def legacy_decode_func(abis_to_try, data):
+    for abi in abis_to_try:
+        try:
+            names = get_abi_input_names(abi)
+            types = get_abi_input_types(abi)
+            decoded = w3.codec.decode_abi(types, data[4:])
+            normalized = map_abi_data(BASE_RETURN_NORMALIZERS, types, decoded)
+            return abi['name'], dict(zip(names, normalized))
+        except DecodingError:
+            pass
+    raise DecodingError('could not decode fn input')
+
+
+def bench(name, func, items):
+    began = time.perf_counter()
+    result = [func(item) for item in items]
+    elapsed = time.perf_counter() - began
+    print(f'{name:<28} {len(items) / elapsed:>12,.0f} /sec')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=20_000)
+    args = parser.parse_args()
+
+    node = FakeNode(max_results=args.count)
+    blocks = args.count // len(node.miners) * node.value_interval
+    node.head = node.genesis + blocks
+    fake = Web3(FakeProvider(node))
+    logs = fake.eth.getLogs({
+        'fromBlock': node.genesis,
+        'toBlock': node.genesis + blocks - 1,
+        'topics': [event_abi_to_log_topic(string_and_bytes_abis('NonceSubmitted', 1)[0])],
+    })
+    abis = string_and_bytes_abis('submitMiningSolution', 0)
+    selector = function_abi_to_4byte_selector(abis[0])
+    calldata = [
+        selector + encode_abi(['string', 'uint256', 'uint256'], [str(i), 1, 1000])
+        if i % 2 else
+        selector + encode_abi(['bytes', 'uint256', 'uint256'], [(i * 2 ** 40).to_bytes(10, 'big'), 1, 1000])
+        for i in range(args.count)
+    ]
+    print(f'{len(logs)} logs, {len(calldata)} transactions')
+
+    log_abis = string_and_bytes_abis('NonceSubmitted', 1)
+    decoder = log_decoders.get_log_decoders()[event_abi_to_log_topic(log_abis[0])]
+    expected = bench('legacy NonceSubmitted', lambda log: legacy_decode_log(log_abis, log), logs)
+    assert bench('NonceSubmitted', decoder, logs) == expected
+
+    decoder = func_decoders.FunctionDecoder(abis[0], text_or_bytes={'_nonce'})
+    expected = bench('legacy submitMiningSolution', lambda data: legacy_decode_func(abis, data), calldata)
+    assert bench('submitMiningSolution', decoder, calldata) == expected
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Overhead of instrumentation on contract calls and log decoding, disabled versus enabled.
+
+    python benchmarks/instrumentation.py --calls 2000
+"""
+import argparse
+import time
+
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.instrumentation import Instrumentation
+from tellor.testing import FakeNode, FakeProvider
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+
+    node = FakeNode(max_results=10 ** 9)
+    w3.provider = FakeProvider(node)
+    logs = w3.eth.getLogs({'fromBlock': node.genesis, 'toBlock': node.head})
+    for name, instrumentation in [('disabled', None), ('enabled', Instrumentation())]:
+        tellor = Tellor(Network.MAINNET, instrumentation=instrumentation)
+        began = time.perf_counter()
+        for _ in range(args.calls):
+            tellor.call.totalSupply()
+        calls = (time.perf_counter() - began) / args.calls
+        began = time.perf_counter()
+        for _ in range(args.calls):
+            tellor.decode_logs(logs[:6])
+        decode = (time.perf_counter() - began) / args.calls
+        print(f'{name:>8}: {calls * 1e6:7.1f} us/call, {decode * 1e6:7.1f} us/decode_logs of 6 logs')
+    print(instrumentation.to_prometheus())
+
+
+if __name__ == '__main__':
+    main()
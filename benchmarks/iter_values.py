@@ -0,0 +1,52 @@
+"""
+Round trips and time to read the value history of a request id against a fake node with per-request latency.
+
+    python benchmarks/iter_values.py --values 500 --latency 0.01
+"""
+import argparse
+import time
+
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.testing import FakeNode, FakeProvider
+
+
+def sequential(tellor, request_id):
+    count = tellor.call.getNewValueCountbyRequestId(request_id)
+    for index in range(count):
+        yield tellor.get_value(request_id, tellor.call.getTimestampbyRequestIDandIndex(request_id, index))
+
+
+def measure(node, name, values):
+    node.requests.clear()
+    began = time.perf_counter()
+    count = sum(1 for _ in values)
+    elapsed = time.perf_counter() - began
+    calls = node.requests.count('eth_call')
+    print(f'{name:>24}: {count} values, {calls} eth_call, {len(node.requests)} requests in {elapsed:.2f}s')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--values', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.01)
+    parser.add_argument('--sequential', type=int, default=100, help='max values to read one by one')
+    args = parser.parse_args()
+
+    node = FakeNode(latency=args.latency)
+    w3.provider = FakeProvider(node)
+    tellor = Tellor(Network.MAINNET)
+
+    for values in sorted({min(args.sequential, args.values), args.values}):
+        node.head = node.genesis + values * 5 * node.value_interval - 1
+        print(f'{values} values')
+        if values <= args.sequential:
+            measure(node, 'sequential', sequential(tellor, 1))
+        for batch_size, workers in [(50, 1), (100, 4), (500, 4)]:
+            measure(node, f'batch={batch_size} workers={workers}', tellor.iter_values(1, batch_size=batch_size, workers=workers))
+
+
+if __name__ == '__main__':
+    main()
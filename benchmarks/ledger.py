@@ -0,0 +1,54 @@
+"""
+Ledger replay throughput, memory per address and lookup speed for a large synthetic transfer history.
+
+    python benchmarks/ledger.py --addresses 300000 --transfers 1000000
+"""
+import argparse
+import random
+import sys
+import time
+
+from tellor.ledger import Ledger, ZERO_ADDRESS
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--addresses', type=int, default=300_000)
+    parser.add_argument('--transfers', type=int, default=1_000_000)
+    parser.add_argument('--lookups', type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    addresses = [f'0x{rng.getrandbits(160):040x}' for _ in range(args.addresses)]
+    ledger = Ledger()
+
+    began = time.perf_counter()
+    # every address gets minted some tributes first, then random transfers of a part of the balance
+    for i, address in enumerate(addresses):
+        ledger.apply(i // 100, ZERO_ADDRESS, address, 10 ** 21)
+    block = len(addresses) // 100
+    for i in range(args.transfers):
+        sender, receiver = rng.choice(addresses), rng.choice(addresses)
+        ledger.apply(block + i // 100, sender, receiver, ledger.balance_of(sender) // 3)
+    elapsed = time.perf_counter() - began
+    balances = ledger._balances
+    memory = sys.getsizeof(balances) + sum(sys.getsizeof(key) + sys.getsizeof(x) for key, x in balances.items())
+    count = args.addresses + args.transfers
+    print(f'replayed {count:,} transfers in {elapsed:.2f}s, {count / elapsed:,.0f} transfers/sec')
+    print(f'{memory / 2 ** 20:.1f} MiB, {memory / args.addresses:.0f} bytes per address')
+
+    last = block + args.transfers // 100
+    keys = [(rng.choice(addresses), rng.randrange(last)) for _ in range(args.lookups)]
+    began = time.perf_counter()
+    for address, number in keys:
+        ledger.balance_of_at(address, number)
+    elapsed = time.perf_counter() - began
+    print(f'{args.lookups / elapsed:,.0f} balance_of_at lookups/sec')
+
+    began = time.perf_counter()
+    ledger.top(100)
+    print(f'top 100 holders in {time.perf_counter() - began:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Reading raw log archives: ``json.load`` of a dump followed by ``decode_logs`` versus lazy decoding
+of the same logs as a JSON dump, JSON lines and the binary format. Peak memory of lazy reading
+should stay flat as the file grows.
+
+    python benchmarks/log_files.py --count 30000 120000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from web3 import Web3
+
+from tellor import log_decoders, log_files, raw_logs
+from tellor.testing import FakeNode, FakeProvider
+
+
+def measure(fn):
+    began = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - began
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, nargs='+', default=[30_000, 120_000])
+    args = parser.parse_args()
+
+    decoders = log_decoders.get_log_decoders()
+    directory = tempfile.mkdtemp()
+    for count in args.count:
+        node = FakeNode(max_results=10 ** 9)
+        node.head = node.genesis + count // 6 * node.value_interval
+        params = {'fromBlock': node.genesis, 'toBlock': node.head}
+        dump = os.path.join(directory, 'logs.json')
+        with open(dump, 'w') as f:
+            json.dump([raw_logs.to_raw_log(log) for log in Web3(FakeProvider(node)).eth.getLogs(params)], f)
+        paths = {'json': dump}
+        for format in log_files.FORMATS:
+            paths[format] = os.path.join(directory, f'logs.{format}')
+            log_files.convert(dump, paths[format], format)
+
+        def load_and_decode():
+            with open(dump) as f:
+                logs = [raw_logs.format_log(log) for log in json.load(f)]
+            for _ in log_decoders.decode_logs(logs, decoders):
+                pass
+
+        print(f'{count} logs')
+        results = {'json.load': measure(load_and_decode)}
+        for format, path in paths.items():
+            results[f'decode_file {format}'] = measure(lambda: sum(1 for _ in log_files.decode_file(path, decoders)))
+        for name, (elapsed, peak) in results.items():
+            size = os.path.getsize(dump if name == 'json.load' else paths[name.split()[1]])
+            print(f'{name:>20}: {count / elapsed:8,.0f} logs/sec, peak {peak / 2 ** 20:7.1f} MiB, file {size / 2 ** 20:6.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Memory held by decoded events and values, comparing ``AttributeDict`` events and dict-backed dataclasses
+with compact named tuples and slotted records.
+
+    python benchmarks/memory.py --count 200000
+"""
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from typing import List
+
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.dispute import Value
+from tellor.testing import FakeNode, FakeProvider
+
+
+@dataclass
+class LegacyValue:
+    request_id: int
+    timestamp: int
+    miners: List[str] = None
+    values: List[int] = None
+
+
+def measure(name, build, count):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f'{name:>24}: {size / 2 ** 20:8.1f} MiB, {size / count:6.0f} bytes each')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=200_000)
+    args = parser.parse_args()
+
+    node = FakeNode(max_results=10 ** 9)
+    w3.provider = FakeProvider(node)
+    tellor = Tellor(Network.MAINNET)
+    blocks = args.count // 6 + 1
+    node.head = node.genesis + blocks * node.value_interval
+    logs = w3.eth.getLogs({'fromBlock': node.genesis, 'toBlock': node.genesis + blocks * node.value_interval - 1})
+    count = len(logs)
+    print(f'{count} logs')
+    events = measure('AttributeDict events', lambda: tellor.decode_logs(logs), count)
+    del events
+    records = measure('compact events', lambda: tellor.decode_logs(logs, compact=True), count)
+    del records
+
+    values = [(i % 5 + 1, i * 600, node.miners, [1000 + j + i for j in range(5)]) for i in range(args.count)]
+    legacy = measure('dataclass values', lambda: [LegacyValue(r, t, list(m), list(v)) for r, t, m, v in values], args.count)
+    del legacy
+    measure('slotted values', lambda: [Value(r, t, tuple(m), tuple(v)) for r, t, m, v in values], args.count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Miner leaderboard: full replay, catch-up from a checkpoint and query latency.
+
+    python benchmarks/miners.py --blocks 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.miners import MinerLeaderboard
+from tellor.testing import FakeNode, FakeProvider
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--blocks', type=int, default=200_000)
+    parser.add_argument('--catch-up', type=int, default=100)
+    args = parser.parse_args()
+
+    node = FakeNode()
+    node.head = node.genesis + args.blocks
+    w3.provider = FakeProvider(node)
+    tellor = Tellor(Network.MAINNET)
+    path = os.path.join(tempfile.mkdtemp(), 'miners.pickle')
+
+    began = time.perf_counter()
+    MinerLeaderboard(tellor, path).update(to_block=node.head - args.catch_up)
+    print(f'  replay: {time.perf_counter() - began:.2f}s for {args.blocks - args.catch_up} blocks')
+
+    node.requests.clear()
+    began = time.perf_counter()
+    leaderboard = MinerLeaderboard(tellor, path)
+    leaderboard.update()
+    calls = len(node.requests) - node.requests.count('eth_chainId')
+    print(f'catch-up: {(time.perf_counter() - began) * 1000:.1f}ms for {args.catch_up} blocks, {calls} requests')
+
+    for name, query in [
+        ('top10', lambda: leaderboard.top(10, by='rewards')),
+        ('rollup', lambda: leaderboard.rollup(node.head)),
+    ]:
+        began = time.perf_counter()
+        for _ in range(100_000):
+            query()
+        print(f'{name:>8}: {(time.perf_counter() - began) * 10:.2f}µs')
+
+
+if __name__ == '__main__':
+    main()
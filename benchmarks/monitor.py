@@ -0,0 +1,47 @@
+"""
+RPC requests made while watching the mining state, polling getters one by one every tick
+versus :py:class:`~tellor.monitor.StateMonitor`. A tick is a poll interval, blocks arrive every few ticks.
+
+    python benchmarks/monitor.py --ticks 1000 --ticks-per-block 6
+"""
+import argparse
+
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.testing import FakeNode, FakeProvider
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--ticks-per-block', type=int, default=6)
+    args = parser.parse_args()
+
+    node = FakeNode()
+    w3.provider = FakeProvider(node)
+    tellor = Tellor(Network.MAINNET)
+    start = node.head
+
+    def poll_getters():
+        tellor.current_variables, tellor.difficulty, tellor.slot_progress, tellor.staker_count, tellor.dispute_fee
+        tellor.call.getVariablesOnDeck(), tellor.call.getRequestQ()
+        return []
+
+    monitor = tellor.monitor()
+    for name, poll in [('getters', poll_getters), ('monitor', monitor.poll)]:
+        node.head = start
+        node.requests.clear()
+        changes = 0
+        for tick in range(args.ticks):
+            if tick % args.ticks_per_block == 0:
+                node.head += 1
+            changes += len(poll())
+        calls = len(node.requests) - node.requests.count('eth_chainId')
+        print(f'{name:>8}: {calls:6} requests, {calls / args.ticks:5.2f} per tick')
+    print(f'{changes} changes over {args.ticks // args.ticks_per_block} blocks')
+
+
+if __name__ == '__main__':
+    main()
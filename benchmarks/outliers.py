@@ -0,0 +1,51 @@
+"""
+Outlier detection throughput over a replay of decoded submissions.
+
+    python benchmarks/outliers.py --slots 200000
+"""
+import argparse
+import random
+import time
+
+from tellor.outliers import OutlierDetector
+
+
+def make_events(slots, requests=50, outliers=0.001):
+    random.seed(0)
+    miners = [f'0x{i:040x}' for i in range(1, 21)]
+    prices = [random.uniform(100, 100_000) for _ in range(requests)]
+    events = []
+    for number in range(slots):
+        request_id = number % requests
+        prices[request_id] *= random.gauss(1, 0.001)
+        price = prices[request_id]
+        values = [int(random.gauss(price, price * 0.001)) for _ in range(5)]
+        if random.random() < outliers:
+            values[random.randrange(5)] *= 10
+        challenge = number.to_bytes(32, 'big')
+        for i, value in enumerate(values):
+            events.append(('NonceSubmitted', number, i, (random.choice(miners), '', request_id, value, challenge)))
+        events.append(('NewValue', number, 5, (request_id, number * 600, sorted(values)[2], 0, challenge)))
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--slots', type=int, default=200_000)
+    parser.add_argument('--window', type=int, default=100)
+    args = parser.parse_args()
+
+    events = make_events(args.slots)
+    detector = OutlierDetector(window=args.window)
+    began = time.perf_counter()
+    flags = detector.add_events(events)
+    elapsed = time.perf_counter() - began
+    reasons = {}
+    for flag in flags:
+        reasons[flag.reason] = reasons.get(flag.reason, 0) + 1
+    print(f'{detector.submissions} submissions in {elapsed:.2f}s, {detector.submissions / elapsed:,.0f} submissions/s')
+    print(f'{len(flags)} flags {reasons}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Log decoding throughput across processes, for in-memory logs, raw JSON lines and pre-packed blobs.
+Throughput should scale with the number of workers up to the number of cores.
+
+The CPU time spent in the parent process per event is also reported, it bounds the speedup
+on a machine with enough cores to ``decode_logs time / parent time``.
+
+    python benchmarks/parallel_decode.py --count 300000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import time
+
+from web3 import Web3
+
+from tellor import log_decoders, raw_logs
+from tellor.parallel import LogDecoderPool
+from tellor.testing import FakeNode, FakeProvider
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=300_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--chunksize', type=int, default=5000)
+    parser.add_argument('--compact', action='store_true')
+    args = parser.parse_args()
+
+    node = FakeNode(max_results=10 ** 9)
+    node.head = node.genesis + args.count // 6 * node.value_interval
+    params = {'fromBlock': node.genesis, 'toBlock': node.head}
+    raw = node.eth_getLogs(params)
+    logs = Web3(FakeProvider(node)).eth.getLogs(params)
+    lines = [json.dumps(log) for log in raw]
+    blobs = [raw_logs.pack_logs(logs[i:i + args.chunksize]) for i in range(0, len(logs), args.chunksize)]
+    print(f'{len(logs)} logs on {os.cpu_count()} cores')
+    print(f'packed {sum(map(len, blobs)) / len(logs):.0f} bytes/log, json {sum(map(len, lines)) / len(logs):.0f} bytes/log')
+
+    began = time.perf_counter()
+    events = log_decoders.decode_logs(logs, log_decoders.get_log_decoders(), args.compact)
+    single = (time.perf_counter() - began) / len(events)
+    print(f'{"decode_logs":>14}: {1 / single:9,.0f} events/sec')
+
+    sources = {'decode': logs, 'decode_jsonl': lines, 'decode_packed': blobs}
+    for workers in args.workers:
+        for source, data in sources.items():
+            with LogDecoderPool(workers, args.chunksize, args.compact) as pool:
+                cpu = time.process_time()
+                for _ in getattr(pool, source)(data):
+                    pass
+                parent = (time.process_time() - cpu) / pool.decoded
+            bound = f', parent {parent * 1e6:4.1f} us/event, up to {single / parent:4.1f}x' if workers > 1 else ''
+            print(f'{f"workers={workers}":>14}: {pool.rate:9,.0f} events/sec, {source}{bound}')
+
+
+if __name__ == '__main__':
+    main()
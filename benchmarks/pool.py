@@ -0,0 +1,57 @@
+"""
+Latency of reads against a single endpoint with occasional stalls versus a pool of three with hedging.
+Every endpoint stalls on a fraction of requests, the pool answers those from another one.
+
+    python benchmarks/pool.py --requests 200 --stall 0.05
+"""
+import argparse
+import random
+import time
+
+from web3 import HTTPProvider, Web3
+
+from tellor.pool import PooledProvider
+from tellor.testing import FakeNode, serve
+
+
+class StallingNode(FakeNode):
+    def __init__(self, stall, stall_latency, **kwds):
+        super().__init__(**kwds)
+        self.stall = stall
+        self.stall_latency = stall_latency
+
+    def request(self, method, params):
+        if random.random() < self.stall:
+            time.sleep(self.stall_latency)
+        return super().request(method, params)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--stall', type=float, default=0.05, help='fraction of requests which stall')
+    parser.add_argument('--stall-latency', type=float, default=0.5)
+    args = parser.parse_args()
+
+    urls = []
+    for _ in range(3):
+        server, url = serve(StallingNode(args.stall, args.stall_latency, latency=0.005))
+        urls.append(url)
+
+    for name, provider in [
+        ('single', HTTPProvider(urls[0])),
+        ('pool', PooledProvider(urls, hedge_delay=0.05)),
+    ]:
+        web3 = Web3(provider)
+        latencies = []
+        for _ in range(args.requests):
+            began = time.perf_counter()
+            web3.eth.blockNumber
+            latencies.append(time.perf_counter() - began)
+        latencies.sort()
+        p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+        print(f'{name:>6}: p50 {p50 * 1000:6.1f}ms  p99 {p99 * 1000:6.1f}ms  max {latencies[-1] * 1000:6.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Event throughput and top-k latency of the request book with many requests.
+
+    python benchmarks/request_book.py --requests 5000 --tips 500000
+"""
+import argparse
+import random
+import time
+
+from web3.datastructures import AttributeDict
+
+from tellor.request_book import Request, RequestBook
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--tips', type=int, default=500_000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    book = RequestBook(tellor=None)
+    for request_id in range(1, args.requests + 1):
+        book._add(Request(request_id, '', '', b'', 1000, random.randrange(10 ** 6)))
+    totals = {request_id: request.total_tip for request_id, request in book.requests.items()}
+    events = []
+    for i in range(args.tips):
+        request_id = random.randrange(1, args.requests + 1)
+        tip = random.randrange(1, 10 ** 4)
+        totals[request_id] += tip
+        args_ = AttributeDict({'_requestId': request_id, '_tip': tip, '_totalTips': totals[request_id]})
+        events.append(AttributeDict({'event': 'TipAdded', 'blockNumber': i // 10, 'args': args_}))
+
+    began = time.perf_counter()
+    for event in events:
+        book.apply(event)
+    elapsed = time.perf_counter() - began
+    print(f'{"apply":>8}: {len(events) / elapsed:10,.0f} events/sec')
+
+    began = time.perf_counter()
+    for _ in range(10_000):
+        book.top(10)
+    print(f'{"top(10)":>8}: {(time.perf_counter() - began) / 10_000 * 1e6:10.1f} us')
+    assert [x.total_tip for x in book.top(10)] == sorted(totals.values(), reverse=True)[:10]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Resolving value timestamps to blocks, cold with lazy header fetches and warm from the index.
+
+    python benchmarks/resolver.py --values 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.testing import FakeNode, FakeProvider
+
+
+class IrregularNode(FakeNode):
+    def block_timestamp(self, number):
+        return 13 * number + number * 7 % 11
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--values', type=int, default=5000)
+    args = parser.parse_args()
+
+    node = IrregularNode()
+    node.head = node.genesis + args.values * node.value_interval
+    w3.provider = FakeProvider(node)
+    tellor = Tellor(Network.MAINNET)
+    timestamps = [node.block_timestamp(number) for number in range(node.genesis, node.head, node.value_interval)]
+    path = os.path.join(tempfile.mkdtemp(), 'blocks.idx')
+
+    resolver = tellor.resolver(path)
+    began = time.perf_counter()
+    blocks = resolver.block_at_many(timestamps)
+    elapsed = time.perf_counter() - began
+    print(f' cold: {len(timestamps)} timestamps, {resolver.requests} headers, {elapsed:.2f}s')
+    resolver.save()
+
+    resolver = tellor.resolver(path)
+    began = time.perf_counter()
+    assert [resolver.block_at(timestamp) for timestamp in timestamps] == blocks
+    elapsed = time.perf_counter() - began
+    print(f' warm: {elapsed / len(timestamps) * 1e6:.1f}µs per block_at, {resolver.requests} headers')
+    print(f'index: {len(resolver)} blocks, {os.path.getsize(path) / 1024:.0f} KiB')
+
+
+if __name__ == '__main__':
+    main()
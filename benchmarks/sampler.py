@@ -0,0 +1,43 @@
+"""
+Reads needed to chart slowly changing state over a year of blocks, bisecting change points
+versus reading every block.
+
+    python benchmarks/sampler.py --blocks 2400000 --changes 50
+"""
+import argparse
+import random
+import time
+
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.testing import FakeNode, FakeProvider
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--blocks', type=int, default=2_400_000)
+    parser.add_argument('--changes', type=int, default=50, help='changes per variable')
+    args = parser.parse_args()
+
+    node = FakeNode()
+    node.head = node.genesis + args.blocks
+    random.seed(0)
+    for name in ['difficulty', 'disputeFee', 'stakerCount']:
+        for block in sorted(random.sample(range(node.genesis, node.head), args.changes)):
+            node.set_uint_var(name, random.randrange(10 ** 6), block)
+    w3.provider = FakeProvider(node)
+    tellor = Tellor(Network.MAINNET)
+
+    sampler = tellor.sampler(['difficulty', 'dispute_fee', 'staker_count'])
+    began = time.perf_counter()
+    changes = sampler.changes()
+    elapsed = time.perf_counter() - began
+    print(f'{len(changes)} changes over {args.blocks} blocks')
+    print(f'bisect: {sampler.requests:8} reads in {elapsed:.2f}s')
+    print(f' every: {args.blocks + 1:8} reads')
+
+
+if __name__ == '__main__':
+    main()
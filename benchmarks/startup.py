@@ -0,0 +1,66 @@
+"""
+Import and first-call latency of a fresh interpreter, the cost a short-lived job pays before doing any work.
+
+    python benchmarks/startup.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from tellor.testing import FakeNode, serve
+
+STEPS = """
+import time
+began = time.perf_counter()
+import tellor.auto
+report('import tellor.auto', began)
+began = time.perf_counter()
+tellor = tellor.auto.tellor
+report('network detection', began)
+began = time.perf_counter()
+from tellor.constants import Network
+from tellor.contract import Tellor
+Tellor(Network.MAINNET)
+report('second Tellor()', began)
+began = time.perf_counter()
+logs = tellor.get_logs(fromBlock=tellor.genesis, toBlock=tellor.genesis + 400)
+report('first get_logs', began)
+began = time.perf_counter()
+tellor.total_supply
+report('first call', began)
+"""
+PRELUDE = """
+import sys, time
+def report(step, began):
+    print(step, time.perf_counter() - began, sep='\\t')
+"""
+
+
+def run(url):
+    env = {**os.environ, 'WEB3_HTTP_PROVIDER_URI': url}
+    out = subprocess.run(
+        [sys.executable, '-W', 'ignore', '-c', PRELUDE + STEPS], env=env, check=True, capture_output=True, text=True
+    )
+    return [(step, float(elapsed)) for step, elapsed in (line.split('\t') for line in out.stdout.splitlines())]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    node = FakeNode()
+    server, url = serve(node)
+    try:
+        runs = [run(url) for _ in range(args.runs)]
+    finally:
+        server.shutdown()
+    for i, (step, _) in enumerate(runs[0]):
+        times = [x[i][1] * 1000 for x in runs]
+        print(f'{step:>20}: median {statistics.median(times):7.1f}ms, min {min(times):7.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Transaction input decoding throughput, comparing ``contract.decode_function_input``
+with precompiled decoders in-process and across a process pool.
+
+    python benchmarks/transactions.py --count 200000 --workers 1 2 4
+"""
+import argparse
+import time
+
+from web3 import Web3
+
+from tellor.constants import Network, TELLOR_ABI, TELLOR_ADDRESS
+from tellor.testing import FakeNode
+from tellor.transactions import TransactionDecoder
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=200_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    node = FakeNode()
+    txs = []
+    number = node.genesis
+    while len(txs) < args.count:
+        txs.extend(node.block_transactions(number))
+        number += node.value_interval
+    address = TELLOR_ADDRESS[Network.MAINNET]
+    to_tellor = [tx for tx in txs if tx['to'] == address]
+    print(f'{len(txs)} transactions, {len(to_tellor)} to the contract')
+
+    contract = Web3().eth.contract(address, abi=TELLOR_ABI)
+    sample = to_tellor[:20_000]
+    began = time.perf_counter()
+    for tx in sample:
+        try:
+            contract.decode_function_input(tx['input'])
+        except Exception:
+            pass
+    print(f'{"decode_function_input":>24}: {len(sample) / (time.perf_counter() - began):9,.0f} tx/sec')
+
+    for workers in args.workers:
+        with TransactionDecoder(address, workers=workers) as decoder:
+            for _ in decoder(txs):
+                pass
+        print(f'{f"workers={workers}":>24}: {decoder.rate:9,.0f} tx/sec')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+Asyncio variant of the contract wrapper.
+
+Requires ``aiohttp``, install with ``pip install tellor[async]``.
+"""
+import asyncio
+import itertools
+from typing import List, Optional, Tuple
+
+import aiohttp
+from eth_abi.packed import encode_abi_packed
+from eth_utils import decode_hex, keccak, to_hex
+from web3 import Web3
+from web3._utils.method_formatters import filter_params_formatter, log_entry_formatter
+
+from tellor import func_decoders, log_decoders
+from tellor.constants import Network, TELLOR_ABI, TELLOR_ADDRESS, TELLOR_GENESIS
+from tellor.dispute import Dispute, Value, parse_dispute
+from tellor.multicall import Multicall
+from tellor.types import CurrentVariables, StakerStatus, Tributes
+
+
+def _jsonable(value):
+    if isinstance(value, bytes):
+        return to_hex(value)
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(x) for x in value]
+    if isinstance(value, dict):
+        return {key: _jsonable(x) for key, x in value.items()}
+    return value
+
+
+def _block(block_identifier):
+    return hex(block_identifier) if isinstance(block_identifier, int) else block_identifier
+
+
+class AsyncTellor:
+    """
+    Asyncio counterpart of :py:class:`~tellor.contract.Tellor` over a pooled HTTP JSON-RPC connection.
+
+    Getters are coroutines, properties of the sync wrapper become coroutine methods.
+    All of them take a ``block_identifier`` to read at a past block.
+    Any number of reads can be gathered, at most ``concurrency`` requests are in flight at once.
+
+    Args:
+        network: Network the endpoint is on.
+        endpoint_uri: HTTP JSON-RPC endpoint.
+        concurrency: Maximum number of concurrent requests and pooled connections.
+        timeout: Request timeout in seconds.
+
+    Example:
+        >>> async with AsyncTellor(Network.MAINNET, 'http://localhost:8545') as tellor:
+        ...     balances = await asyncio.gather(*[tellor.balance_of(x) for x in addresses])
+    """
+
+    def __init__(self, network: Network, endpoint_uri: str, concurrency: int = 32, timeout: float = 30):
+        self.network = network
+        self.genesis = TELLOR_GENESIS[network]
+        self.address = TELLOR_ADDRESS[network]
+        self.endpoint_uri = endpoint_uri
+        self.concurrency = concurrency
+        self.timeout = timeout
+        # only used for encoding and decoding, never connects
+        self.contract = Web3().eth.contract(self.address, abi=TELLOR_ABI)
+        self.codec = Multicall(self.contract)
+        self.func_decoders = func_decoders.get_func_decoders(self.contract)
+        self.logs_decoders = log_decoders.get_log_decoders()
+        self._session = None
+        self._semaphore = None
+        self._ids = itertools.count()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def request(self, method, params):
+        """
+        Send a JSON-RPC request.
+
+        Raises:
+            ValueError: With the error object if the node returns an error, like web3 does.
+        """
+        session = self.session
+        payload = {'jsonrpc': '2.0', 'method': method, 'params': _jsonable(params), 'id': next(self._ids)}
+        async with self._semaphore:
+            async with session.post(self.endpoint_uri, json=payload) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+        if 'error' in data:
+            raise ValueError(data['error'])
+        return data['result']
+
+    async def _call(self, fn_name, *args, block_identifier='latest'):
+        tx = {'to': self.address, 'data': self.codec.encode(fn_name, args)}
+        result = await self.request('eth_call', [tx, _block(block_identifier)])
+        return self.codec.decode(fn_name, decode_hex(result))
+
+    def decode_func(self, data) -> Tuple[str, dict]:
+        """
+        Decodes transaction input data.
+
+        Returns:
+            Function name and arguments.
+        """
+        return func_decoders.decode_fn_input(data, self.func_decoders)
+
+    def decode_logs(self, logs, compact=False) -> List[dict]:
+        """
+        Decodes logs with ``topics`` and ``data`` to events.
+
+        Args:
+            compact: Return named tuples per event kind, which take several times less memory.
+                See :py:func:`~tellor.types.event_record`.
+
+        Returns:
+            Events containing ``event`` and ``args``.
+        """
+        return log_decoders.decode_logs(logs, self.logs_decoders, compact)
+
+    async def get_logs(self, compact=False, **kwds) -> List[dict]:
+        """
+        Get contract events by querying logs.
+
+        Args:
+            compact: Return named tuples, see :py:meth:`decode_logs`.
+            **kwds: Filter params like ``fromBlock``, ``toBlock`` and ``topics``
+
+        Returns:
+            Decoded events from matching logs.
+        """
+        params = filter_params_formatter({'address': self.address, **kwds})
+        logs = await self.request('eth_getLogs', [params])
+        return self.decode_logs([log_entry_formatter(log) for log in logs], compact)
+
+    async def block_number(self) -> int:
+        return int(await self.request('eth_blockNumber', []), 16)
+
+    async def did_mine(self, challenge, miner, block_identifier='latest') -> bool:
+        return await self._call('didMine', challenge, miner, block_identifier=block_identifier)
+
+    async def did_vote(self, dispute_id, address, block_identifier='latest') -> bool:
+        return await self._call('didVote', dispute_id, address, block_identifier=block_identifier)
+
+    async def owner(self, block_identifier='latest') -> str:
+        return await self._address_var('_owner', block_identifier)
+
+    async def deity(self, block_identifier='latest') -> str:
+        return await self._address_var('_deity', block_identifier)
+
+    async def implementation(self, block_identifier='latest') -> str:
+        return await self._address_var('tellorContract', block_identifier)
+
+    async def get_dispute(self, dispute_id, block_identifier='latest') -> Optional[Dispute]:
+        data = await self._call('getAllDisputeVars', dispute_id, block_identifier=block_identifier)
+        return parse_dispute(dispute_id, data)
+
+    async def get_dispute_by(self, miner, request_id, timestamp, block_identifier='latest') -> Optional[Dispute]:
+        dispute_hash = keccak(encode_abi_packed(["address", "uint256", "uint256"], [miner, request_id, timestamp]))
+        dispute_id = await self._call('getDisputeIdByDisputeHash', dispute_hash, block_identifier=block_identifier)
+        if dispute_id:
+            return await self.get_dispute(dispute_id, block_identifier)
+
+    async def get_value(self, request_id, timestamp, block_identifier='latest') -> Optional[Value]:
+        miners, values = await asyncio.gather(
+            self._call('getMinersByRequestIdAndTimestamp', request_id, timestamp, block_identifier=block_identifier),
+            self._call('getSubmissionsByTimestamp', request_id, timestamp, block_identifier=block_identifier),
+        )
+        if any(values):
+            return Value(request_id, timestamp, miners, values)
+
+    async def balance_of(self, address, block_identifier='latest') -> Tributes:
+        return Tributes(await self._call('balanceOf', address, block_identifier=block_identifier))
+
+    async def balance_of_at(self, address, block_number, block_identifier='latest') -> Tributes:
+        return Tributes(await self._call('balanceOfAt', address, block_number, block_identifier=block_identifier))
+
+    async def allowance(self, address, spender, block_identifier='latest') -> Tributes:
+        return Tributes(await self._call('allowance', address, spender, block_identifier=block_identifier))
+
+    async def current_variables(self, block_identifier='latest') -> CurrentVariables:
+        return CurrentVariables(*await self._call('getCurrentVariables', block_identifier=block_identifier))
+
+    async def staker_status(self, address, block_identifier='latest') -> StakerStatus:
+        return StakerStatus((await self._call('getStakerInfo', address, block_identifier=block_identifier))[0])
+
+    async def total_supply(self, block_identifier='latest') -> Tributes:
+        return Tributes(await self._call('totalSupply', block_identifier=block_identifier))
+
+    async def dispute_fee(self, block_identifier='latest') -> Tributes:
+        return Tributes(await self._uint_var('disputeFee', block_identifier))
+
+    async def dispute_count(self, block_identifier='latest') -> int:
+        return await self._uint_var('disputeCount', block_identifier)
+
+    async def staker_count(self, block_identifier='latest') -> int:
+        return await self._uint_var('stakerCount', block_identifier)
+
+    async def difficulty(self, block_identifier='latest') -> int:
+        return await self._uint_var('difficulty', block_identifier)
+
+    async def slot_progress(self, block_identifier='latest') -> int:
+        return await self._uint_var('slotProgress', block_identifier)
+
+    async def _address_var(self, name, block_identifier='latest'):
+        return await self._call('getAddressVars', keccak(text=name), block_identifier=block_identifier)
+
+    async def _uint_var(self, name, block_identifier='latest'):
+        return await self._call('getUintVar', keccak(text=name), block_identifier=block_identifier)
@@ -1,12 +1,59 @@
+"""
+Tellor instance for the network ``web3.auto.w3`` is connected to.
+
+The network is detected on first access to ``tellor`` or ``network``, so importing this module does no I/O.
+Call :py:func:`use_provider` before that to connect with another provider, e.g. a
+:py:class:`~tellor.pool.PooledProvider`. Setting ``TELLOR_PROVIDER_URIS`` to comma-separated urls
+pools them automatically.
+"""
 # override with env WEB3_HTTP_PROVIDER_URI
+import os
+from functools import lru_cache
+
+from web3 import Web3
 from web3.auto import w3
 from web3.middleware import geth_poa_middleware
+from web3.providers.base import BaseProvider
 
 from tellor.constants import Network
 from tellor.contract import Tellor
+from tellor.pool import PooledProvider
+
+__all__ = ['network', 'tellor', 'use_provider']
+
+_provider = None
+
+
+def use_provider(provider: BaseProvider):
+    """
+    Connect ``tellor`` and ``network`` with a provider instead of ``web3.auto.w3``.
+    """
+    global _provider
+    _provider = provider
+    _connect.cache_clear()
+
+
+def _default_provider():
+    uris = os.environ.get('TELLOR_PROVIDER_URIS')
+    if uris:
+        return PooledProvider([uri.strip() for uri in uris.split(',') if uri.strip()])
+    return None
+
+
+@lru_cache(maxsize=None)
+def _connect():
+    provider = _provider or _default_provider()
+    web3 = w3 if provider is None else Web3(provider)
+    network = Network(int(web3.eth.chainId))
+    tellor = Tellor(network, provider=provider)
+    if network == Network.RINKEBY:
+        tellor.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+    return network, tellor
 
-network = Network(int(w3.eth.chainId))
-tellor = Tellor(network)
 
-if network == Network.RINKEBY:
-    w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+def __getattr__(name):
+    if name == 'network':
+        return _connect()[0]
+    if name == 'tellor':
+        return _connect()[1]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,115 @@
+"""
+Chunked historical log backfill.
+
+A single ``eth_getLogs`` over the whole contract history times out or hits the result cap
+of most nodes, so the range is split into block windows which are fetched concurrently.
+"""
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Tuple
+
+from requests.exceptions import Timeout
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_HINTS = (
+    'more than',
+    'too many',
+    'limit exceeded',
+    'response size',
+    'query timeout',
+    'timed out',
+)
+
+
+def is_overflow(error: Exception) -> bool:
+    """
+    Whether an ``eth_getLogs`` error means the range should be split.
+    """
+    if isinstance(error, Timeout):
+        return True
+    if isinstance(error, ValueError):
+        detail = error.args[0] if error.args else ''
+        message = detail.get('message', '') if isinstance(detail, dict) else str(detail)
+        return any(hint in message.lower() for hint in OVERFLOW_HINTS)
+    return False
+
+
+def log_key(log) -> Tuple[int, int]:
+    return log['blockNumber'], log['logIndex']
+
+
+def fetch_range(get_logs: Callable, start: int, end: int, params: dict) -> List[dict]:
+    """
+    Fetch logs in ``[start, end]`` sorted by ``(blockNumber, logIndex)``.
+    """
+    logs = get_logs({**params, 'fromBlock': start, 'toBlock': end})
+    return sorted(logs, key=log_key)
+
+
+def backfill_logs(
+    get_logs: Callable,
+    from_block: int,
+    to_block: int,
+    window: int = 10_000,
+    min_window: int = 1,
+    max_window: int = 1_000_000,
+    target: int = 2_000,
+    workers: int = 4,
+    **params,
+) -> Iterator[List[dict]]:
+    """
+    Fetch logs over a block range in adaptive windows using a bounded worker pool.
+
+    Windows which overflow are bisected and make the following windows smaller,
+    sparse windows make them larger, aiming for ``target`` logs per window.
+
+    Args:
+        get_logs: Function which accepts a filter, e.g. ``w3.eth.getLogs``.
+        from_block: First block, inclusive.
+        to_block: Last block, inclusive.
+        window: Initial window size in blocks.
+        min_window: Lower bound for window size.
+        max_window: Upper bound for window size.
+        target: Desired number of logs per window.
+        workers: Number of windows fetched concurrently.
+        **params: Additional filter params like ``address`` and ``topics``.
+
+    Yields:
+        Batches of raw logs, one per window, in ``(blockNumber, logIndex)`` order.
+    """
+    cursor = from_block
+    pending = deque()
+    with ThreadPoolExecutor(workers) as executor:
+
+        def submit(start, end):
+            return start, end, executor.submit(fetch_range, get_logs, start, end, params)
+
+        try:
+            while cursor <= to_block or pending:
+                while cursor <= to_block and len(pending) < workers:
+                    end = min(cursor + window - 1, to_block)
+                    pending.append(submit(cursor, end))
+                    cursor = end + 1
+                start, end, future = pending.popleft()
+                span = end - start + 1
+                try:
+                    logs = future.result()
+                except Exception as e:
+                    if span == 1 or not is_overflow(e):
+                        raise
+                    middle = (start + end) // 2
+                    logger.debug('splitting %d-%d: %s', start, end, e)
+                    pending.extendleft([submit(middle + 1, end), submit(start, middle)])
+                    window = max(min_window, min(window, span // 2))
+                    continue
+                if len(logs) > target:
+                    window = max(min_window, span * target // len(logs))
+                elif len(logs) < target // 2 and span >= window:
+                    window = min(max_window, window * 2)
+                logger.debug('fetched %d logs in %d-%d, next window %d', len(logs), start, end, window)
+                yield logs
+        finally:
+            for _, _, future in pending:
+                future.cancel()
@@ -0,0 +1,202 @@
+"""
+Caching of contract reads.
+
+Some calls return historical data which never changes once it's there, like a mined value,
+a snapshot balance at a past block or a tallied dispute. These are cached for good.
+Everything else is head state, it's pinned to the latest block and cached for that block only.
+"""
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+NOT_FOUND = object()
+
+
+def _nonzero(result):
+    if isinstance(result, (list, tuple)):
+        return any(_nonzero(x) for x in result)
+    if isinstance(result, str):
+        return int(result, 16) != 0
+    return bool(result)
+
+
+# fn_name -> predicate(args, result, head) which tells whether the result can never change.
+# retrieveData is not here, a dispute zeroes the value and a failed one puts it back
+IMMUTABLE_CALLS = {
+    'getMinersByRequestIdAndTimestamp': lambda args, result, head: _nonzero(result),
+    'getSubmissionsByTimestamp': lambda args, result, head: _nonzero(result),
+    'getTimestampbyRequestIDandIndex': lambda args, result, head: _nonzero(result),
+    'getMinedBlockNum': lambda args, result, head: _nonzero(result),
+    'getDisputeIdByDisputeHash': lambda args, result, head: _nonzero(result),
+    'didMine': lambda args, result, head: result,
+    'didVote': lambda args, result, head: result,
+    # dispute vars are final once executed
+    'getAllDisputeVars': lambda args, result, head: result[1],
+    'balanceOfAt': lambda args, result, head: args[1] < head,
+}
+
+
+class CallCache:
+    """
+    Bounded LRU cache for contract call results with an optional on-disk store.
+
+    Args:
+        maxsize: Maximum number of results kept in memory, least recently used ones are evicted.
+        path: SQLite file to persist immutable results across runs.
+        head_ttl: Seconds to reuse the latest block number before asking the node again.
+
+    Attributes:
+        hits: Number of results served from the cache.
+        misses: Number of results which had to be fetched.
+        evictions: Number of results evicted from memory.
+    """
+
+    def __init__(self, maxsize: int = 100_000, path: Optional[str] = None, head_ttl: float = 1.0):
+        self.maxsize = maxsize
+        self.head_ttl = head_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self._head = (0.0, None)
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute('create table if not exists calls (key blob primary key, value blob)')
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, persistent=False, record=True):
+        """
+        Args:
+            key: Cache key.
+            persistent: Whether to look in the on-disk store if the key is not in memory.
+            record: Whether to count the lookup as a hit or a miss.
+
+        Returns:
+            Cached value or ``NOT_FOUND``.
+        """
+        with self._lock:
+            value = self._data.get(key, NOT_FOUND)
+            if value is not NOT_FOUND:
+                self._data.move_to_end(key)
+            elif persistent and self._db is not None:
+                row = self._db.execute('select value from calls where key = ?', [pickle.dumps(key)]).fetchone()
+                if row:
+                    value = pickle.loads(row[0])
+                    self._store(key, value)
+            if record:
+                self.record(value is not NOT_FOUND)
+            return value
+
+    def record(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def set(self, key, value, persist=False):
+        with self._lock:
+            self._store(key, value)
+            if persist and self._db is not None:
+                self._db.execute('insert or replace into calls values (?, ?)', [pickle.dumps(key), pickle.dumps(value)])
+                self._db.commit()
+
+    def _store(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def head(self, fetch: Callable[[], int]) -> int:
+        """
+        Latest block number, refreshed at most every ``head_ttl`` seconds.
+        """
+        with self._lock:
+            fetched_at, number = self._head
+            if number is None or time.monotonic() - fetched_at > self.head_ttl:
+                number = fetch()
+                self._head = (time.monotonic(), number)
+            return number
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            if self._db is not None:
+                self._db.execute('delete from calls')
+                self._db.commit()
+
+
+class CachedCaller:
+    """
+    Drop-in replacement for ``contract.caller()`` which serves reads from a :py:class:`CallCache`.
+
+    Immutable results are cached forever, others are read at the latest block and keyed by it.
+    Reads pinned to a past block number can't change either, they are cached for good.
+
+    Args:
+        contract: Web3 contract.
+        cache: Cache to use, it can be shared with other contracts and networks.
+        namespace: Prefix of every key, so results of other contracts and networks sharing the cache
+            are told apart. Defaults to the contract address, :py:class:`~tellor.contract.Tellor` adds the chain id.
+    """
+
+    def __init__(self, contract, cache: CallCache, namespace=None):
+        self.contract = contract
+        self.cache = cache
+        self.namespace = contract.address if namespace is None else namespace
+
+    def _block_number(self):
+        return self.contract.web3.eth.blockNumber
+
+    def __getattr__(self, fn_name):
+        function = getattr(self.contract.functions, fn_name)
+        immutable = IMMUTABLE_CALLS.get(fn_name)
+
+        def call(*args, block_identifier='latest'):
+            if isinstance(block_identifier, int):
+                return self._call_at(fn_name, function, args, block_identifier)
+            if block_identifier != 'latest':
+                return function(*args).call(block_identifier=block_identifier)
+            if immutable:
+                result = self.cache.get((self.namespace, fn_name, args), persistent=True, record=False)
+                if result is not NOT_FOUND:
+                    self.cache.record(hit=True)
+                    return result
+            head = self.cache.head(self._block_number)
+            key = (self.namespace, head, fn_name, args)
+            result = self.cache.get(key)
+            if result is NOT_FOUND:
+                result = function(*args).call(block_identifier=head)
+                if immutable and immutable(args, result, head):
+                    self.cache.set((self.namespace, fn_name, args), result, persist=True)
+                else:
+                    self.cache.set(key, result)
+            return result
+
+        return call
+
+    def _call_at(self, fn_name, function, args, block):
+        key = (self.namespace, block, fn_name, args)
+        result = self.cache.get(key, persistent=True)
+        if result is NOT_FOUND:
+            result = function(*args).call(block_identifier=block)
+            # blocks at the head could still be reorged
+            self.cache.set(key, result, persist=block < self.cache.head(self._block_number))
+        return result
@@ -1,9 +1,15 @@
 import json
 from enum import IntEnum
 
-from pkg_resources import resource_string
+try:
+    from importlib.resources import files
+except ImportError:  # python < 3.9
+    from importlib.resources import read_text
+else:
+    def read_text(package, resource):
+        return files(package).joinpath(resource).read_text()
 
-TELLOR_ABI = json.loads(resource_string('tellor', 'abi/tellor.json'))
+TELLOR_ABI = json.loads(read_text('tellor.abi', 'tellor.json'))
 
 
 class Network(IntEnum):
@@ -20,3 +26,9 @@ TELLOR_GENESIS = {
     Network.MAINNET: 8265522,
     Network.RINKEBY: 5067828,
 }
+
+# https://github.com/makerdao/multicall
+MULTICALL_ADDRESS = {
+    Network.MAINNET: '0xEeFBa1E63905ef1d7aCba5A8513C70Fd5a2853E3',
+    Network.RINKEBY: '0x42Ad527de7d4e9d9d011aC45B31D8551f8Fe9821',
+}
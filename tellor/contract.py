@@ -1,32 +1,105 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from eth_abi.packed import encode_abi_packed
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+from web3 import Web3
 from web3.auto import w3
-from tellor.constants import Network, TELLOR_GENESIS, TELLOR_ABI, TELLOR_ADDRESS
-from tellor.dispute import Dispute, Value
-from tellor import func_decoders, log_decoders
-from tellor.types import Tributes, CurrentVariables, StakerStatus
+from web3.providers.base import BaseProvider
+from tellor.constants import Network, TELLOR_GENESIS, TELLOR_ABI, TELLOR_ADDRESS, MULTICALL_ADDRESS
+from tellor.dispute import Dispute, Value, parse_dispute
+from tellor import backfill, func_decoders, log_decoders, log_files, parallel, transactions
+from tellor.cache import CachedCaller, CallCache
+from tellor.follow import Follower
+from tellor.instrumentation import Instrumentation, InstrumentedCaller, logs_size
+from tellor.monitor import StateMonitor
+from tellor.multicall import Multicall
+from tellor.resolver import BlockResolver
+from tellor.sampler import StateSampler
+from tellor.types import Tributes, CurrentVariables, StakerStatus, StateSnapshot, VariablesOnDeck
+
+SNAPSHOT_VARS = ('difficulty', 'slotProgress', 'stakerCount', 'disputeFee')
+
+
+@lru_cache(maxsize=None)
+def _contract_factory(web3):
+    # parsing the abi into a contract class is the costly part, instances are cheap
+    return web3.eth.contract(abi=TELLOR_ABI)
 
 
 class Tellor:
     """
     Tellor contract wrapper which implements most of the useful getters.
 
+    Args:
+        network: Network to use.
+        cache: Optional :py:class:`~tellor.cache.CallCache` for getters. Historical data is cached for good,
+            head state is cached per block.
+        instrumentation: Optional :py:class:`~tellor.instrumentation.Instrumentation` to record calls,
+            log requests and decoding time with.
+        provider: Web3 provider to use instead of the one ``web3.auto.w3`` is connected to,
+            e.g. a :py:class:`~tellor.pool.PooledProvider`.
+
+    Attributes:
+        cache_namespace: Chain id and contract address, the prefix of this contract's keys in the cache.
+        block_identifier: Block the getters and properties read at, see :py:meth:`at`.
+            Getters also take a ``block_identifier`` argument which overrides it.
+
     Note:
         You can also access to the underlying web3 contract interface as a fallback.
     """
 
-    def __init__(self, network: Network):
+    def __init__(
+        self,
+        network: Network,
+        cache: Optional[CallCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        provider: Optional[BaseProvider] = None,
+    ):
         self.network = network
         self.genesis = TELLOR_GENESIS[network]
         self.address = TELLOR_ADDRESS[network]
-        self.contract = w3.eth.contract(self.address, abi=TELLOR_ABI)
-        self.call = self.contract.caller()
+        self.w3 = w3 if provider is None else Web3(provider)
+        self.contract = _contract_factory(self.w3)(self.address)
+        self.cache = cache
+        self.instrumentation = instrumentation
+        self.cache_namespace = (int(network), self.address)
+        if cache is None:
+            self.call = self.contract.caller()
+        else:
+            self.call = CachedCaller(self.contract, cache, self.cache_namespace)
+        self._get_logs = self.w3.eth.getLogs
+        if instrumentation is not None:
+            self.call = InstrumentedCaller(self.call, instrumentation)
+            self._get_logs = instrumentation.wrap('logs', 'eth_getLogs', self.w3.eth.getLogs, size=logs_size, items=len)
+            if cache is not None:
+                instrumentation.add_cache(cache)
+        self.multicall = Multicall(self.contract, MULTICALL_ADDRESS.get(network), instrumentation=instrumentation)
         self.func_decoders = func_decoders.get_func_decoders(self.contract)
         self.logs_decoders = log_decoders.get_log_decoders()
+        self.block_identifier = 'latest'
 
     def __getattr__(self, item):
         return getattr(self.contract, item)
 
+    def at(self, block_identifier) -> 'Tellor':
+        """
+        A view of the contract where getters and properties read at a past block.
+        The view shares the cache, multicall and instrumentation with this instance.
+
+        Example:
+            >>> tellor.at(11_000_000).difficulty
+        """
+        # copy.copy would trip over __getattr__ before the attributes are set
+        pinned = object.__new__(type(self))
+        pinned.__dict__.update(self.__dict__)
+        pinned.block_identifier = block_identifier
+        return pinned
+
+    def _block(self, block_identifier):
+        return self.block_identifier if block_identifier is None else block_identifier
+
     def decode_func(self, data) -> Tuple[str, dict]:
         """
         Decodes transaction input data.
@@ -34,38 +107,212 @@ class Tellor:
         Returns:
             Function name and arguments.
         """
-        return func_decoders.decode_fn_input(data, self.func_decoders)
+        if self.instrumentation is None:
+            return func_decoders.decode_fn_input(data, self.func_decoders)
+        began = time.perf_counter()
+        fn_name, args = func_decoders.decode_fn_input(data, self.func_decoders)
+        size = (len(data) - 2) // 2 if isinstance(data, str) else len(data)
+        self.instrumentation.record('decode_func', fn_name or 'unknown', time.perf_counter() - began, size)
+        return fn_name, args
+
+    def decode_transactions(self, txs, workers=1) -> Iterator[transactions.DecodedTransaction]:
+        """
+        Decodes transactions sent to the contract, others are skipped.
+
+        Args:
+            txs: Transactions with ``to``, ``input``, ``from``, ``hash``, ``blockNumber`` and ``transactionIndex``.
+            workers: Number of worker processes.
+
+        Yields:
+            :py:class:`~tellor.transactions.DecodedTransaction` with the same ``fn_name`` and ``args``
+            as :py:meth:`decode_func`.
+        """
+        with transactions.TransactionDecoder(self.address, workers) as decoder:
+            yield from decoder(txs)
 
-    def decode_logs(self, logs) -> List[dict]:
+    def iter_transactions(self, from_block=None, to_block=None, workers=1, block_workers=8) -> Iterator[transactions.DecodedTransaction]:
+        """
+        Decodes all transactions sent to the contract over a block range.
+
+        Args:
+            from_block: First block, defaults to contract genesis.
+            to_block: Last block, defaults to the latest block.
+            workers: Number of decoding processes.
+            block_workers: Number of concurrent block requests.
+        """
+        from_block = self.genesis if from_block is None else from_block
+        to_block = self.w3.eth.blockNumber if to_block is None else to_block
+        blocks = transactions.iter_blocks(self.w3, from_block, to_block, block_workers)
+        yield from self.decode_transactions((tx for block in blocks for tx in block['transactions']), workers)
+
+    def decode_logs(self, logs, compact=False) -> List[dict]:
         """
         Decodes logs with ``topics`` and ``data`` to events.
 
+        Args:
+            compact: Return named tuples per event kind, which take several times less memory.
+                See :py:func:`~tellor.types.event_record`.
+
         Returns:
             Events containing ``event`` and ``args``.
         """
-        return log_decoders.decode_logs(logs, self.logs_decoders)
+        if self.instrumentation is None:
+            return log_decoders.decode_logs(logs, self.logs_decoders, compact)
+        with self.instrumentation.timer('decode_logs', 'compact' if compact else 'dict') as info:
+            events = log_decoders.decode_logs(logs, self.logs_decoders, compact)
+            info['count'] = len(events)
+        return events
+
+    def decode_file(self, path, compact=False) -> Iterator[dict]:
+        """
+        Lazily decode a raw log file written with :py:func:`~tellor.log_files.write_logs` or a JSON dump of logs.
 
-    def get_logs(self, **kwds) -> List[dict]:
+        Yields:
+            Decoded events in file order, the same as :py:meth:`decode_logs` of the logs in the file.
+        """
+        return log_files.decode_file(path, self.logs_decoders, compact)
+
+    def get_logs(self, compact=False, **kwds) -> List[dict]:
         """
         Get contract events by querying logs.
 
         Args:
+            compact: Return named tuples, see :py:meth:`decode_logs`.
             **kwds: Additional args to ``w3.eth.getLogs``
 
         Returns:
             Decoded events from matching logs.
         """
-        logs = w3.eth.getLogs({'address': self.address, **kwds})
-        return self.decode_logs(logs)
+        logs = self._get_logs({'address': self.address, **kwds})
+        return self.decode_logs(logs, compact)
+
+    def iter_logs(
+        self, from_block=None, to_block=None, workers=4, window=10_000, compact=False, processes=1, **kwds
+    ) -> Iterator[dict]:
+        """
+        Backfill contract events over a long block range.
+
+        The range is fetched in adaptive block windows by a pool of workers,
+        so it works against nodes which limit the number of results or time out.
+
+        Args:
+            from_block: First block, defaults to contract genesis.
+            to_block: Last block, defaults to the latest block.
+            workers: Number of concurrent ``eth_getLogs`` requests.
+            window: Initial window size in blocks.
+            compact: Yield named tuples, see :py:meth:`decode_logs`.
+            processes: Number of processes to decode in, see :py:class:`~tellor.parallel.LogDecoderPool`.
+            **kwds: Additional args to ``w3.eth.getLogs`` like ``topics``
+
+        Yields:
+            Decoded events in ``(blockNumber, logIndex)`` order.
+        """
+        from_block = self.genesis if from_block is None else from_block
+        to_block = self.w3.eth.blockNumber if to_block is None else to_block
+        batches = backfill.backfill_logs(
+            self._get_logs, from_block, to_block, window=window, workers=workers, address=self.address, **kwds
+        )
+        if processes > 1:
+            with parallel.LogDecoderPool(processes, compact=compact) as pool:
+                yield from pool.decode_batches(batches)
+            return
+        for logs in batches:
+            yield from self.decode_logs(logs, compact)
+
+    def follow(self, events=None, confirmations=0, poll_interval=2.0, from_block=None) -> Follower:
+        """
+        Stream new events as they appear on chain.
+
+        Args:
+            events: Event names to follow, e.g. ``['NewValue', 'NewDispute']``. Defaults to all events.
+            confirmations: Number of blocks to stay behind the head.
+            poll_interval: Seconds to wait for new blocks.
+            from_block: Start from a past block instead of the head.
+
+        Returns:
+            :py:class:`~tellor.follow.Follower` which can be iterated synchronously or with ``async for``.
+            Events from blocks which got reorged out are yielded again with ``removed=True``.
+        """
+        return Follower(self, events, confirmations, poll_interval, from_block)
+
+    def snapshot(self, block_identifier=None) -> StateSnapshot:
+        """
+        Read the mining state in a single multicall, so all values come from the same block.
+
+        Returns:
+            :py:class:`~tellor.types.StateSnapshot` with the values of :py:attr:`current_variables`,
+            :py:attr:`difficulty`, :py:attr:`slot_progress`, :py:attr:`staker_count`, :py:attr:`dispute_fee`,
+            ``getVariablesOnDeck`` and ``getRequestQ``.
+        """
+        block_identifier = self._block(block_identifier)
+        if block_identifier == 'latest' and self.multicall.address is None:
+            # calls are sent one by one, pin them to a block
+            block_identifier = self.w3.eth.blockNumber
+        calls = [('getCurrentVariables',), ('getVariablesOnDeck',), ('getRequestQ',)]
+        calls.extend(('getUintVar', self.w3.keccak(text=name)) for name in SNAPSHOT_VARS)
+        block_number, results = self.multicall.aggregate(calls, block_identifier)
+        current, on_deck, request_q, difficulty, slot_progress, staker_count, dispute_fee = results
+        return StateSnapshot(
+            block_number=block_number,
+            current_variables=CurrentVariables(*current),
+            difficulty=difficulty,
+            slot_progress=slot_progress,
+            staker_count=staker_count,
+            dispute_fee=Tributes(dispute_fee),
+            on_deck=VariablesOnDeck(*on_deck),
+            request_q=request_q,
+        )
+
+    def sampler(self, fields=None, resolution=1, workers=8) -> StateSampler:
+        """
+        Read the history of slowly changing state, like difficulty or staker count, over a block range.
+
+        Args:
+            fields: Names from :py:data:`~tellor.sampler.VARIABLES` to sample, defaults to all.
+            resolution: Stop the change point search once it's narrowed down to this many blocks.
+            workers: Number of concurrent ``eth_call`` requests.
+
+        Returns:
+            :py:class:`~tellor.sampler.StateSampler`
+        """
+        return StateSampler(self, fields, resolution, workers)
+
+    def resolver(self, path=None, workers=8) -> BlockResolver:
+        """
+        Map value timestamps to blocks, e.g. to read balances at the time a value was mined.
+
+        Args:
+            path: File to persist the block timestamp index to.
+            workers: Number of concurrent header requests.
+
+        Returns:
+            :py:class:`~tellor.resolver.BlockResolver` indexing blocks from the contract genesis.
+        """
+        return BlockResolver(self.w3, self.genesis, path, workers)
+
+    def monitor(self, min_interval=1.0, max_interval=60.0, block_time=13.0, fields=None) -> StateMonitor:
+        """
+        Watch the mining state and get notified of what changed.
+
+        Args:
+            min_interval: Minimum seconds between polls.
+            max_interval: Maximum seconds between polls.
+            block_time: Initial block time estimate, the poll interval adapts to the observed one.
+            fields: Names from :py:data:`~tellor.monitor.FIELDS` to watch, defaults to all.
+
+        Returns:
+            :py:class:`~tellor.monitor.StateMonitor` which can be iterated synchronously or with ``async for``.
+        """
+        return StateMonitor(self, min_interval, max_interval, block_time, fields)
 
-    def did_mine(self, challenge, miner) -> bool:
+    def did_mine(self, challenge, miner, block_identifier=None) -> bool:
         """
         Returns:
             Whether a miner has mined a certain challenge already.
         """
-        return self.call.didMine(challenge, miner)
+        return self.call.didMine(challenge, miner, block_identifier=self._block(block_identifier))
 
-    def did_vote(self, dispute_id, address) -> bool:
+    def did_vote(self, dispute_id, address, block_identifier=None) -> bool:
         """
         Returns:
             Return whether an address has cast a vote in a dispute.
@@ -73,8 +320,19 @@ class Tellor:
         Tip:
             To get an actual vote power, use :py:meth:`balance_of_at` with ``block_number`` of the dispute.
             To figure out whether the vote was for or against, well, you have to resort to events.
+            :py:class:`~tellor.dispute_analyzer.DisputeAnalyzer` does both for all disputes.
+        """
+        return self.call.didVote(dispute_id, address, block_identifier=self._block(block_identifier))
+
+    def did_vote_many(self, keys, block_identifier=None) -> List[bool]:
+        """
+        Batched :py:meth:`did_vote`.
+
+        Args:
+            keys: ``(dispute_id, address)`` pairs
         """
-        return self.call.didVote(dispute_id, address)
+        calls = (('didVote', dispute_id, address) for dispute_id, address in keys)
+        return self.multicall(calls, self._block(block_identifier))
 
     @property
     def owner(self) -> str:
@@ -97,18 +355,24 @@ class Tellor:
         """
         return self._address_var('tellorContract')
 
-    def get_dispute(self, dispute_id) -> Optional[Dispute]:
+    def get_dispute(self, dispute_id, block_identifier=None) -> Optional[Dispute]:
         """
         Returns:
             Detailed info about a :py:class:`~tellor.dispute.Dispute`.
         """
-        data = self.call.getAllDisputeVars(dispute_id)
-        data.extend(data.pop(7))  # append disputeUintVars
-        dispute = Dispute(dispute_id, *data)
-        if any(dispute.hash):
-            return dispute
+        data = self.call.getAllDisputeVars(dispute_id, block_identifier=self._block(block_identifier))
+        return parse_dispute(dispute_id, data)
 
-    def get_dispute_by(self, miner, request_id, timestamp) -> Optional[Dispute]:
+    def get_dispute_many(self, dispute_ids, block_identifier=None) -> List[Optional[Dispute]]:
+        """
+        Batched :py:meth:`get_dispute`.
+        """
+        dispute_ids = list(dispute_ids)
+        calls = (('getAllDisputeVars', dispute_id) for dispute_id in dispute_ids)
+        results = self.multicall(calls, self._block(block_identifier))
+        return [parse_dispute(dispute_id, data) for dispute_id, data in zip(dispute_ids, results)]
+
+    def get_dispute_by(self, miner, request_id, timestamp, block_identifier=None) -> Optional[Dispute]:
         """
         Args:
             miner: Disputed miner address
@@ -118,12 +382,13 @@ class Tellor:
         Returns:
             Detailed info about a :py:class:`~tellor.dispute.Dispute`.
         """
-        dispute_hash = w3.keccak(encode_abi_packed(["address", "uint256", "uint256"], [miner, request_id, timestamp]))
-        dispute_id = self.call.getDisputeIdByDisputeHash(dispute_hash)
+        dispute_hash = self.w3.keccak(encode_abi_packed(["address", "uint256", "uint256"], [miner, request_id, timestamp]))
+        block = self._block(block_identifier)
+        dispute_id = self.call.getDisputeIdByDisputeHash(dispute_hash, block_identifier=block)
         if dispute_id:
-            return self.get_dispute(dispute_id)
+            return self.get_dispute(dispute_id, block)
 
-    def get_value(self, request_id, timestamp) -> Optional[Value]:
+    def get_value(self, request_id, timestamp, block_identifier=None) -> Optional[Value]:
         """
 
         Args:
@@ -133,31 +398,135 @@ class Tellor:
         Returns:
             Detailed info about a :py:class:`~tellor.dispute.Value` with miners and the values they submitted.
         """
-        miners = self.call.getMinersByRequestIdAndTimestamp(request_id, timestamp)
-        values = self.call.getSubmissionsByTimestamp(request_id, timestamp)
+        block = self._block(block_identifier)
+        miners = self.call.getMinersByRequestIdAndTimestamp(request_id, timestamp, block_identifier=block)
+        values = self.call.getSubmissionsByTimestamp(request_id, timestamp, block_identifier=block)
         if any(values):
             return Value(request_id, timestamp, miners, values)
 
-    def balance_of(self, address) -> Tributes:
+    def get_value_many(self, keys, block_identifier=None) -> List[Optional[Value]]:
+        """
+        Batched :py:meth:`get_value`.
+
+        Args:
+            keys: ``(request_id, timestamp)`` pairs
+        """
+        return self._get_values(keys, self._block(block_identifier))
+
+    def _get_values(self, keys, block_identifier='latest') -> List[Optional[Value]]:
+        keys = list(keys)
+        calls = []
+        for request_id, timestamp in keys:
+            calls.append(('getMinersByRequestIdAndTimestamp', request_id, timestamp))
+            calls.append(('getSubmissionsByTimestamp', request_id, timestamp))
+        results = self.multicall(calls, block_identifier)
+        return [
+            Value(request_id, timestamp, miners, values) if any(values) else None
+            for (request_id, timestamp), miners, values in zip(keys, results[::2], results[1::2])
+        ]
+
+    def iter_values(
+        self,
+        request_id,
+        start=0,
+        end=None,
+        reverse=False,
+        batch_size=100,
+        workers=4,
+        block_identifier=None,
+        with_index=False,
+    ) -> Iterator[Value]:
+        """
+        Stream the value history of a request id.
+
+        Indexes are read in batches, each batch takes two multicall round trips, one for timestamps
+        and one for miners and submissions. Up to ``workers`` batches are fetched ahead.
+        All reads are pinned to the block the history count was read at.
+
+        Args:
+            request_id: Value request id.
+            start: First value index, inclusive.
+            end: Last value index, exclusive. Defaults to the number of values.
+            reverse: Iterate latest first, from ``end - 1`` down to ``start``.
+            batch_size: Number of indexes per batch.
+            workers: Maximum number of batches in flight.
+            block_identifier: Block to read the history at, defaults to the latest block.
+            with_index: Yield ``(index, value)`` pairs.
+
+        Yields:
+            :py:class:`~tellor.dispute.Value` objects. Indexes without a value are skipped.
+
+        Tip:
+            To resume, pass ``with_index=True`` and ``start=index + 1`` of the last pair,
+            or ``end=index`` when iterating in reverse. Counting yielded values is not enough,
+            as skipped indexes are not counted.
+        """
+        block = self._block(block_identifier)
+        if not isinstance(block, int):
+            block = self.w3.eth.getBlock(block)['number']
+        count = self.multicall([('getNewValueCountbyRequestId', request_id)], block)[0]
+        end = count if end is None else min(end, count)
+        indexes = range(start, end)
+        if reverse:
+            indexes = indexes[::-1]
+        batches = deque(indexes[i:i + batch_size] for i in range(0, len(indexes), batch_size))
+
+        def fetch(batch):
+            timestamps = self.multicall((('getTimestampbyRequestIDandIndex', request_id, i) for i in batch), block)
+            return self._get_values([(request_id, timestamp) for timestamp in timestamps], block)
+
+        pending = deque()
+        with ThreadPoolExecutor(workers) as executor:
+            try:
+                while batches or pending:
+                    while batches and len(pending) < workers:
+                        batch = batches.popleft()
+                        pending.append((batch, executor.submit(fetch, batch)))
+                    batch, future = pending.popleft()
+                    for index, value in zip(batch, future.result()):
+                        if value is not None:
+                            yield (index, value) if with_index else value
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    def balance_of(self, address, block_identifier=None) -> Tributes:
         """
         Returns:
             Tribute balance of address in wei.
         """
-        return Tributes(self.call.balanceOf(address))
+        return Tributes(self.call.balanceOf(address, block_identifier=self._block(block_identifier)))
 
-    def balance_of_at(self, address, block_number) -> Tributes:
+    def balance_of_many(self, addresses, block_identifier=None) -> List[Tributes]:
+        """
+        Batched :py:meth:`balance_of`.
+        """
+        calls = (('balanceOf', address) for address in addresses)
+        return [Tributes(x) for x in self.multicall(calls, self._block(block_identifier))]
+
+    def balance_of_at(self, address, block_number, block_identifier=None) -> Tributes:
         """
         Returns:
             Tribute balance snapshot of address in wei.
         """
-        return Tributes(self.call.balanceOfAt(address, block_number))
+        return Tributes(self.call.balanceOfAt(address, block_number, block_identifier=self._block(block_identifier)))
+
+    def balance_of_at_many(self, keys, block_identifier=None) -> List[Tributes]:
+        """
+        Batched :py:meth:`balance_of_at`.
+
+        Args:
+            keys: ``(address, block_number)`` pairs
+        """
+        calls = (('balanceOfAt', address, block_number) for address, block_number in keys)
+        return [Tributes(x) for x in self.multicall(calls, self._block(block_identifier))]
 
-    def allowance(self, address, spender) -> Tributes:
+    def allowance(self, address, spender, block_identifier=None) -> Tributes:
         """
         Returns:
             How many tributes spender is allowed to spend on behalf of address.
         """
-        return Tributes(self.call.allowance(address, spender))
+        return Tributes(self.call.allowance(address, spender, block_identifier=self._block(block_identifier)))
 
     @property
     def current_variables(self) -> CurrentVariables:
@@ -165,21 +534,28 @@ class Tellor:
         Current contract state from miner's perspective
         :py:class:`~tellor.types.CurrentVariables`
         """
-        return CurrentVariables(*self.call.getCurrentVariables())
+        return CurrentVariables(*self.call.getCurrentVariables(block_identifier=self.block_identifier))
 
-    def staker_status(self, address) -> StakerStatus:
+    def staker_status(self, address, block_identifier=None) -> StakerStatus:
         """
         Returns:
             :py:class:`~tellor.types.StakerStatus`
         """
-        return StakerStatus(self.call.getStakerInfo(address)[0])
+        return StakerStatus(self.call.getStakerInfo(address, block_identifier=self._block(block_identifier))[0])
+
+    def staker_status_many(self, addresses, block_identifier=None) -> List[StakerStatus]:
+        """
+        Batched :py:meth:`staker_status`.
+        """
+        calls = (('getStakerInfo', address) for address in addresses)
+        return [StakerStatus(x[0]) for x in self.multicall(calls, self._block(block_identifier))]
 
     @property
     def total_supply(self) -> Tributes:
         """
         Total supply of tributes. New tributes are printed every block.
         """
-        return Tributes(self.call.totalSupply())
+        return Tributes(self.call.totalSupply(block_identifier=self.block_identifier))
 
     @property
     def dispute_fee(self) -> Tributes:
@@ -219,7 +595,7 @@ class Tellor:
         return self._uint_var('slotProgress')
 
     def _address_var(self, name):
-        return self.call.getAddressVars(w3.keccak(text=name))
+        return self.call.getAddressVars(self.w3.keccak(text=name), block_identifier=self.block_identifier)
 
     def _uint_var(self, name):
-        return self.call.getUintVar(w3.keccak(text=name))
+        return self.call.getUintVar(self.w3.keccak(text=name), block_identifier=self.block_identifier)
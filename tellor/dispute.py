@@ -1,9 +1,10 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional
 
-from tellor.types import Tributes
+from tellor.types import Tributes, add_slots
 
 
+@add_slots
 @dataclass
 class Value:
     request_id: int
@@ -12,6 +13,7 @@ class Value:
     values: List[int] = None
 
 
+@add_slots
 @dataclass
 class Dispute:
     """
@@ -69,3 +71,14 @@ class Dispute:
     @property
     def nays(self):
         return Tributes(self.quorum - self.yays)
+
+
+def parse_dispute(dispute_id, dispute_vars) -> Optional[Dispute]:
+    """
+    Builds a :py:class:`Dispute` from ``getAllDisputeVars`` output, or ``None`` if the dispute doesn't exist.
+    """
+    data = list(dispute_vars)
+    data.extend(data.pop(7))  # append disputeUintVars
+    dispute = Dispute(dispute_id, *data)
+    if any(dispute.hash):
+        return dispute
@@ -0,0 +1,217 @@
+"""
+Reconstruction of dispute history with vote directions and weights.
+
+The contract only tells whether an address has voted. Which way they voted comes from ``Voted`` events
+and the vote weight is the voter's balance snapshot at the disputed value's block.
+"""
+import logging
+import os
+import pickle
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from web3.datastructures import AttributeDict
+
+from tellor import log_decoders
+from tellor.dispute import Dispute
+from tellor.types import Tributes, add_slots
+
+logger = logging.getLogger(__name__)
+
+DISPUTE_EVENTS = ('NewDispute', 'Voted', 'DisputeVoteTallied')
+
+
+@add_slots
+@dataclass
+class Vote:
+    """
+    A vote cast in a dispute.
+
+    Attributes:
+        voter: Voter address.
+        supports_dispute: Whether the vote is in favour of the reporter.
+        weight: Voting power, which is the voter's balance at the dispute block.
+        block_number: Block the vote was cast at.
+        transaction_hash: Transaction which cast the vote.
+    """
+
+    voter: str
+    supports_dispute: bool
+    weight: Tributes
+    block_number: int
+    transaction_hash: bytes = field(repr=False)
+
+
+@add_slots
+@dataclass
+class DisputeHistory:
+    """
+    Full timeline of a dispute.
+
+    Attributes:
+        dispute: Current state of the :py:class:`~tellor.dispute.Dispute`.
+        events: ``NewDispute``, ``Voted`` and ``DisputeVoteTallied`` events in order.
+        votes: Weighted votes in order.
+    """
+
+    dispute: Dispute
+    events: List[AttributeDict] = field(default_factory=list, repr=False)
+    votes: List[Vote] = field(default_factory=list)
+
+    @property
+    def opened_at(self) -> Optional[int]:
+        """
+        Block the dispute was opened at.
+        """
+        return next((event['blockNumber'] for event in self.events if event['event'] == 'NewDispute'), None)
+
+    @property
+    def tallied_at(self) -> Optional[int]:
+        """
+        Block the votes were tallied at.
+        """
+        return next((event['blockNumber'] for event in self.events if event['event'] == 'DisputeVoteTallied'), None)
+
+    @property
+    def yays(self) -> Tributes:
+        """
+        Vote weight in favour of the reporter.
+        """
+        return Tributes(sum(vote.weight for vote in self.votes if vote.supports_dispute))
+
+    @property
+    def nays(self) -> Tributes:
+        """
+        Vote weight in favour of the reported miner.
+        """
+        return Tributes(sum(vote.weight for vote in self.votes if not vote.supports_dispute))
+
+    @property
+    def reconciled(self) -> bool:
+        """
+        Whether the weighted votes add up to the dispute ``tally``, ``quorum`` and ``number_of_votes``.
+        """
+        return (
+            self.yays - self.nays == self.dispute.tally
+            and self.yays + self.nays == self.dispute.quorum
+            and len(self.votes) == self.dispute.number_of_votes
+        )
+
+
+def _dispute_id(event):
+    args = event['args']
+    return args['_disputeId'] if event['event'] == 'NewDispute' else args['_disputeID']
+
+
+class DisputeAnalyzer:
+    """
+    Builds :py:class:`DisputeHistory` for all disputes in bulk.
+
+    Events are backfilled with :py:meth:`~tellor.contract.Tellor.iter_logs`, disputes and vote weights
+    are read with batched getters. Everything which can't change anymore is kept between updates,
+    so only new events, unfinished disputes and new voters are fetched again.
+
+    Args:
+        tellor: :py:class:`~tellor.contract.Tellor` instance.
+        path: File to persist the intermediate results to, so re-runs are incremental across processes.
+
+    Example:
+        >>> analyzer = DisputeAnalyzer(tellor, 'disputes.pickle')
+        >>> histories = analyzer.update()
+        >>> [x.dispute.dispute_id for x in histories.values() if not x.reconciled]
+    """
+
+    def __init__(self, tellor, path: Optional[str] = None):
+        self.tellor = tellor
+        self.path = path
+        # last block which has been scanned for events
+        self.checkpoint = None
+        # dispute id -> events
+        self.events = {}
+        # dispute id -> executed dispute
+        self.disputes = {}
+        # (voter, block number) -> balance snapshot
+        self.weights = {}
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            state = pickle.load(f)
+        self.checkpoint = state['checkpoint']
+        self.events = state['events']
+        self.disputes = state['disputes']
+        self.weights = state['weights']
+
+    def _save(self):
+        state = {'checkpoint': self.checkpoint, 'events': self.events, 'disputes': self.disputes, 'weights': self.weights}
+        with open(self.path + '.tmp', 'wb') as f:
+            pickle.dump(state, f)
+        os.replace(self.path + '.tmp', self.path)
+
+    def _scan_events(self, to_block, **kwds):
+        start = self.tellor.genesis if self.checkpoint is None else self.checkpoint + 1
+        if start > to_block:
+            return
+        topics = log_decoders.event_topics(self.tellor.logs_decoders, DISPUTE_EVENTS)
+        count = 0
+        for event in self.tellor.iter_logs(start, to_block, topics=topics, **kwds):
+            self.events.setdefault(_dispute_id(event), []).append(event)
+            count += 1
+        logger.debug('found %d dispute events in %d-%d', count, start, to_block)
+        self.checkpoint = to_block
+
+    def _fetch_disputes(self, dispute_ids) -> Dict[int, Dispute]:
+        missing = [dispute_id for dispute_id in dispute_ids if dispute_id not in self.disputes]
+        fetched = dict(zip(missing, self.tellor.get_dispute_many(missing)))
+        self.disputes.update({key: dispute for key, dispute in fetched.items() if dispute and dispute.executed})
+        return {dispute_id: self.disputes.get(dispute_id) or fetched[dispute_id] for dispute_id in dispute_ids}
+
+    def _fetch_weights(self, keys):
+        missing = sorted(set(keys) - self.weights.keys())
+        self.weights.update(zip(missing, self.tellor.balance_of_at_many(missing)))
+
+    def update(self, to_block: Optional[int] = None, confirmations: int = 0, **kwds) -> Dict[int, DisputeHistory]:
+        """
+        Fetch what's new and rebuild the histories.
+
+        Args:
+            to_block: Last block to scan for events, defaults to the latest block minus ``confirmations``.
+            confirmations: Number of blocks to stay behind the head. Events are not rescanned after a reorg.
+            **kwds: Additional args to :py:meth:`~tellor.contract.Tellor.iter_logs`.
+
+        Returns:
+            Dispute id mapped to :py:class:`DisputeHistory` for all disputes.
+        """
+        if to_block is None:
+            to_block = self.tellor.contract.web3.eth.blockNumber - confirmations
+        self._scan_events(to_block, **kwds)
+        dispute_ids = range(1, self.tellor.dispute_count + 1)
+        disputes = self._fetch_disputes(dispute_ids)
+        voted = [
+            (event['args']['_voter'], disputes[_dispute_id(event)].block_number)
+            for dispute_id in dispute_ids if disputes[dispute_id]
+            for event in self.events.get(dispute_id, []) if event['event'] == 'Voted'
+        ]
+        self._fetch_weights(voted)
+        histories = {}
+        for dispute_id in dispute_ids:
+            dispute = disputes[dispute_id]
+            if dispute is None:
+                logger.warning('dispute %d does not exist', dispute_id)
+                continue
+            events = self.events.get(dispute_id, [])
+            votes = [
+                Vote(
+                    voter=event['args']['_voter'],
+                    supports_dispute=event['args']['_position'],
+                    weight=self.weights[event['args']['_voter'], dispute.block_number],
+                    block_number=event['blockNumber'],
+                    transaction_hash=bytes(event['transactionHash']),
+                )
+                for event in events if event['event'] == 'Voted'
+            ]
+            histories[dispute_id] = DisputeHistory(dispute, events, votes)
+        if self.path is not None:
+            self._save()
+        return histories
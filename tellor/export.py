@@ -0,0 +1,293 @@
+"""
+Columnar export of oracle value history.
+
+Decoded events and :py:class:`~tellor.dispute.Value` lists are converted to NumPy structured arrays,
+which can be handed to pandas with ``pd.DataFrame(array)`` or written to Arrow and Parquet.
+
+Addresses are stored as fixed-width 20-byte strings, integers as ``int64``
+unless some of them don't fit, in which case the column falls back to Python ints.
+
+Requires ``numpy``, install with ``pip install tellor[numpy]``.
+Arrow and Parquet output also requires ``pyarrow``, install with ``pip install tellor[arrow]``.
+"""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from tellor.constants import TELLOR_ABI
+from tellor.dispute import Value
+from tellor.types import snake_case
+
+MIN_INT64 = -2 ** 63
+MAX_INT64 = 2 ** 63 - 1
+EVENT_INPUTS = {abi['name']: abi['inputs'] for abi in TELLOR_ABI if abi['type'] == 'event'}
+
+
+def address_bytes(address: str) -> bytes:
+    """
+    Converts a hex address to its 20 raw bytes.
+    """
+    return bytes.fromhex(address[2:])
+
+
+def to_address(data: bytes) -> str:
+    """
+    Converts 20 raw bytes back to a hex address. Checksums are not applied.
+    """
+    return '0x' + data.rjust(20, b'\x00').hex()
+
+
+def int_dtype(values: Iterable[int]) -> np.dtype:
+    """
+    Returns:
+        ``int64`` if all values fit into it, ``object`` otherwise.
+    """
+    if all(MIN_INT64 <= x <= MAX_INT64 for x in values):
+        return np.dtype('i8')
+    return np.dtype('O')
+
+
+def _column_dtype(type_str, column):
+    if type_str == 'address':
+        return np.dtype('S20')
+    if type_str == 'bool':
+        return np.dtype('?')
+    if type_str.startswith('uint') or type_str.startswith('int'):
+        return int_dtype(column)
+    if type_str.startswith('bytes') and type_str != 'bytes':
+        return np.dtype(f'S{type_str[5:]}')
+    return np.dtype('O')
+
+
+def _as_tuple(event):
+    if type(event) is tuple:
+        return event
+    if isinstance(event, tuple):
+        # compact record
+        return event.event, event[0], event[1], event[3:]
+    args = event['args']
+    return event['event'], event['blockNumber'], event['logIndex'], tuple(args[x['name']] for x in EVENT_INPUTS[event['event']])
+
+
+def events_to_arrays(events: Iterable) -> Dict[str, np.ndarray]:
+    """
+    Converts decoded events to one structured array per event.
+
+    Args:
+        events: Events from :py:meth:`~tellor.contract.Tellor.decode_logs`, either dicts or compact records,
+            or tuples from :py:func:`~tellor.log_decoders.decode_log_tuples`, which is faster.
+
+    Returns:
+        Event name mapped to an array with ``block_number``, ``log_index`` and args in snake case,
+        e.g. ``NonceSubmitted._requestId`` becomes ``request_id``.
+    """
+    grouped = {}
+    for event in events:
+        name, block_number, log_index, args = _as_tuple(event)
+        grouped.setdefault(name, []).append((block_number, log_index, *args))
+    return {name: _rows_to_array(name, rows) for name, rows in grouped.items()}
+
+
+def _rows_to_array(name, rows):
+    inputs = EVENT_INPUTS[name]
+    columns = list(zip(*rows))
+    for i, x in enumerate(inputs, 2):
+        if x['type'] == 'address':
+            columns[i] = [address_bytes(address) for address in columns[i]]
+    dtype = [('block_number', 'i8'), ('log_index', 'i8')] + [
+        (snake_case(x['name']), _column_dtype(x['type'], column)) for x, column in zip(inputs, columns[2:])
+    ]
+    array = np.empty(len(rows), dtype=dtype)
+    for (field, _), column in zip(dtype, columns):
+        array[field] = column
+    return array
+
+
+def values_to_array(values: Iterable[Optional[Value]]) -> np.ndarray:
+    """
+    Converts :py:class:`~tellor.dispute.Value` objects, e.g. from :py:meth:`~tellor.contract.Tellor.get_value_many`,
+    to a structured array. Missing values are skipped.
+
+    Returns:
+        Array with ``request_id``, ``timestamp``, five ``miners`` and five ``values`` per row.
+    """
+    values = [value for value in values if value is not None]
+    submitted = [x for value in values for x in value.values]
+    dtype = [
+        ('request_id', 'i8'),
+        ('timestamp', 'i8'),
+        ('miners', 'S20', (5,)),
+        ('values', int_dtype(submitted), (5,)),
+    ]
+    array = np.empty(len(values), dtype=dtype)
+    array['request_id'] = [value.request_id for value in values]
+    array['timestamp'] = [value.timestamp for value in values]
+    array['miners'] = [[address_bytes(miner) for miner in value.miners] for value in values]
+    array['values'] = [list(value.values) for value in values]
+    return array
+
+
+def array_to_values(array: np.ndarray) -> List[Value]:
+    """
+    Converts an array from :py:func:`values_to_array` back to :py:class:`~tellor.dispute.Value` objects.
+    """
+    return [
+        Value(int(row['request_id']), int(row['timestamp']), [to_address(x) for x in row['miners']], [int(x) for x in row['values']])
+        for row in array
+    ]
+
+
+def submissions_to_values(nonces: np.ndarray, new_values: np.ndarray) -> np.ndarray:
+    """
+    Assembles values from ``NonceSubmitted`` and ``NewValue`` arrays, which is much cheaper than
+    calling :py:meth:`~tellor.contract.Tellor.get_value` for every timestamp.
+
+    Submissions are matched to values by the challenge and ordered by value like the contract stores them.
+    Values with less than five submissions in the arrays are skipped.
+
+    Returns:
+        Array in the same format as :py:func:`values_to_array`.
+    """
+    order = np.lexsort((nonces['value'], nonces['request_id'], nonces['current_challenge']))
+    nonces = nonces[order]
+    keys = np.empty(len(nonces), dtype=[('challenge', 'S32'), ('request_id', nonces.dtype['request_id'])])
+    keys['challenge'] = nonces['current_challenge']
+    keys['request_id'] = nonces['request_id']
+    _, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    starts = starts[counts == 5]
+    keys = keys[starts]
+    index = np.arange(5) + starts[:, None]
+    # join on challenge and request id
+    lookup = np.empty(len(new_values), dtype=keys.dtype)
+    lookup['challenge'] = new_values['current_challenge']
+    lookup['request_id'] = new_values['request_id']
+    lookup_order = np.argsort(lookup)
+    position = np.searchsorted(lookup[lookup_order], keys).clip(max=max(len(lookup) - 1, 0))
+    found = lookup[lookup_order][position] == keys if len(lookup) else np.zeros(len(keys), dtype=bool)
+    matched = lookup_order[position[found]]
+    dtype = [
+        ('request_id', 'i8'),
+        ('timestamp', 'i8'),
+        ('miners', 'S20', (5,)),
+        ('values', nonces.dtype['value'], (5,)),
+    ]
+    array = np.empty(found.sum(), dtype=dtype)
+    array['request_id'] = keys['request_id'][found]
+    array['timestamp'] = new_values['time'][matched]
+    array['miners'] = nonces['miner'][index[found]]
+    array['values'] = nonces['value'][index[found]]
+    return array[np.lexsort((array['timestamp'], array['request_id']))]
+
+
+def medians(array: np.ndarray) -> np.ndarray:
+    """
+    Official value of each row, which is the median of the five submissions.
+
+    Args:
+        array: Array from :py:func:`values_to_array`.
+    """
+    values = array['values']
+    return np.sort(values, axis=1)[:, values.shape[1] // 2]
+
+
+def deviation(array: np.ndarray) -> np.ndarray:
+    """
+    Relative deviation of each submission from the official value, shaped like ``array['values']``.
+    """
+    values = array['values'].astype('f8')
+    median = medians(array).astype('f8')[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (values - median) / median
+
+
+def miner_deviation(array: np.ndarray) -> np.ndarray:
+    """
+    Aggregates how far off each miner's submissions are.
+
+    Returns:
+        Array with ``miner``, ``count``, ``mean`` and ``max`` absolute relative deviation, sorted by miner.
+    """
+    miners = array['miners'].ravel()
+    errors = np.abs(deviation(array)).ravel()
+    valid = np.isfinite(errors)
+    miners, errors = miners[valid], errors[valid]
+    unique, inverse = np.unique(miners, return_inverse=True)
+    result = np.zeros(len(unique), dtype=[('miner', 'S20'), ('count', 'i8'), ('mean', 'f8'), ('max', 'f8')])
+    result['miner'] = unique
+    result['count'] = np.bincount(inverse, minlength=len(unique))
+    result['mean'] = np.bincount(inverse, weights=errors, minlength=len(unique)) / np.maximum(result['count'], 1)
+    maximum = np.zeros(len(unique))
+    np.maximum.at(maximum, inverse, errors)
+    result['max'] = maximum
+    return result
+
+
+def bucket(timestamps: np.ndarray, interval: int) -> np.ndarray:
+    """
+    Floors timestamps to the start of ``interval`` seconds long buckets.
+    """
+    timestamps = np.asarray(timestamps, dtype='i8')
+    return timestamps - timestamps % interval
+
+
+def bucket_medians(array: np.ndarray, interval: int) -> np.ndarray:
+    """
+    Median of official values per request id and time bucket, e.g. ``interval=86400`` for daily values.
+
+    Returns:
+        Array with ``request_id``, ``bucket``, ``count`` and ``median``, sorted by request id and bucket.
+        Even-sized buckets use the upper median to stay exact for big integers.
+    """
+    values = medians(array)
+    buckets = bucket(array['timestamp'], interval)
+    request_ids = array['request_id']
+    order = np.argsort(values, kind='stable')
+    order = order[np.argsort(buckets[order], kind='stable')]
+    order = order[np.argsort(request_ids[order], kind='stable')]
+    buckets, request_ids, values = buckets[order], request_ids[order], values[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (buckets[1:] != buckets[:-1]) | (request_ids[1:] != request_ids[:-1])
+    starts = np.flatnonzero(first)
+    counts = np.diff(np.append(starts, len(order)))
+    result = np.empty(len(starts), dtype=[('request_id', 'i8'), ('bucket', 'i8'), ('count', 'i8'), ('median', values.dtype)])
+    result['request_id'] = request_ids[starts]
+    result['bucket'] = buckets[starts]
+    result['count'] = counts
+    result['median'] = values[starts + counts // 2]
+    return result
+
+
+def to_arrow(array: np.ndarray):
+    """
+    Converts a structured array to a ``pyarrow.Table``.
+
+    Fixed-width bytes become fixed-size binary, subarrays become fixed-size lists.
+    Integers which don't fit into ``int64`` are stored as decimal strings.
+    """
+    import pyarrow as pa
+
+    columns = {}
+    for name in array.dtype.names:
+        column = array[name]
+        size = column.shape[1] if column.ndim > 1 else None
+        flat = column.ravel()
+        if flat.dtype.kind == 'S':
+            values = pa.array(flat.tolist(), type=pa.binary(flat.dtype.itemsize))
+        elif flat.dtype.kind == 'O' and all(isinstance(x, int) for x in flat):
+            values = pa.array([str(x) for x in flat], type=pa.string())
+        else:
+            values = pa.array(flat)
+        columns[name] = values if size is None else pa.FixedSizeListArray.from_arrays(values, size)
+    return pa.table(columns)
+
+
+def to_parquet(array: np.ndarray, path: str, **kwds):
+    """
+    Writes a structured array to a Parquet file.
+
+    Args:
+        **kwds: Additional args to ``pyarrow.parquet.write_table``.
+    """
+    import pyarrow.parquet as pq
+
+    pq.write_table(to_arrow(array), path, **kwds)
@@ -0,0 +1,153 @@
+"""
+Streaming of new events as the chain grows.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+
+from web3.datastructures import AttributeDict
+from web3.exceptions import BlockNotFound
+
+from tellor import log_decoders
+
+logger = logging.getLogger(__name__)
+
+
+class Follower:
+    """
+    Follows the chain head and yields decoded events exactly once, in order.
+
+    Each poll queries logs from a block cursor up to the head minus ``confirmations``, so ranges never overlap.
+    Hashes of recent blocks are kept to detect reorgs. When a block the events came from is no longer
+    on the chain, those events are retracted by yielding them again with ``removed=True``,
+    then the new branch is followed.
+
+    Args:
+        tellor: :py:class:`~tellor.contract.Tellor` instance.
+        events: Event names to follow, defaults to all events.
+        confirmations: Number of blocks to stay behind the head.
+        poll_interval: Seconds between polls when there are no new blocks.
+        from_block: First block to yield events from, defaults to the next block.
+        max_range: Maximum number of blocks queried at once when catching up.
+        reorg_depth: Number of recent blocks to keep hashes for.
+
+    Note:
+        Yielded events have the same shape as :py:meth:`~tellor.contract.Tellor.decode_logs` output
+        with an additional ``removed`` flag.
+    """
+
+    def __init__(
+        self,
+        tellor,
+        events: Optional[Iterable[str]] = None,
+        confirmations: int = 0,
+        poll_interval: float = 2.0,
+        from_block: Optional[int] = None,
+        max_range: int = 10_000,
+        reorg_depth: int = 128,
+    ):
+        self.tellor = tellor
+        self.w3 = tellor.contract.web3
+        self.confirmations = confirmations
+        self.poll_interval = poll_interval
+        self.max_range = max_range
+        self.reorg_depth = reorg_depth
+        self.topics = None
+        if events is not None:
+            self.topics = log_decoders.event_topics(tellor.logs_decoders, events)
+        self.cursor = None if from_block is None else from_block - 1
+        self.caught_up = False
+        # block number -> (block hash, events yielded from this block)
+        self.blocks = OrderedDict()
+
+    def _head(self) -> int:
+        return self.w3.eth.blockNumber - self.confirmations
+
+    def _block_hash(self, number) -> Optional[bytes]:
+        try:
+            return bytes(self.w3.eth.getBlock(number)['hash'])
+        except BlockNotFound:
+            return None
+
+    def _remember(self, number, block_hash, events=()):
+        known = self.blocks.get(number)
+        if known is not None and known[0] == block_hash:
+            known[1].extend(events)
+        else:
+            self.blocks[number] = (block_hash, list(events))
+        while self.blocks and next(iter(self.blocks)) <= number - self.reorg_depth:
+            self.blocks.popitem(last=False)
+
+    def _check_reorg(self) -> List[AttributeDict]:
+        """
+        Rewind the cursor to the fork point if a remembered block has been replaced.
+
+        Every block events came from is checked, along with the first and the last remembered block.
+        Stopping at the first block which still matches is not enough, the hash of the last block is read
+        after its logs and could already be from a new branch which replaced blocks before it.
+
+        Returns:
+            Retracted events, newest first.
+        """
+        numbers = list(self.blocks)
+        checked = [number for number in numbers if self.blocks[number][1] or number in (numbers[0], numbers[-1])]
+        fork_point = next((number for number in checked if self._block_hash(number) != self.blocks[number][0]), None)
+        if fork_point is None:
+            return []
+        logger.warning('reorg detected at block %d', fork_point)
+        # the last block known to match, the new branch could have events anywhere after it
+        index = checked.index(fork_point)
+        self.cursor = checked[index - 1] if index else fork_point - 1
+        retracted = []
+        for number in reversed(numbers):
+            if number <= self.cursor:
+                break
+            _, events = self.blocks.pop(number)
+            retracted.extend(AttributeDict({**event, 'removed': True}) for event in reversed(events))
+        return retracted
+
+    def poll(self) -> List[AttributeDict]:
+        """
+        Check for new events once.
+
+        Returns:
+            Retractions followed by new events.
+        """
+        head = self._head()
+        if self.cursor is None:
+            self.cursor = head
+            self._remember(head, self._block_hash(head))
+            self.caught_up = True
+            return []
+        result = self._check_reorg()
+        self.caught_up = head <= self.cursor + self.max_range
+        if head <= self.cursor:
+            return result
+        to_block = min(head, self.cursor + self.max_range)
+        params = {'address': self.tellor.address, 'fromBlock': self.cursor + 1, 'toBlock': to_block}
+        if self.topics is not None:
+            params['topics'] = self.topics
+        logs = sorted(self.tellor._get_logs(params), key=lambda log: (log['blockNumber'], log['logIndex']))
+        for event in self.tellor.decode_logs(logs):
+            event = AttributeDict({**event, 'removed': False})
+            self._remember(event['blockNumber'], bytes(event['blockHash']), [event])
+            result.append(event)
+        self._remember(to_block, self._block_hash(to_block))
+        self.cursor = to_block
+        return result
+
+    def __iter__(self):
+        while True:
+            yield from self.poll()
+            if self.caught_up:
+                time.sleep(self.poll_interval)
+
+    async def __aiter__(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            for event in await loop.run_in_executor(None, self.poll):
+                yield event
+            if self.caught_up:
+                await asyncio.sleep(self.poll_interval)
@@ -1,48 +1,78 @@
 import logging
-from copy import deepcopy
-from functools import partial
+from functools import lru_cache
 
+from eth_abi.decoding import ContextFramesBytesIO, TupleDecoder
 from eth_abi.exceptions import DecodingError, InsufficientDataBytes
+from eth_abi.registry import registry
 from eth_utils import function_abi_to_4byte_selector, decode_hex
-from web3._utils.abi import get_abi_input_names, get_abi_input_types, map_abi_data
-from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
-from web3.auto import w3
+from web3._utils.abi import get_abi_input_names, get_abi_input_types, get_abi_output_types
 
 from tellor.constants import TELLOR_ABI
+from tellor.log_decoders import get_normalizer, text_if_utf8
 
 logger = logging.getLogger(__name__)
 
 
-def get_func_decoders(contract):
-    def decode_func_wrapper(data):
-        func, args = contract.decode_function_input(data)
-        return func.fn_name, args
+def get_func_decoders(contract=None):
+    """
+    Decoders for all contract functions keyed by selector.
 
+    The table is built on first use and shared by all instances, it must not be modified.
+
+    Args:
+        contract: Unused, decoders only depend on the ABI.
+    """
+    return _get_func_decoders()
+
+
+@lru_cache(maxsize=None)
+def _get_func_decoders():
     decoders = {
-        function_abi_to_4byte_selector(abi): partial(decode_func_wrapper)
+        function_abi_to_4byte_selector(abi): FunctionDecoder(abi)
         for abi in TELLOR_ABI if abi['type'] == 'function'
     }
     # fix for byte nonce in function input
-    nonce_string_abi = next(x for x in TELLOR_ABI if x.get('name') == 'submitMiningSolution')
-    nonce_string_sig = function_abi_to_4byte_selector(nonce_string_abi)
-    nonce_bytes_abi = deepcopy(nonce_string_abi)
-    nonce_bytes_abi['inputs'][0]['type'] = 'bytes'
-    decoders[nonce_string_sig] = partial(decode_func_with_fallback, [nonce_string_abi, nonce_bytes_abi])
+    nonce_abi = next(x for x in TELLOR_ABI if x.get('name') == 'submitMiningSolution')
+    decoders[function_abi_to_4byte_selector(nonce_abi)] = FunctionDecoder(nonce_abi, text_or_bytes={'_nonce'})
     return decoders
 
 
-def decode_func_with_fallback(abis_to_try, data):
-    for abi in abis_to_try:
-        try:
-            selector, params = data[:4], data[4:]
-            names = get_abi_input_names(abi)
-            types = get_abi_input_types(abi)
-            decoded = w3.codec.decode_abi(types, params)
-            normalized = map_abi_data(BASE_RETURN_NORMALIZERS, types, decoded)
-            return abi['name'], dict(zip(names, normalized))
-        except DecodingError:
-            logger.debug('trying fallback fn input decoder')
-    raise DecodingError('could not decode fn input')
+class FunctionDecoder:
+    """
+    Function input decoder with argument names and ``eth_abi`` decoders resolved once.
+
+    Args:
+        abi: Function ABI.
+        text_or_bytes: Names of ``string`` inputs which are decoded as ``bytes`` and returned as text
+            only when they are valid UTF-8.
+    """
+
+    def __init__(self, abi, text_or_bytes=()):
+        self.abi = abi
+        self.fn_name = abi['name']
+        self.selector = function_abi_to_4byte_selector(abi)
+        self.names = tuple(get_abi_input_names(abi))
+        types = ['bytes' if name in text_or_bytes else type_str
+                 for name, type_str in zip(self.names, get_abi_input_types(abi))]
+        self.decoder = TupleDecoder(decoders=[registry.get_decoder(type_str) for type_str in types])
+        normalizers = [
+            text_if_utf8 if name in text_or_bytes else get_normalizer(type_str)
+            for name, type_str in zip(self.names, types)
+        ]
+        self.normalizers = tuple((i, normalize) for i, normalize in enumerate(normalizers) if normalize)
+
+    def decode_args(self, data) -> list:
+        """
+        Returns:
+            Normalized argument values in ABI input order, see :py:attr:`names`.
+        """
+        values = list(self.decoder(ContextFramesBytesIO(data[4:])))
+        for i, normalize in self.normalizers:
+            values[i] = normalize(values[i])
+        return values
+
+    def __call__(self, data):
+        return self.fn_name, dict(zip(self.names, self.decode_args(data)))
 
 
 def decode_fn_input(data, decoders):
@@ -57,3 +87,25 @@ def decode_fn_input(data, decoders):
         logger.error('could not decode fn args')
         logger.error(e)
     return '', {}
+
+
+class OutputDecoder:
+    """
+    Function return data decoder with ``eth_abi`` decoders resolved once.
+
+    Matches the output of web3 contract calls, a single value is unwrapped.
+    """
+
+    def __init__(self, abi):
+        self.abi = abi
+        self.fn_name = abi['name']
+        types = get_abi_output_types(abi)
+        self.decoder = TupleDecoder(decoders=[registry.get_decoder(type_str) for type_str in types])
+        normalizers = [get_normalizer(type_str) for type_str in types]
+        self.normalizers = tuple((i, normalize) for i, normalize in enumerate(normalizers) if normalize)
+
+    def __call__(self, data):
+        values = list(self.decoder(ContextFramesBytesIO(data)))
+        for i, normalize in self.normalizers:
+            values[i] = normalize(values[i])
+        return values[0] if len(values) == 1 else values
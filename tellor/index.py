@@ -0,0 +1,297 @@
+"""
+Local event index in SQLite with incremental sync.
+
+Each event gets its own typed table with columns named after the event args in snake case,
+e.g. ``NewValue._requestId`` becomes ``new_value.request_id``. Rows are keyed by ``(block_number, log_index)``.
+
+Note:
+    ``uint256`` and ``int256`` args, like token amounts in wei, don't fit into SQLite's 64-bit integers.
+    They are stored as 32-byte big-endian blobs, with the sign bit of ``int256`` flipped, so blobs compare
+    in numeric order and range queries work. :py:meth:`EventIndex.query` converts filters and results,
+    raw SQL has to compare these columns with blobs, e.g. ``request_id = x'00...01'``.
+"""
+import logging
+import sqlite3
+from typing import Iterable, List, Optional
+
+from eth_abi.exceptions import DecodingError
+from web3.datastructures import AttributeDict
+
+from tellor import backfill, log_decoders
+from tellor.constants import TELLOR_ABI
+from tellor.types import snake_case
+
+logger = logging.getLogger(__name__)
+
+INDEXED_EVENTS = (
+    'NonceSubmitted',
+    'NewValue',
+    'NewDispute',
+    'Voted',
+    'DisputeVoteTallied',
+    'Transfer',
+    'TipAdded',
+)
+INDEXED_COLUMNS = {'request_id', 'miner', 'dispute_id', 'voter', 'reported_miner', 'from', 'to', 'sender'}
+# offset which maps int256 to uint256 preserving order, the same as flipping the sign bit
+INT256_OFFSET = 2 ** 255
+
+
+def _column_type(type_str):
+    if type_str in ('address', 'string'):
+        return 'text'
+    if type_str == 'bool':
+        return 'integer'
+    return 'blob'
+
+
+def _uint256_to_sql(value):
+    return value.to_bytes(32, 'big')
+
+
+def _int256_to_sql(value):
+    return (value + INT256_OFFSET).to_bytes(32, 'big')
+
+
+def _uint256_from_sql(value):
+    return int.from_bytes(value, 'big')
+
+
+def _int256_from_sql(value):
+    return int.from_bytes(value, 'big') - INT256_OFFSET
+
+
+# abi type -> (to sql, from sql)
+CONVERTERS = {
+    'uint256': (_uint256_to_sql, _uint256_from_sql),
+    'int256': (_int256_to_sql, _int256_from_sql),
+}
+
+
+class EventTable:
+    def __init__(self, abi):
+        self.event = abi['name']
+        self.name = snake_case(self.event)
+        self.args = [x['name'] for x in abi['inputs']]
+        self.columns = [snake_case(x) for x in self.args]
+        self.types = [x['type'] for x in abi['inputs']]
+        self.converters = {
+            column: CONVERTERS[type_str] for column, type_str in zip(self.columns, self.types) if type_str in CONVERTERS
+        }
+        columns = ', '.join(f'"{column}" {_column_type(t)}' for column, t in zip(self.columns, self.types))
+        self.ddl = [
+            f'create table if not exists "{self.name}" ('
+            f'block_number integer, log_index integer, transaction_hash blob, {columns}, '
+            f'primary key (block_number, log_index))'
+        ] + [
+            f'create index if not exists "{self.name}_{column}" on "{self.name}" ("{column}")'
+            for column in self.columns if column in INDEXED_COLUMNS
+        ]
+        placeholders = ', '.join('?' * (len(self.columns) + 3))
+        self.insert = f'insert or replace into "{self.name}" values ({placeholders})'
+        self.delete = f'delete from "{self.name}" where block_number = ? and log_index = ?'
+
+    def to_sql(self, column, value):
+        converters = self.converters.get(column)
+        return value if converters is None else converters[0](value)
+
+    def row(self, event) -> tuple:
+        return (
+            event['blockNumber'],
+            event['logIndex'],
+            bytes(event['transactionHash']),
+            *(self.to_sql(column, event['args'][arg]) for column, arg in zip(self.columns, self.args)),
+        )
+
+    def from_sql(self, row: sqlite3.Row) -> dict:
+        result = dict(row)
+        for column, (_, from_sql) in self.converters.items():
+            result[column] = from_sql(result[column])
+        return result
+
+
+class EventIndex:
+    """
+    Persistent index of decoded contract events.
+
+    Args:
+        path: SQLite database file, ``:memory:`` works too.
+        tellor: :py:class:`~tellor.contract.Tellor` instance to sync from.
+        events: Event names to index.
+
+    Example:
+        >>> index = EventIndex('tellor.db', tellor)
+        >>> index.sync()
+        >>> index.query('NewValue', request_id=1, time=(1583020800, 1585699199))
+    """
+
+    def __init__(self, path: str, tellor=None, events: Iterable[str] = INDEXED_EVENTS):
+        self.tellor = tellor
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.tables = {
+            abi['name']: EventTable(abi)
+            for abi in TELLOR_ABI if abi['type'] == 'event' and abi['name'] in events
+        }
+        with self.db:
+            for table in self.tables.values():
+                for statement in table.ddl:
+                    self.db.execute(statement)
+            self.db.execute('create table if not exists blocks (number integer primary key, hash blob)')
+            self.db.execute('create table if not exists checkpoint (id integer primary key check (id = 0), number integer)')
+
+    @property
+    def checkpoint(self) -> Optional[int]:
+        """
+        Last block which has been fully indexed.
+        """
+        row = self.db.execute('select number from checkpoint').fetchone()
+        return row[0] if row else None
+
+    def _set_checkpoint(self, number, block_hash=None):
+        self.db.execute('insert or replace into checkpoint values (0, ?)', [number])
+        if block_hash is not None:
+            self.db.execute('insert or replace into blocks values (?, ?)', [number, bytes(block_hash)])
+
+    def add_events(self, events: Iterable[dict]):
+        """
+        Add decoded events. Events marked as ``removed`` are deleted.
+        """
+        with self.db:
+            for event in events:
+                table = self.tables.get(event['event'])
+                if table is None:
+                    continue
+                if event.get('removed'):
+                    self.db.execute(table.delete, [event['blockNumber'], event['logIndex']])
+                else:
+                    self.db.execute(table.insert, table.row(event))
+                    if 'blockHash' in event:
+                        self.db.execute(
+                            'insert or replace into blocks values (?, ?)',
+                            [event['blockNumber'], bytes(event['blockHash'])],
+                        )
+
+    def add_logs(self, logs: Iterable[dict]):
+        """
+        Decode and add raw logs, keeping the ``removed`` flag.
+        """
+        decoders = self.tellor.logs_decoders
+        events = []
+        for log in logs:
+            decoder = decoders.get(log['topics'][0])
+            if decoder is None or decoder.event not in self.tables:
+                continue
+            try:
+                events.append(AttributeDict({**decoder(log), 'removed': log.get('removed', False)}))
+            except DecodingError as e:
+                logger.error('could not decode log')
+                logger.error(log)
+                logger.error(e)
+        self.add_events(events)
+
+    def rewind(self, number: int):
+        """
+        Drop everything after a block.
+        """
+        with self.db:
+            for table in self.tables.values():
+                self.db.execute(f'delete from "{table.name}" where block_number > ?', [number])
+            self.db.execute('delete from blocks where number > ?', [number])
+            self._set_checkpoint(number)
+
+    def _fork_point(self, reorg_depth) -> Optional[int]:
+        """
+        Newest stored block which is still on the canonical chain.
+        """
+        w3 = self.tellor.contract.web3
+        checkpoint = self.checkpoint
+        rows = self.db.execute(
+            'select number, hash from blocks where number > ? order by number desc',
+            [checkpoint - reorg_depth],
+        ).fetchall()
+        for number, block_hash in rows:
+            if bytes(w3.eth.getBlock(number)['hash']) == bytes(block_hash):
+                return number
+        return checkpoint - reorg_depth
+
+    def sync(self, to_block: Optional[int] = None, confirmations: int = 0, reorg_depth: int = 64, **kwds) -> int:
+        """
+        Index new events since the checkpoint. If the chain has reorganized since the last sync,
+        events from orphaned blocks are dropped and indexed again.
+
+        Args:
+            to_block: Last block to index, defaults to the latest block minus ``confirmations``.
+            confirmations: Number of blocks to stay behind the head.
+            reorg_depth: How far back to look for a fork point.
+            **kwds: Additional args to :py:func:`~tellor.backfill.backfill_logs`.
+
+        Returns:
+            Number of indexed logs.
+        """
+        w3 = self.tellor.contract.web3
+        checkpoint = self.checkpoint
+        if checkpoint is not None:
+            fork_point = self._fork_point(reorg_depth)
+            if fork_point != checkpoint:
+                self.rewind(fork_point)
+        start = self.tellor.genesis if self.checkpoint is None else self.checkpoint + 1
+        if to_block is None:
+            to_block = w3.eth.blockNumber - confirmations
+        count = 0
+        topics = log_decoders.event_topics(self.tellor.logs_decoders, self.tables)
+        batches = backfill.backfill_logs(
+            self.tellor._get_logs, start, to_block, address=self.tellor.address, topics=topics, **kwds
+        )
+        for logs in batches:
+            self.add_logs(logs)
+            count += len(logs)
+        with self.db:
+            if to_block >= start:
+                self._set_checkpoint(to_block, w3.eth.getBlock(to_block)['hash'])
+            # only recent hashes are needed to find a fork point
+            self.db.execute('delete from blocks where number < ?', [to_block - reorg_depth])
+        return count
+
+    def query(self, event: str, order_by: str = 'block_number, log_index', limit: Optional[int] = None, **filters) -> List[dict]:
+        """
+        Query indexed events.
+
+        Args:
+            event: Event name.
+            order_by: Comma separated columns, each optionally followed by ``asc`` or ``desc``.
+            limit: Maximum number of rows.
+            **filters: Column filters, a ``(low, high)`` tuple matches an inclusive range.
+                Besides event args, ``block_number`` and ``log_index`` can be used.
+
+        Returns:
+            Rows as dicts.
+        """
+        table = self.tables[event]
+        columns = set(table.columns) | {'block_number', 'log_index'}
+        clauses, params = [], []
+        for column, value in filters.items():
+            if column not in columns:
+                raise ValueError(f'unknown column {column} for {event}')
+            if isinstance(value, tuple):
+                clauses.append(f'"{column}" between ? and ?')
+                params.extend(table.to_sql(column, x) for x in value)
+            else:
+                clauses.append(f'"{column}" = ?')
+                params.append(table.to_sql(column, value))
+        sql = f'select * from "{table.name}"'
+        if clauses:
+            sql += ' where ' + ' and '.join(clauses)
+        ordering = []
+        for term in order_by.split(','):
+            column, *direction = term.split()
+            if column not in columns or direction not in ([], ['asc'], ['desc']):
+                raise ValueError(f'invalid ordering {term.strip()!r} for {event}')
+            ordering.append(' '.join([f'"{column}"', *direction]))
+        sql += ' order by ' + ', '.join(ordering)
+        if limit is not None:
+            sql += f' limit {int(limit)}'
+        return [table.from_sql(row) for row in self.db.execute(sql, params)]
+
+    def close(self):
+        self.db.close()
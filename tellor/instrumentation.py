@@ -0,0 +1,254 @@
+"""
+Instrumentation of RPC load and decoding time.
+
+An :py:class:`Instrumentation` passed to :py:class:`~tellor.contract.Tellor` records every contract call,
+multicall batch, ``eth_getLogs`` request and decoder run, keyed by kind and name:
+
+* ``call``: ``tellor.call.<fn_name>`` reads, including the ones served from the cache.
+* ``multicall``: batches sent by :py:class:`~tellor.multicall.Multicall`, named after the functions in them.
+* ``logs``: ``eth_getLogs`` requests, the size is the returned data and topics in bytes.
+* ``decode_logs`` and ``decode_func``: decoder runs, the count is the number of logs or inputs.
+* ``rpc``: raw JSON-RPC requests by method, when :py:meth:`Instrumentation.middleware` is installed.
+
+Nothing is wrapped unless an instance is passed, so there is no overhead when it's disabled.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Hook = Callable[[str, str, float, int, int], None]
+
+
+class Histogram:
+    """
+    Latency histogram with fixed buckets, along with totals of calls, bytes and items.
+    """
+
+    __slots__ = ('buckets', 'counts', 'calls', 'seconds', 'size', 'items')
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        # the last one is +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.calls = 0
+        self.seconds = 0.0
+        self.size = 0
+        self.items = 0
+
+    def observe(self, seconds: float, size: int = 0, items: int = 1):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.calls += 1
+        self.seconds += seconds
+        self.size += size
+        self.items += items
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket the quantile falls into.
+        """
+        rank = q * self.calls
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            if total >= rank and total:
+                return bound
+        return 0.0
+
+
+def _json_size(value) -> int:
+    # approximate size of a raw JSON-RPC result, which is mostly hex strings
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, list):
+        return sum(_json_size(x) for x in value)
+    if isinstance(value, dict):
+        return sum(_json_size(x) for x in value.values())
+    return 8
+
+
+def logs_size(logs) -> int:
+    """
+    Bytes of data and topics in logs.
+    """
+    size = 0
+    for log in logs:
+        data = log['data']
+        size += (len(data) - 2) // 2 if isinstance(data, str) else len(data)
+        size += 32 * len(log['topics'])
+    return size
+
+
+class Instrumentation:
+    """
+    Collects call counts, latency histograms, bytes transferred and decode timings.
+
+    Args:
+        hooks: Callbacks receiving ``(kind, name, seconds, size, count)`` for every observation.
+        buckets: Histogram bucket bounds in seconds.
+
+    Example:
+        >>> instrumentation = Instrumentation()
+        >>> tellor = Tellor(Network.MAINNET, instrumentation=instrumentation)
+        >>> tellor.get_value_many([(request_id, t) for t in timestamps])
+        >>> print(instrumentation.to_prometheus())
+        >>> instrumentation.top(5)
+    """
+
+    def __init__(self, hooks: Optional[List[Hook]] = None, buckets: Tuple[float, ...] = BUCKETS):
+        self.hooks = list(hooks or [])
+        self.buckets = buckets
+        self.metrics: Dict[Tuple[str, str], Histogram] = {}
+        self.caches = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Hook):
+        self.hooks.append(hook)
+
+    def add_cache(self, cache):
+        """
+        Export hit and miss counts of a :py:class:`~tellor.cache.CallCache`.
+        """
+        if cache not in self.caches:
+            self.caches.append(cache)
+
+    def record(self, kind: str, name: str, seconds: float, size: int = 0, count: int = 1):
+        key = (kind, name)
+        with self._lock:
+            histogram = self.metrics.get(key)
+            if histogram is None:
+                histogram = self.metrics[key] = Histogram(self.buckets)
+            histogram.observe(seconds, size, count)
+        for hook in self.hooks:
+            hook(kind, name, seconds, size, count)
+
+    @contextmanager
+    def timer(self, kind: str, name: str, size: int = 0, count: int = 1):
+        """
+        Records the time spent in the block. Size and count can be updated on the yielded dict.
+        """
+        info = {'size': size, 'count': count}
+        began = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.record(kind, name, time.perf_counter() - began, info['size'], info['count'])
+
+    def wrap(
+        self, kind: str, name: str, fn: Callable, size: Optional[Callable] = None, items: Optional[Callable] = None
+    ) -> Callable:
+        """
+        Wraps a function to record its calls.
+
+        Args:
+            size: Function of the result which returns its size in bytes.
+            items: Function of the result which returns the number of items in it.
+        """
+        def wrapped(*args, **kwds):
+            began = time.perf_counter()
+            result = fn(*args, **kwds)
+            elapsed = time.perf_counter() - began
+            self.record(kind, name, elapsed, size(result) if size else 0, items(result) if items else 1)
+            return result
+
+        return wrapped
+
+    def middleware(self, make_request, w3):
+        """
+        Web3 middleware which records raw JSON-RPC requests. Inject it innermost to measure response sizes
+        before they are formatted.
+
+        Example:
+            >>> w3.middleware_onion.inject(instrumentation.middleware, 'instrumentation', layer=0)
+        """
+        def middleware(method, params):
+            began = time.perf_counter()
+            response = make_request(method, params)
+            self.record('rpc', method, time.perf_counter() - began, _json_size(response.get('result')))
+            return response
+
+        return middleware
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            ``(kind, name)`` mapped to calls, seconds, p50 and p99 bucket bounds, bytes and items.
+        """
+        with self._lock:
+            return {
+                key: {
+                    'calls': x.calls,
+                    'seconds': x.seconds,
+                    'p50': x.quantile(0.5),
+                    'p99': x.quantile(0.99),
+                    'size': x.size,
+                    'items': x.items,
+                }
+                for key, x in self.metrics.items()
+            }
+
+    def top(self, n: int = 10, by: str = 'calls') -> List[Tuple[Tuple[str, str], dict]]:
+        """
+        Heaviest ``(kind, name)`` pairs by ``calls``, ``seconds``, ``size`` or ``items``, useful to find N+1 patterns.
+        """
+        return sorted(self.stats().items(), key=lambda x: x[1][by], reverse=True)[:n]
+
+    def reset(self):
+        with self._lock:
+            self.metrics.clear()
+
+    def to_prometheus(self, prefix: str = 'tellor') -> str:
+        """
+        Renders the metrics in Prometheus text exposition format.
+        """
+        lines = [
+            f'# HELP {prefix}_requests_seconds Time spent per kind and name.',
+            f'# TYPE {prefix}_requests_seconds histogram',
+        ]
+        with self._lock:
+            metrics = sorted(self.metrics.items())
+            for (kind, name), x in metrics:
+                labels = f'kind="{kind}",name="{name}"'
+                total = 0
+                for bound, count in zip(self.buckets, x.counts):
+                    total += count
+                    lines.append(f'{prefix}_requests_seconds_bucket{{{labels},le="{bound}"}} {total}')
+                lines.append(f'{prefix}_requests_seconds_bucket{{{labels},le="+Inf"}} {x.calls}')
+                lines.append(f'{prefix}_requests_seconds_sum{{{labels}}} {x.seconds}')
+                lines.append(f'{prefix}_requests_seconds_count{{{labels}}} {x.calls}')
+            for metric, attr, description in [
+                ('bytes_total', 'size', 'Bytes received per kind and name.'),
+                ('items_total', 'items', 'Calls in batches, logs returned or decoded per kind and name.'),
+            ]:
+                lines.append(f'# HELP {prefix}_{metric} {description}')
+                lines.append(f'# TYPE {prefix}_{metric} counter')
+                for (kind, name), x in metrics:
+                    lines.append(f'{prefix}_{metric}{{kind="{kind}",name="{name}"}} {getattr(x, attr)}')
+        if self.caches:
+            for metric, description in [('hits', 'Cache hits.'), ('misses', 'Cache misses.'), ('evictions', 'Cache evictions.')]:
+                lines.append(f'# HELP {prefix}_cache_{metric}_total {description}')
+                lines.append(f'# TYPE {prefix}_cache_{metric}_total counter')
+                for i, cache in enumerate(self.caches):
+                    lines.append(f'{prefix}_cache_{metric}_total{{cache="{i}"}} {getattr(cache, metric)}')
+        return '\n'.join(lines) + '\n'
+
+
+class InstrumentedCaller:
+    """
+    Wraps ``contract.caller()`` or :py:class:`~tellor.cache.CachedCaller` to record every call.
+    """
+
+    def __init__(self, caller, instrumentation: Instrumentation):
+        self.caller = caller
+        self.instrumentation = instrumentation
+        self._functions = {}
+
+    def __getattr__(self, fn_name):
+        function = self._functions.get(fn_name)
+        if function is None:
+            function = self._functions[fn_name] = self.instrumentation.wrap('call', fn_name, getattr(self.caller, fn_name))
+        return function
@@ -0,0 +1,220 @@
+"""
+Off-chain token ledger replayed from ``Transfer`` events.
+
+Each address keeps its balance history as checkpoints packed into a single ``bytearray``,
+a 32-bit block number and a 128-bit balance per block the balance changed at, 20 bytes in total.
+Balances at any block are then answered locally with binary search, like the contract's ``balanceOfAt``.
+
+Note:
+    Mining rewards are minted to the contract itself without an event and then transferred out,
+    so transfers from the contract address are treated as mints. Likewise tips and dispute fees paid
+    into the contract leave circulation. The contract's own balance is not tracked.
+"""
+import heapq
+import logging
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from eth_utils import decode_hex, encode_hex, event_abi_to_log_topic
+
+from tellor import backfill, log_decoders
+from tellor.constants import TELLOR_ABI
+from tellor.types import Tributes
+
+logger = logging.getLogger(__name__)
+
+ZERO_ADDRESS = '0x' + '00' * 20
+# block number, low and high 64 bits of the balance
+RECORD = struct.Struct('<IQQ')
+MASK = 2 ** 64 - 1
+TRANSFER_ABI = next(x for x in TELLOR_ABI if x.get('name') == 'Transfer')
+TRANSFER_TOPIC = encode_hex(event_abi_to_log_topic(TRANSFER_ABI))
+
+
+def _key(address: str) -> bytes:
+    return bytes.fromhex(address[2:])
+
+
+def _append(history: bytearray, block_number: int, balance: int):
+    if balance < 0:
+        raise ValueError(f'negative balance at block {block_number}, seed the balances the replay starts with')
+    if balance >> 128:
+        raise OverflowError(f'balance {balance} does not fit into 128 bits')
+    record = RECORD.pack(block_number, balance & MASK, balance >> 64)
+    if history and RECORD.unpack_from(history, len(history) - RECORD.size)[0] == block_number:
+        # keep one checkpoint per block
+        history[-RECORD.size:] = record
+    else:
+        history += record
+
+
+def _balance(history: bytearray, index: int) -> int:
+    _, low, high = RECORD.unpack_from(history, index * RECORD.size)
+    return high << 64 | low
+
+
+def _balance_at(history: bytearray, block_number: Optional[int]) -> int:
+    count = len(history) // RECORD.size
+    if block_number is None:
+        return _balance(history, count - 1) if count else 0
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        if RECORD.unpack_from(history, middle * RECORD.size)[0] <= block_number:
+            low = middle + 1
+        else:
+            high = middle
+    return _balance(history, low - 1) if low else 0
+
+
+class Ledger:
+    """
+    Token balances and their history, replayed from ``Transfer`` events in block order.
+
+    Args:
+        tellor: :py:class:`~tellor.contract.Tellor` instance to sync from.
+        mint_addresses: Addresses outside of circulation, defaults to the zero address and the contract.
+            Transfers from them are mints and transfers to them are burns, their balances are not tracked.
+
+    Example:
+        >>> ledger = Ledger(tellor)
+        >>> ledger.sync()
+        >>> ledger.balance_of_at('0x...', 9000000)
+        >>> ledger.top(10)
+    """
+
+    def __init__(self, tellor=None, mint_addresses: Optional[Iterable[str]] = None):
+        self.tellor = tellor
+        if mint_addresses is None:
+            mint_addresses = [ZERO_ADDRESS] + ([tellor.address] if tellor is not None else [])
+        self.mint_addresses = {_key(address) for address in mint_addresses}
+        self.checkpoint = None
+        self._balances: Dict[bytes, bytearray] = {}
+        self._supply = bytearray()
+
+    def __len__(self):
+        return len(self._balances)
+
+    def _credit(self, key, block_number, amount):
+        history = self._balances.get(key)
+        if history is None:
+            history = self._balances[key] = bytearray()
+        _append(history, block_number, _balance_at(history, None) + amount)
+
+    def apply(self, block_number: int, sender: str, receiver: str, value: int):
+        """
+        Apply a single transfer. Transfers must be applied in block order.
+        """
+        sender, receiver = _key(sender), _key(receiver)
+        supply = _balance_at(self._supply, None)
+        if sender in self.mint_addresses:
+            supply += value
+        else:
+            self._credit(sender, block_number, -value)
+        if receiver in self.mint_addresses:
+            supply -= value
+        else:
+            self._credit(receiver, block_number, value)
+        _append(self._supply, block_number, supply)
+
+    def seed(self, balances: Dict[str, int], block_number: int):
+        """
+        Add balances which don't come from events, e.g. ones read with
+        :py:meth:`~tellor.contract.Tellor.balance_of_at_many` at the block the replay starts from.
+        """
+        for address, balance in balances.items():
+            self._credit(_key(address), block_number, balance)
+            _append(self._supply, block_number, _balance_at(self._supply, None) + balance)
+
+    def add_events(self, events: Iterable):
+        """
+        Apply decoded ``Transfer`` events, either dicts, compact records or ``(event, blockNumber, logIndex, args)``
+        tuples from :py:func:`~tellor.log_decoders.decode_log_tuples`.
+        """
+        for event in events:
+            if type(event) is tuple:
+                _, block_number, _, (sender, receiver, value) = event
+            elif isinstance(event, tuple):
+                block_number, (sender, receiver, value) = event[0], event[3:]
+            else:
+                block_number, args = event['blockNumber'], event['args']
+                sender, receiver, value = args['_from'], args['_to'], args['_value']
+            self.apply(block_number, sender, receiver, value)
+
+    def sync(self, to_block: Optional[int] = None, confirmations: int = 0, **kwds) -> int:
+        """
+        Replay new ``Transfer`` events since the last sync.
+
+        Args:
+            to_block: Last block, defaults to the latest block minus ``confirmations``.
+            confirmations: Number of blocks to stay behind the head. Reorgs are not handled.
+            **kwds: Additional args to :py:func:`~tellor.backfill.backfill_logs`.
+
+        Returns:
+            Number of replayed transfers.
+        """
+        w3 = self.tellor.contract.web3
+        start = self.tellor.genesis if self.checkpoint is None else self.checkpoint + 1
+        if to_block is None:
+            to_block = w3.eth.blockNumber - confirmations
+        transfer = decode_hex(TRANSFER_TOPIC)
+        decoders = {transfer: self.tellor.logs_decoders[transfer]}
+        count = 0
+        batches = backfill.backfill_logs(
+            w3.eth.getLogs, start, to_block, address=self.tellor.address, topics=[TRANSFER_TOPIC], **kwds
+        )
+        for logs in batches:
+            events = log_decoders.decode_log_tuples(logs, decoders)
+            self.add_events(events)
+            count += len(events)
+        self.checkpoint = max(to_block, start - 1)
+        logger.debug('replayed %d transfers up to %d', count, to_block)
+        return count
+
+    def balance_of(self, address: str) -> Tributes:
+        return self.balance_of_at(address, None)
+
+    def balance_of_at(self, address: str, block_number: Optional[int]) -> Tributes:
+        """
+        Returns:
+            Balance after all transfers up to and including ``block_number``, like the contract's ``balanceOfAt``.
+        """
+        return Tributes(_balance_at(self._balances.get(_key(address), b''), block_number))
+
+    def total_supply(self, block_number: Optional[int] = None) -> Tributes:
+        """
+        Tributes in circulation, which is minted minus burned tributes seen by the ledger, including seeded balances.
+        """
+        return Tributes(_balance_at(self._supply, block_number))
+
+    def holders(self, block_number: Optional[int] = None, min_balance: int = 1) -> List[Tuple[str, Tributes]]:
+        """
+        Returns:
+            Addresses with at least ``min_balance`` and their balances, largest first.
+        """
+        result = []
+        for key, history in self._balances.items():
+            balance = _balance_at(history, block_number)
+            if balance >= min_balance:
+                result.append((log_decoders.checksum_address(key), Tributes(balance)))
+        result.sort(key=lambda x: x[1], reverse=True)
+        return result
+
+    def top(self, n: int, block_number: Optional[int] = None) -> List[Tuple[str, Tributes]]:
+        """
+        Returns:
+            ``n`` largest holders, largest first.
+        """
+        balances = ((_balance_at(history, block_number), key) for key, history in self._balances.items())
+        return [(log_decoders.checksum_address(key), Tributes(balance)) for balance, key in heapq.nlargest(n, balances)]
+
+    def checkpoints(self, address: str) -> List[Tuple[int, Tributes]]:
+        """
+        Returns:
+            Every ``(block_number, balance)`` the balance of an address changed at.
+        """
+        history = self._balances.get(_key(address), b'')
+        return [
+            (RECORD.unpack_from(history, i * RECORD.size)[0], Tributes(_balance(history, i)))
+            for i in range(len(history) // RECORD.size)
+        ]
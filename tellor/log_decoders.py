@@ -1,52 +1,198 @@
 import logging
-from copy import deepcopy
-from functools import partial
+from functools import lru_cache
 
+from eth_abi.decoding import ContextFramesBytesIO, TupleDecoder
 from eth_abi.exceptions import DecodingError
-from eth_utils import event_abi_to_log_topic
-from web3._utils.events import get_event_data
-from web3.auto import w3
+from eth_abi.registry import registry
+from eth_utils import decode_hex, encode_hex, event_abi_to_log_topic, to_checksum_address
+from web3.datastructures import AttributeDict
+from web3.exceptions import LogTopicError
 
 from tellor.constants import TELLOR_ABI
+from tellor.types import event_record
 
 logger = logging.getLogger(__name__)
 
+checksum_address = lru_cache(maxsize=65536)(to_checksum_address)
 
+
+def text_if_utf8(data: bytes):
+    """
+    Decodes a dynamic ``bytes`` value as text if it's valid UTF-8, the same way a ``string`` decoder would.
+    """
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data
+
+
+def get_normalizer(type_str):
+    """
+    Value normalizer matching web3's ``BASE_RETURN_NORMALIZERS``, or ``None`` if the value is left as is.
+    """
+    if type_str == 'address':
+        return checksum_address
+    if type_str.startswith('address['):
+        return lambda values: [checksum_address(x) for x in values]
+    if type_str.endswith(']'):
+        return list
+
+
+class EventDecoder:
+    """
+    Event decoder with the topic/data layout and ``eth_abi`` decoders resolved once.
+
+    Produces the same output as ``web3._utils.events.get_event_data``.
+    The topic is not checked, logs are expected to be dispatched by topic already.
+
+    Args:
+        abi: Event ABI.
+        text_or_bytes: Names of ``string`` inputs which are decoded as ``bytes`` and returned as text
+            only when they are valid UTF-8. Some of the historical nonces are not.
+    """
+
+    def __init__(self, abi, text_or_bytes=()):
+        self.abi = abi
+        self.event = abi['name']
+        self.topic = event_abi_to_log_topic(abi)
+        self.names = tuple(x['name'] for x in abi['inputs'])
+        indexed = [x for x in abi['inputs'] if x['indexed']]
+        not_indexed = [x for x in abi['inputs'] if not x['indexed']]
+        self.topic_names = tuple(x['name'] for x in indexed)
+        self.data_names = tuple(x['name'] for x in not_indexed)
+        self.topic_decoders = tuple(registry.get_decoder(x['type']) for x in indexed)
+        data_types = ['bytes' if x['name'] in text_or_bytes else x['type'] for x in not_indexed]
+        self.data_decoder = TupleDecoder(decoders=[registry.get_decoder(type_str) for type_str in data_types])
+        # (position in decoded topics + data, normalizer)
+        normalizers = [
+            text_if_utf8 if x['name'] in text_or_bytes else get_normalizer(x['type']) for x in indexed + not_indexed
+        ]
+        self.normalizers = tuple((i, normalize) for i, normalize in enumerate(normalizers) if normalize)
+        # maps decoded topics + data back to abi input order
+        decoded_names = self.topic_names + self.data_names
+        self.order = tuple(decoded_names.index(name) for name in self.names)
+        self.record = event_record(abi)
+
+    def decode_values(self, log) -> list:
+        """
+        Returns:
+            Normalized values of indexed inputs followed by non-indexed inputs.
+        """
+        topics = log['topics']
+        if len(topics) - 1 != len(self.topic_decoders):
+            raise LogTopicError(f'Expected {len(self.topic_decoders)} log topics.  Got {len(topics) - 1}')
+        values = [decoder(ContextFramesBytesIO(topic)) for decoder, topic in zip(self.topic_decoders, topics[1:])]
+        data = log['data']
+        if isinstance(data, str):
+            data = decode_hex(data)
+        values.extend(self.data_decoder(ContextFramesBytesIO(data)))
+        for i, normalize in self.normalizers:
+            values[i] = normalize(values[i])
+        return values
+
+    def decode_args(self, log) -> tuple:
+        """
+        Returns:
+            Event args as a plain tuple in ABI input order, see :py:attr:`names`.
+        """
+        values = self.decode_values(log)
+        return tuple(values[i] for i in self.order)
+
+    def decode_record(self, log) -> tuple:
+        """
+        Returns:
+            Compact named tuple of :py:attr:`record` type, see :py:func:`~tellor.types.event_record`.
+        """
+        values = self.decode_values(log)
+        return self.record(
+            log['blockNumber'], log['logIndex'], log['transactionHash'], *[values[i] for i in self.order]
+        )
+
+    def decode_batch(self, logs) -> list:
+        """
+        Returns:
+            Event args of each log as plain tuples.
+        """
+        return [self.decode_args(log) for log in logs]
+
+    def __call__(self, log) -> AttributeDict:
+        values = self.decode_values(log)
+        args = dict(zip(self.topic_names + self.data_names, values))
+        return AttributeDict({
+            'args': AttributeDict(args),
+            'event': self.event,
+            'logIndex': log['logIndex'],
+            'transactionIndex': log['transactionIndex'],
+            'transactionHash': log['transactionHash'],
+            'address': log['address'],
+            'blockHash': log['blockHash'],
+            'blockNumber': log['blockNumber'],
+        })
+
+
+@lru_cache(maxsize=None)
 def get_log_decoders():
+    """
+    Decoders for all contract events keyed by topic.
+
+    The table is built on first use and shared by all instances, it must not be modified.
+    """
     decoders = {
-        event_abi_to_log_topic(abi): partial(get_event_data, w3.codec, abi)
+        event_abi_to_log_topic(abi): EventDecoder(abi)
         for abi in TELLOR_ABI if abi['type'] == 'event'
     }
     # fix for byte nonce in events
-    nonce_string_abi = next(x for x in TELLOR_ABI if x.get('name') == 'NonceSubmitted')
-    nonce_string_topic = event_abi_to_log_topic(nonce_string_abi)
-    nonce_bytes_abi = deepcopy(nonce_string_abi)
-    nonce_bytes_abi['inputs'][1]['type'] = 'bytes'
-    decoders[nonce_string_topic] = partial(decode_log_with_fallback, [nonce_string_abi, nonce_bytes_abi])
+    nonce_abi = next(x for x in TELLOR_ABI if x.get('name') == 'NonceSubmitted')
+    decoders[event_abi_to_log_topic(nonce_abi)] = EventDecoder(nonce_abi, text_or_bytes={'_nonce'})
     return decoders
 
 
-def decode_log_with_fallback(abis_to_try, log):
-    for abi in abis_to_try:
-        try:
-            log_with_replaced_topic = deepcopy(log)
-            log_with_replaced_topic['topics'][0] = event_abi_to_log_topic(abi)
-            return get_event_data(w3.codec, abi, log_with_replaced_topic)
-        except DecodingError:
-            logger.debug('trying fallback log decoder')
-    raise DecodingError('could not decode log')
+def event_topics(decoders, events) -> list:
+    """
+    Hex encoded topics of events by name, which JSON-RPC accepts as a topic filter.
+
+    Returns:
+        A ``topics`` filter matching any of the events.
+    """
+    events = set(events)
+    return [[encode_hex(topic) for topic, decoder in decoders.items() if decoder.event in events]]
 
 
-def decode_logs(logs, decoders):
+def decode_logs(logs, decoders, compact=False):
+    """
+    Args:
+        compact: Decode to named tuples instead of ``AttributeDict``, see :py:meth:`EventDecoder.decode_record`.
+    """
     result = []
     for log in logs:
         topic = log['topics'][0]
         if topic in decoders:
             try:
-                decoded = decoders[topic](log)
+                decoded = decoders[topic].decode_record(log) if compact else decoders[topic](log)
                 result.append(decoded)
             except DecodingError as e:
                 logger.error('could not decode log')
                 logger.error(log)
                 logger.error(e)
     return result
+
+
+def decode_log_tuples(logs, decoders):
+    """
+    Decodes logs to plain tuples, skipping ``AttributeDict`` construction.
+
+    Returns:
+        ``(event, blockNumber, logIndex, args)`` tuples, where ``args`` follow the event ABI input order.
+    """
+    result = []
+    for log in logs:
+        topic = log['topics'][0]
+        if topic in decoders:
+            decoder = decoders[topic]
+            try:
+                result.append((decoder.event, log['blockNumber'], log['logIndex'], decoder.decode_args(log)))
+            except DecodingError as e:
+                logger.error('could not decode log')
+                logger.error(log)
+                logger.error(e)
+    return result
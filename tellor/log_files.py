@@ -0,0 +1,169 @@
+"""
+Raw log archives on disk.
+
+Two formats are written:
+
+* ``binary``: a magic header followed by logs packed with :py:func:`~tellor.raw_logs.pack_log`,
+  about 40% of the JSON size. Files are memory-mapped when read.
+* ``jsonl``: one raw JSON-RPC log per line, with hex strings like nodes return them.
+
+Both are read lazily one log at a time, along with plain JSON dumps of a list of logs, so memory use
+doesn't grow with the file size. Logs read back are equal to the ``w3.eth.getLogs`` output they were written from.
+"""
+import json
+import mmap
+import re
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from tellor import log_decoders, raw_logs
+
+MAGIC = b'TRBLOGS\x01'
+FORMATS = ('binary', 'jsonl')
+# whitespace and commas between items of a JSON list
+SEPARATOR = re.compile(r'[\s,]*')
+
+
+def write_logs(path: str, logs: Iterable[dict], format: str = 'binary', append: bool = False) -> int:
+    """
+    Write logs to a file.
+
+    Args:
+        logs: Web3 formatted or raw JSON-RPC logs.
+        format: ``binary`` or ``jsonl``.
+        append: Add to an existing file of the same format.
+
+    Returns:
+        Number of logs written.
+    """
+    if format not in FORMATS:
+        raise ValueError(f'unknown format {format}, expected one of {FORMATS}')
+    count = 0
+    with open(path, 'ab' if append else 'wb') as f:
+        if format == 'binary' and f.tell() == 0:
+            f.write(MAGIC)
+        for log in logs:
+            if format == 'binary':
+                f.write(raw_logs.pack_log(log))
+            else:
+                f.write(json.dumps(raw_logs.to_raw_log(log), separators=(',', ':')).encode() + b'\n')
+            count += 1
+    return count
+
+
+def detect_format(path: str) -> str:
+    """
+    Returns:
+        ``binary``, ``jsonl`` or ``json`` for a JSON list.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(4096)
+    if head.startswith(MAGIC):
+        return 'binary'
+    return 'json' if head.lstrip().startswith(b'[') else 'jsonl'
+
+
+def _iter_binary(path):
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        offset, end = len(MAGIC), len(buffer)
+        while offset < end:
+            log, offset = raw_logs.unpack_log(buffer, offset)
+            yield log
+
+
+def _iter_jsonl(path):
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield raw_logs.format_log(json.loads(line))
+
+
+def _iter_json(path, read_size=1 << 20):
+    # streams the items of a top-level list without loading the whole file
+    decoder = json.JSONDecoder()
+    with open(path, 'r') as f:
+        buffer = f.read(read_size).lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f'{path} is not a JSON list')
+        position = 1
+        while True:
+            position = SEPARATOR.match(buffer, position).end()
+            if buffer.startswith(']', position):
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                chunk = f.read(read_size)
+                if not chunk:
+                    raise
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            yield raw_logs.format_log(item)
+
+
+def read_logs(path: str, format: Optional[str] = None) -> Iterator[dict]:
+    """
+    Lazily read logs from a file.
+
+    Args:
+        format: ``binary``, ``jsonl`` or ``json``, detected from the contents by default.
+
+    Yields:
+        Logs in the same shape as ``w3.eth.getLogs`` output.
+    """
+    format = format or detect_format(path)
+    readers = {'binary': _iter_binary, 'jsonl': _iter_jsonl, 'json': _iter_json}
+    return readers[format](path)
+
+
+def read_packed(path: str, chunksize: int = 5000) -> Iterator[bytes]:
+    """
+    Read a binary file as packed chunks of logs, e.g. for :py:meth:`~tellor.parallel.LogDecoderPool.decode_packed`.
+    Only the headers are parsed, the records are sliced from the memory map as is.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not a binary log file')
+        start = offset = len(MAGIC)
+        end = len(buffer)
+        count = 0
+        while offset < end:
+            *_, topic_count, _, data_length = raw_logs.HEADER.unpack_from(buffer, offset)
+            offset += raw_logs.HEADER.size + raw_logs.FIXED + topic_count * 32 + data_length
+            count += 1
+            if count == chunksize:
+                yield buffer[start:offset]
+                start, count = offset, 0
+        if count:
+            yield buffer[start:offset]
+
+
+def convert(source: str, destination: str, format: str = 'binary') -> int:
+    """
+    Convert a log file, e.g. a JSON dump to the binary format, without loading it into memory.
+
+    Returns:
+        Number of logs converted.
+    """
+    return write_logs(destination, read_logs(source), format)
+
+
+def decode_file(path: str, decoders=None, compact: bool = False, batch_size: int = 1000) -> Iterator:
+    """
+    Lazily decode a log file with :py:func:`~tellor.log_decoders.decode_logs`.
+
+    Args:
+        decoders: Decoder table, defaults to :py:func:`~tellor.log_decoders.get_log_decoders`.
+        compact: Decode to named tuples.
+        batch_size: Number of logs held in memory at once.
+
+    Yields:
+        Decoded events in file order.
+    """
+    decoders = log_decoders.get_log_decoders() if decoders is None else decoders
+    logs = read_logs(path)
+    while True:
+        batch = list(islice(logs, batch_size))
+        if not batch:
+            return
+        yield from log_decoders.decode_logs(batch, decoders, compact)
@@ -0,0 +1,302 @@
+"""
+Miner leaderboard maintained incrementally from events.
+
+Submissions come from ``NonceSubmitted``, rewards from ``Transfer`` events sent by the contract,
+dispute outcomes from ``DisputeVoteTallied`` and stake changes from the staking events.
+Aggregates are kept per miner and per period of blocks, along with indexes sorted by each metric,
+so top-k and rollup queries don't scan anything. The state is checkpointed to disk and an update
+only fetches the blocks after the checkpoint.
+"""
+import bisect
+import logging
+import os
+import pickle
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from tellor import log_decoders
+from tellor.types import StakerStatus, Tributes, add_slots
+
+logger = logging.getLogger(__name__)
+
+MINER_EVENTS = ('NonceSubmitted', 'DisputeVoteTallied', 'NewStake', 'StakeWithdrawRequested', 'StakeWithdrawn')
+METRICS = ('submissions', 'rewards', 'disputes_lost')
+STAKE_EVENTS = {
+    'NewStake': StakerStatus.STAKED,
+    'StakeWithdrawRequested': StakerStatus.WITHDRAWING,
+    'StakeWithdrawn': StakerStatus.NOT_STAKED,
+}
+# event args in abi order
+_ARGS = {
+    'NonceSubmitted': ('_miner', '_nonce', '_requestId', '_value', '_currentChallenge'),
+    'DisputeVoteTallied': ('_disputeID', '_result', '_reportedMiner', '_reportingParty', '_active'),
+    'Transfer': ('_from', '_to', '_value'),
+    'NewStake': ('_sender',),
+    'StakeWithdrawRequested': ('_sender',),
+    'StakeWithdrawn': ('_sender',),
+}
+
+
+@add_slots
+@dataclass
+class MinerStats:
+    """
+    Totals of a miner.
+
+    Attributes:
+        miner: Miner address.
+        submissions: Number of submitted values.
+        rewards: Tributes transferred by the contract, which are mining rewards and returned dispute fees.
+        disputes_lost: Number of disputes against the miner which passed.
+        disputes_won: Number of disputes against the miner which failed.
+        status: Stake status from events, replaced with the contract state on refresh.
+        first_block: Block of the first submission.
+        last_block: Block of the last submission.
+        requests: Request id mapped to the number of submissions.
+    """
+
+    miner: str
+    submissions: int = 0
+    rewards: Tributes = Tributes(0)
+    disputes_lost: int = 0
+    disputes_won: int = 0
+    status: StakerStatus = StakerStatus.NOT_STAKED
+    first_block: Optional[int] = None
+    last_block: Optional[int] = None
+    requests: Dict[int, int] = field(default_factory=dict, repr=False)
+
+
+@add_slots
+@dataclass
+class PeriodStats:
+    """
+    Totals of a period of blocks.
+
+    Attributes:
+        start_block: First block of the period.
+        submissions: Number of submitted values.
+        rewards: Tributes transferred to miners.
+        disputes_lost: Number of passed disputes.
+        miners: Miner mapped to ``[submissions, rewards]`` in the period.
+    """
+
+    start_block: int
+    submissions: int = 0
+    rewards: Tributes = Tributes(0)
+    disputes_lost: int = 0
+    miners: Dict[str, list] = field(default_factory=dict, repr=False)
+
+
+class MinerLeaderboard:
+    """
+    Per-miner and per-period aggregates with top-k queries.
+
+    Args:
+        tellor: :py:class:`~tellor.contract.Tellor` instance.
+        path: File the state is loaded from if it exists and checkpointed to after every update.
+        period: Rollup period in blocks, defaults to about a day.
+
+    Attributes:
+        miners: Miner address mapped to :py:class:`MinerStats`.
+        periods: Period number mapped to :py:class:`PeriodStats`.
+        checkpoint: Last block the aggregates are up to date with.
+
+    Example:
+        >>> leaderboard = MinerLeaderboard(tellor, 'miners.pickle')
+        >>> leaderboard.update()
+        >>> leaderboard.top(10, by='rewards')
+        >>> leaderboard.rollup(11_000_000).miners
+    """
+
+    def __init__(self, tellor, path: Optional[str] = None, period: int = 5760):
+        self.tellor = tellor
+        self.path = path
+        self.period = period
+        self.miners: Dict[str, MinerStats] = {}
+        self.periods: Dict[int, PeriodStats] = {}
+        self.checkpoint: Optional[int] = None
+        # metric -> sorted (value, miner)
+        self._index: Dict[str, List[Tuple[int, str]]] = {metric: [] for metric in METRICS}
+        # metric value each miner is indexed with
+        self._indexed: Dict[str, Dict[str, int]] = {metric: {} for metric in METRICS}
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def __len__(self):
+        return len(self.miners)
+
+    def __getitem__(self, miner) -> MinerStats:
+        return self.miners[miner]
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            state = pickle.load(f)
+        if state['period'] != self.period:
+            raise ValueError(f'{self.path} has a period of {state["period"]} blocks, not {self.period}')
+        self.checkpoint = state['checkpoint']
+        self.miners = state['miners']
+        self.periods = state['periods']
+        self._reindex(self.miners)
+
+    def _save(self):
+        state = {'checkpoint': self.checkpoint, 'period': self.period, 'miners': self.miners, 'periods': self.periods}
+        with open(self.path + '.tmp', 'wb') as f:
+            pickle.dump(state, f)
+        os.replace(self.path + '.tmp', self.path)
+
+    def _reindex(self, miners: Iterable[str]):
+        for metric in METRICS:
+            index, indexed = self._index[metric], self._indexed[metric]
+            for miner in miners:
+                value = getattr(self.miners[miner], metric)
+                old = indexed.get(miner)
+                if old == value:
+                    continue
+                if old is not None:
+                    del index[bisect.bisect_left(index, (old, miner))]
+                bisect.insort(index, (value, miner))
+                indexed[miner] = value
+
+    def _stats(self, miner) -> MinerStats:
+        stats = self.miners.get(miner)
+        if stats is None:
+            stats = self.miners[miner] = MinerStats(miner)
+        return stats
+
+    def _rollup(self, block_number) -> PeriodStats:
+        number = block_number // self.period
+        rollup = self.periods.get(number)
+        if rollup is None:
+            rollup = self.periods[number] = PeriodStats(number * self.period)
+        return rollup
+
+    def add_events(self, events: Iterable) -> Set[str]:
+        """
+        Apply decoded events in block order, either dicts or compact records.
+        ``Transfer`` events only count as rewards when sent by the contract to a known miner.
+
+        Returns:
+            Miners whose stats changed.
+        """
+        touched = set()
+        contract = self.tellor.address
+        for event in events:
+            if isinstance(event, tuple):
+                name, block_number, args = event.event, event[0], event[3:]
+            else:
+                name = event['event']
+                if name not in _ARGS or event.get('removed'):
+                    continue
+                block_number, args = event['blockNumber'], tuple(event['args'][x] for x in _ARGS[name])
+            if name == 'NonceSubmitted':
+                miner, _, request_id = args[:3]
+                stats = self._stats(miner)
+                stats.submissions += 1
+                stats.requests[request_id] = stats.requests.get(request_id, 0) + 1
+                if stats.first_block is None:
+                    stats.first_block = block_number
+                stats.last_block = block_number
+                rollup = self._rollup(block_number)
+                rollup.submissions += 1
+                totals = rollup.miners.get(miner)
+                if totals is None:
+                    rollup.miners[miner] = [1, 0]
+                else:
+                    totals[0] += 1
+            elif name == 'Transfer':
+                sender, receiver, value = args
+                if sender != contract or receiver not in self.miners:
+                    continue
+                stats = self.miners[receiver]
+                stats.rewards = Tributes(stats.rewards + value)
+                rollup = self._rollup(block_number)
+                rollup.rewards = Tributes(rollup.rewards + value)
+                rollup.miners.setdefault(receiver, [0, 0])[1] += value
+                miner = receiver
+            elif name == 'DisputeVoteTallied':
+                _, result, miner = args[:3]
+                stats = self._stats(miner)
+                if result > 0:
+                    stats.disputes_lost += 1
+                    self._rollup(block_number).disputes_lost += 1
+                else:
+                    stats.disputes_won += 1
+            elif name in STAKE_EVENTS:
+                miner = args[0]
+                self._stats(miner).status = STAKE_EVENTS[name]
+            else:
+                continue
+            touched.add(miner)
+        self._reindex(touched)
+        return touched
+
+    def refresh(self, miners: Optional[Iterable[str]] = None, block_identifier=None):
+        """
+        Replace stake status from events with the contract state in a batched ``getStakerInfo`` read.
+
+        Args:
+            miners: Miners to refresh, defaults to all.
+        """
+        miners = list(self.miners if miners is None else miners)
+        for miner, status in zip(miners, self.tellor.staker_status_many(miners, block_identifier)):
+            self.miners[miner].status = status
+
+    def update(self, to_block: Optional[int] = None, confirmations: int = 0, **kwds) -> int:
+        """
+        Apply events after the checkpoint, refresh the stake status of the miners seen and save a checkpoint.
+
+        Args:
+            to_block: Last block, defaults to the latest block minus ``confirmations``.
+            confirmations: Number of blocks to stay behind the head. Reorgs are not handled.
+            **kwds: Additional args to :py:meth:`~tellor.contract.Tellor.iter_logs`.
+
+        Returns:
+            Number of miners whose stats changed.
+        """
+        start = self.tellor.genesis if self.checkpoint is None else self.checkpoint + 1
+        if to_block is None:
+            to_block = self.tellor.w3.eth.blockNumber - confirmations
+        if to_block < start:
+            return 0
+        decoders = self.tellor.logs_decoders
+        topics = log_decoders.event_topics(decoders, MINER_EVENTS)
+        touched = self.add_events(self.tellor.iter_logs(start, to_block, topics=topics, compact=True, **kwds))
+        # rewards are the bulk of transfers from the contract, there are too many other transfers to fetch them all
+        transfer, = log_decoders.event_topics(decoders, ['Transfer'])
+        sender = '0x' + self.tellor.address[2:].lower().rjust(64, '0')
+        transfers = self.tellor.iter_logs(start, to_block, topics=[transfer, sender], compact=True, **kwds)
+        touched |= self.add_events(transfers)
+        if touched:
+            self.refresh(touched, to_block)
+        self.checkpoint = to_block
+        if self.path is not None:
+            self._save()
+        logger.debug('updated %d miners up to block %d', len(touched), to_block)
+        return len(touched)
+
+    def top(self, k: int, by: str = 'submissions') -> List[MinerStats]:
+        """
+        Returns:
+            ``k`` miners with the largest ``submissions``, ``rewards`` or ``disputes_lost``, largest first.
+        """
+        index = self._index[by]
+        return [self.miners[miner] for _, miner in reversed(index[-k:])] if k > 0 else []
+
+    def rollup(self, block_number: int) -> Optional[PeriodStats]:
+        """
+        Returns:
+            Totals of the period a block falls into, ``None`` if nothing happened in it.
+        """
+        return self.periods.get(block_number // self.period)
+
+    def rollups(self, from_block: Optional[int] = None, to_block: Optional[int] = None) -> List[PeriodStats]:
+        """
+        Returns:
+            Periods overlapping a block range which had any activity, in block order.
+        """
+        first = 0 if from_block is None else from_block // self.period
+        last = None if to_block is None else to_block // self.period
+        return [
+            self.periods[number] for number in sorted(self.periods)
+            if number >= first and (last is None or number <= last)
+        ]
@@ -0,0 +1,138 @@
+"""
+Live monitoring of the mining state.
+
+Each poll checks the head and only when there is a new block reads a :py:class:`~tellor.types.StateSnapshot`
+in a single multicall. Consecutive snapshots are compared and only the changes are emitted.
+"""
+import asyncio
+import logging
+import time
+from operator import attrgetter
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+from tellor.types import StateSnapshot
+
+logger = logging.getLogger(__name__)
+
+FIELDS = {
+    'challenge': attrgetter('current_variables.challenge'),
+    'request': attrgetter('current_variables.request'),
+    'tip': attrgetter('current_variables.tip'),
+    'difficulty': attrgetter('difficulty'),
+    'slot_progress': attrgetter('slot_progress'),
+    'staker_count': attrgetter('staker_count'),
+    'dispute_fee': attrgetter('dispute_fee'),
+    'on_deck': attrgetter('on_deck'),
+    'request_q': attrgetter('request_q'),
+}
+
+
+class StateChange(NamedTuple):
+    field: str
+    block_number: int
+    old: Any
+    new: Any
+
+
+def diff(old: StateSnapshot, new: StateSnapshot, fields: Optional[Iterable[str]] = None) -> List[StateChange]:
+    """
+    Returns:
+        Changes between two snapshots, in :py:data:`FIELDS` order.
+    """
+    changes = []
+    for name in FIELDS if fields is None else fields:
+        before, after = FIELDS[name](old), FIELDS[name](new)
+        if before != after:
+            changes.append(StateChange(name, new.block_number, before, after))
+    return changes
+
+
+class StateMonitor:
+    """
+    Polls the mining state and yields what changed, e.g. a new challenge or slot progress.
+
+    The poll interval adapts to the block time, which is estimated from how often new blocks are seen.
+    A poll between blocks costs a single ``eth_blockNumber`` request.
+
+    Args:
+        tellor: :py:class:`~tellor.contract.Tellor` instance.
+        min_interval: Minimum seconds between polls.
+        max_interval: Maximum seconds between polls.
+        block_time: Initial block time estimate in seconds.
+        fields: Names from :py:data:`FIELDS` to watch, defaults to all.
+
+    Attributes:
+        snapshot: Latest :py:class:`~tellor.types.StateSnapshot`, set by the first poll.
+        requests: Number of RPC requests made.
+
+    Example:
+        >>> for change in tellor.monitor():
+        ...     if change.field == 'challenge':
+        ...         print('new challenge', change.new.hex())
+    """
+
+    def __init__(
+        self,
+        tellor,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0,
+        block_time: float = 13.0,
+        fields: Optional[Iterable[str]] = None,
+    ):
+        self.tellor = tellor
+        self.w3 = tellor.contract.web3
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.block_time = block_time
+        self.fields = None if fields is None else list(fields)
+        self.snapshot: Optional[StateSnapshot] = None
+        self.requests = 0
+        # when the latest block was first seen
+        self._seen_at = None
+
+    def poll(self) -> List[StateChange]:
+        """
+        Check for changes once.
+
+        Returns:
+            Changes since the previous snapshot, the first poll returns none.
+        """
+        head = self.w3.eth.blockNumber
+        self.requests += 1
+        if self.snapshot is not None and head <= self.snapshot.block_number:
+            return []
+        now = time.monotonic()
+        snapshot = self.tellor.snapshot(head)
+        self.requests += 1
+        changes = []
+        if self.snapshot is not None:
+            changes = diff(self.snapshot, snapshot, self.fields)
+            observed = (now - self._seen_at) / (head - self.snapshot.block_number)
+            self.block_time = 0.8 * self.block_time + 0.2 * observed
+            logger.debug('block %d, %d changes, block time %.1fs', head, len(changes), self.block_time)
+        self.snapshot = snapshot
+        self._seen_at = now
+        return changes
+
+    def next_interval(self) -> float:
+        """
+        Seconds until the next block is expected, or a fraction of the block time if it's late.
+        """
+        if self._seen_at is None:
+            return self.min_interval
+        remaining = self._seen_at + self.block_time - time.monotonic()
+        if remaining <= 0:
+            remaining = self.block_time / 4
+        return min(max(remaining, self.min_interval), self.max_interval)
+
+    def __iter__(self):
+        while True:
+            yield from self.poll()
+            time.sleep(self.next_interval())
+
+    async def __aiter__(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            for change in await loop.run_in_executor(None, self.poll):
+                yield change
+            await asyncio.sleep(self.next_interval())
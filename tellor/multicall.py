@@ -0,0 +1,128 @@
+"""
+Batched contract reads.
+
+View calls are aggregated into ``eth_call`` requests to MakerDAO's Multicall contract,
+which executes them at the same block and returns all results at once.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from eth_abi import decode_abi, encode_abi
+from eth_utils import function_abi_to_4byte_selector
+from web3._utils.abi import get_abi_input_types
+
+from tellor.func_decoders import OutputDecoder
+
+AGGREGATE_ABI = {
+    'name': 'aggregate',
+    'type': 'function',
+    'inputs': [{
+        'name': 'calls',
+        'type': 'tuple[]',
+        'components': [{'name': 'target', 'type': 'address'}, {'name': 'callData', 'type': 'bytes'}],
+    }],
+    'outputs': [{'name': 'blockNumber', 'type': 'uint256'}, {'name': 'returnData', 'type': 'bytes[]'}],
+}
+AGGREGATE_SELECTOR = function_abi_to_4byte_selector(AGGREGATE_ABI)
+
+
+def chunks(seq: Sequence, size: int) -> List[Sequence]:
+    return [seq[i:i + size] for i in range(0, len(seq), size)]
+
+
+class Multicall:
+    """
+    Aggregates view calls to a contract into as few ``eth_call`` requests as possible.
+
+    Args:
+        contract: Web3 contract which is called.
+        address: Multicall contract address. If ``None``, calls are sent one by one.
+        max_calls: Maximum number of calls aggregated into a single ``eth_call``.
+        workers: Number of ``eth_call`` requests sent concurrently.
+        instrumentation: Optional :py:class:`~tellor.instrumentation.Instrumentation` to record batches with.
+
+    Note:
+        Calls are specified as ``(fn_name, *args)`` tuples and return the same values as
+        the corresponding ``contract.caller()`` methods.
+    """
+
+    def __init__(self, contract, address: Optional[str] = None, max_calls: int = 200, workers: int = 1, instrumentation=None):
+        self.contract = contract
+        self.w3 = contract.web3
+        self.address = address
+        self.max_calls = max_calls
+        self.workers = workers
+        self.instrumentation = instrumentation
+        self._functions = {}
+
+    def _function(self, fn_name):
+        if fn_name not in self._functions:
+            abi = self.contract.get_function_by_name(fn_name).abi
+            self._functions[fn_name] = (
+                function_abi_to_4byte_selector(abi),
+                get_abi_input_types(abi),
+                OutputDecoder(abi),
+            )
+        return self._functions[fn_name]
+
+    def encode(self, fn_name, args) -> bytes:
+        selector, types, _ = self._function(fn_name)
+        return selector + encode_abi(types, args)
+
+    def decode(self, fn_name, data: bytes):
+        _, _, decoder = self._function(fn_name)
+        return decoder(data)
+
+    def aggregate(self, calls: Sequence[tuple], block_identifier='latest') -> Tuple[Optional[int], list]:
+        """
+        Execute calls in a single request.
+
+        Returns:
+            Block number the calls were executed at and their results.
+        """
+        if self.instrumentation is None:
+            return self._aggregate(calls, block_identifier)
+        name = '+'.join(sorted({fn_name for fn_name, *_ in calls}))
+        with self.instrumentation.timer('multicall', name, count=len(calls)):
+            return self._aggregate(calls, block_identifier)
+
+    def _aggregate(self, calls, block_identifier):
+        encoded = [(self.contract.address, self.encode(fn_name, args)) for fn_name, *args in calls]
+        if self.address is None:
+            return self._call_one_by_one(calls, encoded, block_identifier)
+        data = AGGREGATE_SELECTOR + encode_abi(['(address,bytes)[]'], [encoded])
+        response = self.w3.eth.call({'to': self.address, 'data': data}, block_identifier)
+        block_number, return_data = decode_abi(['uint256', 'bytes[]'], response)
+        return block_number, [self.decode(fn_name, data) for (fn_name, *_), data in zip(calls, return_data)]
+
+    def _call_one_by_one(self, calls, encoded, block_identifier):
+        results = [
+            self.decode(fn_name, self.w3.eth.call({'to': target, 'data': data}, block_identifier))
+            for (fn_name, *_), (target, data) in zip(calls, encoded)
+        ]
+        return block_identifier if isinstance(block_identifier, int) else None, results
+
+    def __call__(self, calls: Iterable[tuple], block_identifier='latest') -> list:
+        """
+        Execute any number of calls, split into requests of at most ``max_calls``.
+
+        If the block is not specified, all requests are pinned to the block of the first one.
+
+        Returns:
+            Results in the same order as calls.
+        """
+        batches = chunks(list(calls), self.max_calls)
+        if not batches:
+            return []
+        block_number, results = self.aggregate(batches[0], block_identifier)
+        if block_number is not None:
+            block_identifier = block_number
+        if self.workers > 1 and len(batches) > 2:
+            with ThreadPoolExecutor(self.workers) as executor:
+                rest = executor.map(lambda batch: self.aggregate(batch, block_identifier)[1], batches[1:])
+                for batch_results in rest:
+                    results.extend(batch_results)
+        else:
+            for batch in batches[1:]:
+                results.extend(self.aggregate(batch, block_identifier)[1])
+        return results
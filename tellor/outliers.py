@@ -0,0 +1,274 @@
+"""
+Detection of outlier submissions worth disputing.
+
+``NonceSubmitted`` events are grouped into slots by challenge and request id. When the ``NewValue`` event
+closes a slot, every submission is compared with the slot median and with the recent history of the request,
+using the median absolute deviation (MAD) as a robust measure of spread.
+The history of each request is a :py:class:`RollingStats` window updated in ``O(log n)``.
+"""
+import bisect
+import logging
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from tellor import log_decoders
+
+logger = logging.getLogger(__name__)
+
+OUTLIER_EVENTS = ('NonceSubmitted', 'NewValue')
+# scales MAD to the standard deviation of normally distributed values
+MAD_SCALE = 1.4826
+# event args in abi order
+_ARGS = {
+    'NonceSubmitted': ('_miner', '_nonce', '_requestId', '_value', '_currentChallenge'),
+    'NewValue': ('_requestId', '_time', '_value', '_totalTips', '_currentChallenge'),
+}
+
+
+def _kth_deviation(ordered: List[int], center, split: int, k: int):
+    # k-th smallest |x - center|, merging the deviations left and right of the split, which are both sorted
+    n_left, n_right = split, len(ordered) - split
+
+    def left(i):
+        return center - ordered[split - 1 - i]
+
+    def right(j):
+        return ordered[split + j] - center
+
+    lo, hi = max(0, k + 1 - n_right), min(k + 1, n_left)
+    while lo < hi:
+        i = (lo + hi) // 2
+        if left(i) < right(k - i):
+            lo = i + 1
+        else:
+            hi = i
+    j = k + 1 - lo
+    return max(left(lo - 1) if lo else 0, right(j - 1) if j else 0)
+
+
+def median_mad(ordered: List[int]) -> Tuple[float, float]:
+    """
+    Median and median absolute deviation of a sorted list in ``O(log n)``.
+    """
+    n = len(ordered)
+    half = n // 2
+    if n % 2:
+        center = ordered[half]
+        return center, _kth_deviation(ordered, center, half, half)
+    center = (ordered[half - 1] + ordered[half]) / 2
+    return center, (_kth_deviation(ordered, center, half, half - 1) + _kth_deviation(ordered, center, half, half)) / 2
+
+
+class RollingStats:
+    """
+    Median, MAD and quantiles over the last ``window`` values.
+
+    Values are kept both in arrival order and sorted, an update is a binary search and a list insert.
+    """
+
+    __slots__ = ('window', 'values', 'ordered')
+
+    def __init__(self, window: int = 100):
+        self.window = window
+        self.values = deque()
+        self.ordered = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def add(self, value):
+        if len(self.values) == self.window:
+            del self.ordered[bisect.bisect_left(self.ordered, self.values.popleft())]
+        self.values.append(value)
+        bisect.insort(self.ordered, value)
+
+    def median_mad(self) -> Tuple[float, float]:
+        return median_mad(self.ordered)
+
+    def quantile(self, q: float):
+        """
+        Nearest rank quantile, ``q`` between 0 and 1.
+        """
+        return self.ordered[min(int(q * len(self.ordered)), len(self.ordered) - 1)]
+
+
+class Flag(NamedTuple):
+    """
+    A submission which deviates from the slot median or the recent history of the request.
+    The miner, request id and timestamp are the arguments of :py:meth:`~tellor.contract.Tellor.get_dispute_by`.
+
+    Attributes:
+        reason: ``slot`` or ``history``, whichever median the value was compared with.
+        median: The median it was compared with.
+        score: Distance from the median in scaled MADs.
+        in_dispute: Whether the value is in dispute, ``None`` until fetched.
+    """
+
+    request_id: int
+    timestamp: int
+    miner: str
+    value: int
+    reason: str
+    median: float
+    score: float
+    block_number: int
+    in_dispute: Optional[bool] = None
+
+
+class OutlierDetector:
+    """
+    Flags outlier submissions from a replay or a live stream of events.
+
+    A submission is flagged when its distance from the reference median is more than ``threshold`` times
+    the scaled MAD, or ``threshold`` times ``min_deviation`` of the median when the values barely vary.
+    The reference is the slot median first, then the median of the last ``window`` values of the request.
+
+    Args:
+        tellor: :py:class:`~tellor.contract.Tellor` instance, needed to read events and dispute status.
+        window: Number of recent values per request to compare with.
+        threshold: Flag submissions further than this many scaled MADs from the median.
+        min_deviation: Relative deviation which is never flagged, guards against a MAD of zero.
+        min_history: Number of values a request needs before history is used.
+
+    Attributes:
+        history: Request id mapped to :py:class:`RollingStats` of its values.
+        submissions: Number of processed submissions.
+        checkpoint: Last block the detector has seen events from, set by :py:meth:`update`.
+
+    Example:
+        >>> detector = OutlierDetector(tellor)
+        >>> for flag in detector.update():
+        ...     if not flag.in_dispute:
+        ...         print(flag, tellor.get_dispute_by(flag.miner, flag.request_id, flag.timestamp))
+    """
+
+    def __init__(
+        self,
+        tellor=None,
+        window: int = 100,
+        threshold: float = 3.5,
+        min_deviation: float = 0.01,
+        min_history: int = 10,
+    ):
+        self.tellor = tellor
+        self.window = window
+        self.threshold = threshold
+        self.min_deviation = min_deviation
+        self.min_history = min_history
+        self.history: Dict[int, RollingStats] = {}
+        self.submissions = 0
+        self.checkpoint: Optional[int] = None
+        # (challenge, request id) -> (miner, value) submissions
+        self._slots: Dict[Tuple[bytes, int], list] = {}
+
+    def _tolerance(self, median, mad):
+        return self.threshold * max(MAD_SCALE * mad, self.min_deviation * abs(median), 1)
+
+    def _close(self, block_number, request_id, timestamp, value, challenge) -> List[Flag]:
+        submissions = self._slots.pop((challenge, request_id), ())
+        self.submissions += len(submissions)
+        history = self.history.get(request_id)
+        if history is None:
+            history = self.history[request_id] = RollingStats(self.window)
+        flags = []
+        if submissions:
+            slot_median, slot_mad = median_mad(sorted(x for _, x in submissions))
+            slot_tolerance = self._tolerance(slot_median, slot_mad)
+            use_history = len(history) >= self.min_history
+            if use_history:
+                history_median, history_mad = history.median_mad()
+                history_tolerance = self._tolerance(history_median, history_mad)
+            for miner, submitted in submissions:
+                if abs(submitted - slot_median) > slot_tolerance:
+                    score = abs(submitted - slot_median) * self.threshold / slot_tolerance
+                    flags.append(
+                        Flag(request_id, timestamp, miner, submitted, 'slot', slot_median, score, block_number)
+                    )
+                elif use_history and abs(submitted - history_median) > history_tolerance:
+                    score = abs(submitted - history_median) * self.threshold / history_tolerance
+                    flags.append(
+                        Flag(request_id, timestamp, miner, submitted, 'history', history_median, score, block_number)
+                    )
+        history.add(value)
+        return flags
+
+    def add_events(self, events: Iterable) -> List[Flag]:
+        """
+        Process decoded ``NonceSubmitted`` and ``NewValue`` events in order, others are skipped.
+
+        Args:
+            events: Event dicts, compact records or tuples from :py:func:`~tellor.log_decoders.decode_log_tuples`.
+
+        Returns:
+            Flags for the slots closed by these events, without dispute status.
+        """
+        flags = []
+        slots = self._slots
+        for event in events:
+            if type(event) is tuple:
+                name, block_number, _, args = event
+            elif isinstance(event, tuple):
+                name, block_number, args = event.event, event[0], event[3:]
+            else:
+                name = event['event']
+                if name not in _ARGS or event.get('removed'):
+                    continue
+                block_number, args = event['blockNumber'], tuple(event['args'][x] for x in _ARGS[name])
+            if name == 'NonceSubmitted':
+                miner, _, request_id, value, challenge = args
+                key = (challenge, request_id)
+                if key in slots:
+                    slots[key].append((miner, value))
+                else:
+                    slots[key] = [(miner, value)]
+            elif name == 'NewValue':
+                request_id, timestamp, value, _, challenge = args
+                flags.extend(self._close(block_number, request_id, timestamp, value, challenge))
+        return flags
+
+    def enrich(self, flags: List[Flag], block_identifier='latest') -> List[Flag]:
+        """
+        Set ``in_dispute`` on flags with batched ``isInDispute`` calls, one per flagged value.
+        """
+        keys = list({(flag.request_id, flag.timestamp) for flag in flags})
+        results = dict(zip(keys, self.tellor.multicall((('isInDispute', *key) for key in keys), block_identifier)))
+        return [flag._replace(in_dispute=results[flag.request_id, flag.timestamp]) for flag in flags]
+
+    def update(self, to_block: Optional[int] = None, confirmations: int = 0, enrich: bool = True, **kwds) -> List[Flag]:
+        """
+        Replay events since the last update, starting from the contract genesis.
+
+        Args:
+            to_block: Last block, defaults to the latest block minus ``confirmations``.
+            confirmations: Number of blocks to stay behind the head. Reorgs are not handled.
+            enrich: Fetch dispute status of the flags.
+            **kwds: Additional args to :py:meth:`~tellor.contract.Tellor.iter_logs`.
+
+        Returns:
+            New flags in block order.
+        """
+        start = self.tellor.genesis if self.checkpoint is None else self.checkpoint + 1
+        if to_block is None:
+            to_block = self.tellor.w3.eth.blockNumber - confirmations
+        if to_block < start:
+            return []
+        topics = log_decoders.event_topics(self.tellor.logs_decoders, OUTLIER_EVENTS)
+        events = self.tellor.iter_logs(start, to_block, topics=topics, compact=True, **kwds)
+        flags = self.add_events(events)
+        self.checkpoint = to_block
+        logger.debug('%d flags from %d submissions up to block %d', len(flags), self.submissions, to_block)
+        return self.enrich(flags, to_block) if enrich and flags else flags
+
+    def follow(self, confirmations: int = 0, enrich: bool = True, **kwds) -> Iterator[Flag]:
+        """
+        Watch new submissions and yield flags as slots are closed.
+
+        Args:
+            confirmations: Number of blocks to stay behind the head.
+            enrich: Fetch dispute status of the flags.
+            **kwds: Additional args to :py:meth:`~tellor.contract.Tellor.follow`.
+        """
+        for event in self.tellor.follow(OUTLIER_EVENTS, confirmations, **kwds):
+            flags = self.add_events([event])
+            if flags:
+                yield from self.enrich(flags) if enrich else flags
@@ -0,0 +1,173 @@
+"""
+Parallel decoding of large log dumps.
+
+Logs are sharded into chunks and decoded across a process pool. Chunks travel to workers packed with
+:py:mod:`tellor.raw_logs` or as raw JSON lines, so the parent process does as little work per log as possible.
+Each worker builds the :py:func:`~tellor.log_decoders.get_log_decoders` table once when it starts.
+"""
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Union
+
+from tellor import log_decoders, raw_logs
+
+logger = logging.getLogger(__name__)
+
+
+def _decode(logs, compact):
+    decoders = log_decoders.get_log_decoders()
+    if not compact:
+        return log_decoders.decode_logs(logs, decoders)
+    # record types are created at runtime and can't be pickled, send plain tuples with the event name instead
+    return [(record.event, tuple(record)) for record in log_decoders.decode_logs(logs, decoders, compact=True)]
+
+
+def decode_packed(blob: bytes, compact: bool = False) -> list:
+    """
+    Decodes logs packed with :py:func:`~tellor.raw_logs.pack_logs`.
+    """
+    return _decode(raw_logs.iter_unpack_logs(blob), compact)
+
+
+def decode_jsonl(blob: bytes, compact: bool = False) -> list:
+    """
+    Decodes newline-separated raw JSON-RPC logs.
+    """
+    return _decode((raw_logs.format_log(json.loads(line)) for line in blob.splitlines() if line.strip()), compact)
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class LogDecoderPool:
+    """
+    Decodes logs in chunks across worker processes, keeping the input order.
+
+    Note:
+        Decoded ``AttributeDict`` events are expensive to send back to the parent process,
+        which limits the speedup to a few workers. Compact named tuples are cheap, so ``compact=True`` scales further.
+
+    Args:
+        workers: Number of worker processes, ``1`` decodes in the current process.
+        chunksize: Number of logs sent to a worker at once.
+        compact: Decode to named tuples, see :py:meth:`~tellor.contract.Tellor.decode_logs`.
+
+    Attributes:
+        seen: Number of logs sent for decoding, pre-packed blobs are not counted.
+        decoded: Number of events decoded.
+        elapsed: Wall time spent iterating, including fetching the input.
+
+    Example:
+        >>> with LogDecoderPool(workers=8) as pool:
+        ...     for event in pool.decode_jsonl(open('logs.jsonl', 'rb')):
+        ...         ...
+        >>> pool.rate
+    """
+
+    def __init__(self, workers: int = 4, chunksize: int = 5000, compact: bool = False):
+        self.workers = workers
+        self.chunksize = chunksize
+        self.compact = compact
+        self.seen = 0
+        self.decoded = 0
+        self.elapsed = 0.0
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @property
+    def rate(self) -> float:
+        """
+        Decoded events per second.
+        """
+        return self.decoded / self.elapsed if self.elapsed else 0.0
+
+    def _submit(self, fn, blob):
+        if self.workers <= 1:
+            return fn(blob, self.compact)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, initializer=log_decoders.get_log_decoders)
+        return self._executor.submit(fn, blob, self.compact)
+
+    def _collect(self, results):
+        if not isinstance(results, list):
+            results = results.result()
+        self.decoded += len(results)
+        if self.compact:
+            records = {decoder.event: decoder.record for decoder in log_decoders.get_log_decoders().values()}
+            return [records[event]._make(values) for event, values in results]
+        return results
+
+    def _run(self, fn, blobs):
+        began = time.perf_counter()
+        pending = deque()
+        try:
+            for blob in blobs:
+                pending.append(self._submit(fn, blob))
+                if len(pending) > self.workers * 2:
+                    yield from self._collect(pending.popleft())
+            while pending:
+                yield from self._collect(pending.popleft())
+        finally:
+            for future in pending:
+                if not isinstance(future, list):
+                    future.cancel()
+            self.elapsed += time.perf_counter() - began
+            logger.debug('decoded %d events from %d logs, %.0f events/sec', self.decoded, self.seen, self.rate)
+
+    def _pack(self, chunks):
+        for chunk in chunks:
+            self.seen += len(chunk)
+            yield raw_logs.pack_logs(chunk)
+
+    def decode(self, logs: Iterable[dict]) -> Iterator:
+        """
+        Decode logs, either web3 formatted ones or raw JSON-RPC logs.
+
+        Yields:
+            Decoded events in input order.
+        """
+        return self._run(decode_packed, self._pack(_chunks(logs, self.chunksize)))
+
+    def decode_batches(self, batches: Iterable[List[dict]]) -> Iterator:
+        """
+        Decode batches of logs as they arrive, e.g. from :py:func:`~tellor.backfill.backfill_logs`.
+        """
+        return self.decode(log for logs in batches for log in logs)
+
+    def decode_packed(self, blobs: Iterable[bytes]) -> Iterator:
+        """
+        Decode blobs already packed with :py:func:`~tellor.raw_logs.pack_logs`, one chunk per blob.
+        """
+        return self._run(decode_packed, blobs)
+
+    def decode_jsonl(self, lines: Iterable[Union[str, bytes]]) -> Iterator:
+        """
+        Decode raw JSON-RPC logs, one per line, e.g. an open file. Lines are parsed by the workers.
+        """
+        def blobs():
+            for chunk in _chunks(lines, self.chunksize):
+                self.seen += len(chunk)
+                yield b'\n'.join(line.encode() if isinstance(line, str) else line.rstrip(b'\n') for line in chunk)
+
+        return self._run(decode_jsonl, blobs())
@@ -0,0 +1,221 @@
+"""
+Web3 provider which spreads requests across several endpoints.
+
+Each request goes to the better of two randomly picked healthy endpoints, scored by recent latency and errors.
+Failed requests are retried on other endpoints with exponential backoff, and failing endpoints are
+benched for a while. Latency-critical reads are hedged: if the first endpoint doesn't answer within
+its own p95 latency, the same request is sent to a second one and the first answer wins.
+"""
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, List, Optional, Sequence, Union
+
+from web3 import HTTPProvider
+from web3.providers.base import BaseProvider
+
+logger = logging.getLogger(__name__)
+
+# cheap reads which are worth sending twice when the first endpoint is slow
+HEDGE_METHODS = frozenset({
+    'eth_blockNumber', 'eth_call', 'eth_chainId', 'eth_getBalance', 'eth_getBlockByNumber', 'eth_getCode',
+})
+# requests which must not be repeated
+WRITE_METHODS = frozenset({'eth_sendRawTransaction', 'eth_sendTransaction'})
+
+
+class Endpoint:
+    """
+    A provider with its recent latency and error history.
+
+    Attributes:
+        requests: Number of requests sent.
+        errors: Number of requests which failed.
+        hedged: Number of requests which were hedged to another endpoint while in flight here.
+        benched_until: Monotonic time until which the endpoint is skipped.
+    """
+
+    def __init__(self, provider: BaseProvider, name: str, window: int = 100):
+        self.provider = provider
+        self.name = name
+        self.latencies = deque(maxlen=window)
+        # 1 for every failed and 0 for every successful request
+        self.outcomes = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.hedged = 0
+        self.failures = 0
+        self.benched_until = 0.0
+        self.in_flight = 0
+
+    def __repr__(self):
+        return f'Endpoint({self.name})'
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Recent latency quantile in seconds, ``None`` if there are too few samples.
+        """
+        if len(self.latencies) < 10:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    @property
+    def score(self) -> float:
+        """
+        Expected cost of a request, lower is better.
+        """
+        latency = sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+        return (latency + 0.01) * (1 + 10 * self.error_rate) * (1 + self.in_flight)
+
+    def stats(self) -> dict:
+        return {
+            'name': self.name,
+            'requests': self.requests,
+            'errors': self.errors,
+            'hedged': self.hedged,
+            'error_rate': self.error_rate,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'benched': self.benched_until > time.monotonic(),
+        }
+
+
+class PooledProvider(BaseProvider):
+    """
+    Spreads requests across several endpoints with failover, retries and hedged reads.
+
+    Args:
+        endpoints: Providers or HTTP urls.
+        retries: Number of times a failed request is retried on another endpoint.
+        backoff: Initial delay between retries in seconds, doubled on each retry.
+        max_backoff: Maximum delay between retries and maximum time an endpoint is benched for.
+        hedge_methods: Methods to hedge, defaults to :py:data:`HEDGE_METHODS`. Pass an empty set to disable.
+        hedge_delay: Seconds to wait before hedging until an endpoint has enough samples to use its p95.
+        window: Number of recent requests per endpoint used for latency and error rate.
+
+    Note:
+        Only exceptions like connection errors, timeouts and HTTP errors cause a retry.
+        JSON-RPC errors are deterministic for reads and are returned as is.
+
+    Example:
+        >>> provider = PooledProvider(['https://node-a', 'https://node-b', 'https://node-c'])
+        >>> tellor = Tellor(Network.MAINNET, provider=provider)
+        >>> provider.stats()
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[Union[str, BaseProvider]],
+        retries: int = 3,
+        backoff: float = 0.1,
+        max_backoff: float = 10.0,
+        hedge_methods: Optional[Iterable[str]] = None,
+        hedge_delay: float = 0.5,
+        window: int = 100,
+    ):
+        if not endpoints:
+            raise ValueError('at least one endpoint is required')
+        self.endpoints: List[Endpoint] = []
+        for endpoint in endpoints:
+            provider = HTTPProvider(endpoint) if isinstance(endpoint, str) else endpoint
+            self.endpoints.append(Endpoint(provider, endpoint if isinstance(endpoint, str) else str(provider), window))
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_methods = HEDGE_METHODS if hedge_methods is None else frozenset(hedge_methods)
+        self.hedge_delay = hedge_delay
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max(4, 2 * len(self.endpoints)), thread_name_prefix='pool')
+
+    def _pick(self, exclude=()) -> Optional[Endpoint]:
+        now = time.monotonic()
+        with self._lock:
+            candidates = [x for x in self.endpoints if x not in exclude and x.benched_until <= now]
+            if not candidates:
+                # everything is benched, try the one which comes back first
+                candidates = sorted((x for x in self.endpoints if x not in exclude), key=lambda x: x.benched_until)[:1]
+            if not candidates:
+                return None
+            # power of two choices spreads the load while favouring fast endpoints
+            endpoint = min(random.sample(candidates, min(2, len(candidates))), key=lambda x: x.score)
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def _send(self, endpoint: Endpoint, method, params):
+        began = time.perf_counter()
+        try:
+            response = endpoint.provider.make_request(method, params)
+        except Exception:
+            with self._lock:
+                endpoint.in_flight -= 1
+                endpoint.errors += 1
+                endpoint.failures += 1
+                endpoint.outcomes.append(1)
+                bench = min(self.backoff * 2 ** endpoint.failures, self.max_backoff)
+                endpoint.benched_until = time.monotonic() + bench
+            raise
+        with self._lock:
+            endpoint.in_flight -= 1
+            endpoint.failures = 0
+            endpoint.outcomes.append(0)
+            endpoint.latencies.append(time.perf_counter() - began)
+        return response
+
+    def _hedged(self, endpoint: Endpoint, method, params):
+        with self._lock:
+            delay = endpoint.quantile(0.95) or self.hedge_delay
+        primary = self._executor.submit(self._send, endpoint, method, params)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        second = self._pick(exclude=[endpoint])
+        if second is None:
+            return primary.result()
+        with self._lock:
+            endpoint.hedged += 1
+        logger.debug('hedging %s from %s to %s after %.3fs', method, endpoint.name, second.name, delay)
+        futures = [primary, self._executor.submit(self._send, second, method, params)]
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                futures.remove(future)
+                if future.exception() is None or not futures:
+                    return future.result()
+
+    def make_request(self, method, params):
+        hedge = method in self.hedge_methods and len(self.endpoints) > 1
+        attempts = 1 if method in WRITE_METHODS else self.retries + 1
+        tried = []
+        for attempt in range(attempts):
+            endpoint = self._pick(exclude=tried) or self._pick()
+            tried.append(endpoint)
+            try:
+                if hedge:
+                    return self._hedged(endpoint, method, params)
+                return self._send(endpoint, method, params)
+            except Exception as e:
+                if attempt == attempts - 1:
+                    raise
+                delay = min(self.backoff * 2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.0)
+                logger.warning('%s failed on %s, retrying in %.2fs: %r', method, endpoint.name, delay, e)
+                time.sleep(delay)
+
+    def isConnected(self):
+        return any(endpoint.provider.isConnected() for endpoint in self.endpoints)
+
+    def stats(self) -> List[dict]:
+        """
+        Returns:
+            Requests, errors, hedges, error rate, p50 and p95 latency per endpoint.
+        """
+        with self._lock:
+            return [endpoint.stats() for endpoint in self.endpoints]
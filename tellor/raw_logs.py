@@ -0,0 +1,130 @@
+"""
+Compact binary packing of raw logs.
+
+Each log is a fixed header followed by the address, block hash, transaction hash, topics and data as raw bytes,
+which is several times smaller and faster to move between processes than pickled dicts.
+
+Both web3 formatted logs and raw JSON-RPC logs with hex strings can be packed.
+Unpacked logs have the same shape as ``w3.eth.getLogs`` output.
+"""
+import struct
+from typing import Iterable, Iterator, List
+
+from hexbytes import HexBytes
+
+from tellor.log_decoders import checksum_address
+
+# block number, log index, transaction index, number of topics, removed, data length
+HEADER = struct.Struct('<QIIBBI')
+FIXED = 20 + 32 + 32
+
+
+def _bytes(value) -> bytes:
+    return bytes.fromhex(value[2:]) if isinstance(value, str) else value
+
+
+def _hex(value) -> str:
+    # HexBytes.hex() is already prefixed
+    return '0x' + bytes(_bytes(value)).hex()
+
+
+def _int(value) -> int:
+    return int(value, 16) if isinstance(value, str) else value
+
+
+def pack_log(log: dict) -> bytes:
+    topics = log['topics']
+    data = _bytes(log['data'])
+    header = HEADER.pack(
+        _int(log['blockNumber']),
+        _int(log['logIndex']),
+        _int(log['transactionIndex']),
+        len(topics),
+        log.get('removed', False),
+        len(data),
+    )
+    parts = [header, _bytes(log['address']), _bytes(log['blockHash']), _bytes(log['transactionHash'])]
+    parts.extend(map(_bytes, topics))
+    parts.append(data)
+    return b''.join(parts)
+
+
+def pack_logs(logs: Iterable[dict]) -> bytes:
+    """
+    Packs logs into a single blob.
+    """
+    return b''.join(pack_log(log) for log in logs)
+
+
+def unpack_log(buffer, offset: int = 0):
+    """
+    Unpacks a log at an offset of a blob or any buffer like ``mmap``.
+
+    Returns:
+        The log and the offset of the next one.
+    """
+    block_number, log_index, transaction_index, topic_count, removed, data_length = HEADER.unpack_from(buffer, offset)
+    start = offset + HEADER.size
+    end = start + FIXED + topic_count * 32 + data_length
+    record = bytes(buffer[start:end])
+    topics_end = FIXED + topic_count * 32
+    log = {
+        'address': checksum_address(record[:20]),
+        'topics': [HexBytes(record[i:i + 32]) for i in range(FIXED, topics_end, 32)],
+        'data': '0x' + record[topics_end:].hex(),
+        'blockNumber': block_number,
+        'transactionHash': HexBytes(record[52:84]),
+        'transactionIndex': transaction_index,
+        'blockHash': HexBytes(record[20:52]),
+        'logIndex': log_index,
+        'removed': bool(removed),
+    }
+    return log, end
+
+
+def iter_unpack_logs(buffer) -> Iterator[dict]:
+    """
+    Lazily unpacks all logs in a buffer.
+    """
+    offset, end = 0, len(buffer)
+    while offset < end:
+        log, offset = unpack_log(buffer, offset)
+        yield log
+
+
+def unpack_logs(buffer) -> List[dict]:
+    return list(iter_unpack_logs(buffer))
+
+
+def format_log(log: dict) -> dict:
+    """
+    Converts a raw JSON-RPC log with hex strings to the same shape as ``w3.eth.getLogs`` output.
+    """
+    return {
+        'address': checksum_address(log['address']),
+        'topics': [HexBytes(topic) for topic in log['topics']],
+        'data': log['data'],
+        'blockNumber': _int(log['blockNumber']),
+        'transactionHash': HexBytes(log['transactionHash']),
+        'transactionIndex': _int(log['transactionIndex']),
+        'blockHash': HexBytes(log['blockHash']),
+        'logIndex': _int(log['logIndex']),
+        'removed': log.get('removed', False),
+    }
+
+
+def to_raw_log(log: dict) -> dict:
+    """
+    Converts a web3 formatted log back to a raw JSON-RPC log with hex strings, the inverse of :py:func:`format_log`.
+    """
+    return {
+        'address': log['address'],
+        'topics': [_hex(topic) for topic in log['topics']],
+        'data': _hex(log['data']),
+        'blockNumber': hex(_int(log['blockNumber'])),
+        'transactionHash': _hex(log['transactionHash']),
+        'transactionIndex': hex(_int(log['transactionIndex'])),
+        'blockHash': _hex(log['blockHash']),
+        'logIndex': hex(_int(log['logIndex'])),
+        'removed': log.get('removed', False),
+    }
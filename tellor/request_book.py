@@ -0,0 +1,211 @@
+"""
+In-memory catalogue of data requests and their tips.
+
+The catalogue is read once with batched ``getRequestVars`` calls, then kept up to date from
+``DataRequested``, ``TipAdded``, ``NewRequestOnDeck`` and ``NewChallenge`` events.
+Requests are kept in an index sorted by their current tip, so top-k queries don't touch the rest.
+"""
+import bisect
+import heapq
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from tellor import log_decoders
+from tellor.types import add_slots
+
+logger = logging.getLogger(__name__)
+
+REQUEST_EVENTS = ('DataRequested', 'TipAdded', 'NewRequestOnDeck', 'NewChallenge')
+
+
+@add_slots
+@dataclass
+class Request:
+    """
+    A data request.
+
+    Attributes:
+        request_id: Request id.
+        query: API query string.
+        symbol: Data symbol, e.g. ``BTC/USD``.
+        query_hash: Hash identifying the query.
+        granularity: Decimals the value is multiplied by.
+        total_tip: Outstanding tip, paid to the miners of the next value.
+        tipped: Sum of all tips seen in events since the book was bootstrapped.
+        tips: ``(block_number, tip)`` for every tip seen in events.
+    """
+
+    request_id: int
+    query: str
+    symbol: str
+    query_hash: bytes = field(repr=False)
+    granularity: int
+    total_tip: int
+    tipped: int = 0
+    tips: List[Tuple[int, int]] = field(default_factory=list, repr=False)
+
+
+class RequestBook:
+    """
+    Request catalogue with tip totals, ranked by the current tip.
+
+    Args:
+        tellor: :py:class:`~tellor.contract.Tellor` instance.
+
+    Attributes:
+        requests: Request id mapped to :py:class:`Request`.
+        on_deck: Id of the request which will be mined next, as of the last ``NewRequestOnDeck`` event.
+        checkpoint: Last block the book is up to date with.
+
+    Example:
+        >>> book = RequestBook(tellor)
+        >>> book.bootstrap()
+        >>> book.update()
+        >>> book.top(5)
+        >>> book.tips_over_time(1, interval=5760)
+    """
+
+    def __init__(self, tellor):
+        self.tellor = tellor
+        self.requests: Dict[int, Request] = {}
+        self.on_deck: Optional[int] = None
+        self.checkpoint: Optional[int] = None
+        # sorted (total_tip, request_id)
+        self._index: List[Tuple[int, int]] = []
+
+    def __len__(self):
+        return len(self.requests)
+
+    def __getitem__(self, request_id) -> Request:
+        return self.requests[request_id]
+
+    def _add(self, request: Request):
+        self.requests[request.request_id] = request
+        bisect.insort(self._index, (request.total_tip, request.request_id))
+
+    def _set_tip(self, request: Request, total_tip: int):
+        if total_tip == request.total_tip:
+            return
+        index = bisect.bisect_left(self._index, (request.total_tip, request.request_id))
+        del self._index[index]
+        request.total_tip = total_tip
+        bisect.insort(self._index, (total_tip, request.request_id))
+
+    def bootstrap(self, block_identifier=None):
+        """
+        Read the full catalogue in batched calls pinned to a single block.
+
+        Args:
+            block_identifier: Block to read at, defaults to the latest block.
+
+        Tip:
+            Bootstrap at an old block, e.g. the contract genesis, and :py:meth:`update` to rebuild the tip history.
+        """
+        w3 = self.tellor.contract.web3
+        block = w3.eth.blockNumber if block_identifier is None else block_identifier
+        count = self.tellor.multicall([('getUintVar', w3.keccak(text='requestCount'))], block)[0]
+        request_ids = range(1, count + 1)
+        results = self.tellor.multicall((('getRequestVars', request_id) for request_id in request_ids), block)
+        self.requests.clear()
+        self._index.clear()
+        for request_id, (query, symbol, query_hash, granularity, _, total_tip) in zip(request_ids, results):
+            self._add(Request(request_id, query, symbol, query_hash, granularity, total_tip))
+        self.checkpoint = block
+        logger.debug('bootstrapped %d requests at block %d', count, block)
+
+    def apply(self, event):
+        """
+        Apply a decoded event. Events must be applied in order.
+        """
+        name, args = event['event'], event['args']
+        request_id = args['_requestId'] if name != 'NewChallenge' else args['_currentRequestId']
+        request = self.requests.get(request_id)
+        if name == 'DataRequested':
+            if request is None:
+                query_hash = self.tellor.contract.web3.solidityKeccak(
+                    ['string', 'uint256'], [args['_query'], args['_granularity']]
+                )
+                request = Request(request_id, args['_query'], args['_querySymbol'], query_hash, args['_granularity'], 0)
+                self._add(request)
+            self._set_tip(request, args['_totalTips'])
+            return
+        if request is None:
+            logger.warning('%s for unknown request %d', name, request_id)
+            return
+        if name == 'TipAdded':
+            request.tipped += args['_tip']
+            request.tips.append((event['blockNumber'], args['_tip']))
+            self._set_tip(request, args['_totalTips'])
+        elif name == 'NewRequestOnDeck':
+            self.on_deck = request_id
+            self._set_tip(request, args['_onDeckTotalTips'])
+        elif name == 'NewChallenge':
+            # tips move to the challenge being mined
+            self._set_tip(request, 0)
+
+    def update(self, to_block: Optional[int] = None, confirmations: int = 0, **kwds) -> int:
+        """
+        Apply new events since the last update, bootstrapping first if needed.
+
+        Args:
+            to_block: Last block, defaults to the latest block minus ``confirmations``.
+            confirmations: Number of blocks to stay behind the head. Reorgs are not handled.
+            **kwds: Additional args to :py:meth:`~tellor.contract.Tellor.iter_logs`.
+
+        Returns:
+            Number of applied events.
+        """
+        if to_block is None:
+            to_block = self.tellor.contract.web3.eth.blockNumber - confirmations
+        if self.checkpoint is None:
+            self.bootstrap(to_block)
+            return 0
+        if to_block <= self.checkpoint:
+            return 0
+        topics = log_decoders.event_topics(self.tellor.logs_decoders, REQUEST_EVENTS)
+        count = 0
+        for event in self.tellor.iter_logs(self.checkpoint + 1, to_block, topics=topics, **kwds):
+            self.apply(event)
+            count += 1
+        self.checkpoint = to_block
+        return count
+
+    def top(self, k: int) -> List[Request]:
+        """
+        Returns:
+            ``k`` requests with the largest current tip, largest first.
+        """
+        return [self.requests[request_id] for _, request_id in reversed(self._index[-k:])] if k > 0 else []
+
+    def most_tipped(self) -> Optional[Request]:
+        """
+        Request with the largest current tip.
+        """
+        return self.requests[self._index[-1][1]] if self._index else None
+
+    def top_tipped(self, k: int) -> List[Request]:
+        """
+        Returns:
+            ``k`` requests which received the most tips since the book was bootstrapped.
+        """
+        return heapq.nlargest(k, self.requests.values(), key=lambda request: request.tipped)
+
+    def tips_over_time(self, request_id: Optional[int] = None, interval: int = 5760) -> List[Tuple[int, int]]:
+        """
+        Tips summed into block buckets.
+
+        Args:
+            request_id: Only count tips to this request, defaults to all.
+            interval: Bucket size in blocks, defaults to about a day.
+
+        Returns:
+            ``(first block of bucket, tips)`` pairs in block order, empty buckets are omitted.
+        """
+        requests = self.requests.values() if request_id is None else [self.requests[request_id]]
+        buckets = {}
+        for request in requests:
+            for block_number, tip in request.tips:
+                bucket = block_number - block_number % interval
+                buckets[bucket] = buckets.get(bucket, 0) + tip
+        return sorted(buckets.items())
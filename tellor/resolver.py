@@ -0,0 +1,189 @@
+"""
+Timestamp to block resolution.
+
+Tellor values are keyed by timestamp, while balances and other state are read at a block.
+:py:class:`BlockResolver` keeps a sparse sorted index of block timestamps starting at the contract genesis
+and answers queries with a binary search over it. Gaps are filled lazily: the block is guessed by interpolating
+between the nearest known blocks, and the guesses for all pending queries are fetched concurrently.
+Once a timestamp is resolved, the blocks around it stay in the index and later queries never touch the node.
+"""
+import bisect
+import logging
+import os
+import struct
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'TRBBLKS\x01'
+COUNT = struct.Struct('<Q')
+# switch from interpolation to bisection if a query takes more rounds than this
+INTERPOLATION_ROUNDS = 3
+
+
+class BlockResolver:
+    """
+    Resolves timestamps to blocks with a persisted block timestamp index.
+
+    Args:
+        w3: Web3 instance to fetch block headers with.
+        genesis: First block of the index, usually the contract genesis.
+        path: File the index is loaded from if it exists, and saved to by :py:meth:`save`.
+        workers: Number of concurrent header requests.
+
+    Attributes:
+        blocks: Known block numbers, sorted.
+        timestamps: Timestamps of the known blocks.
+        requests: Number of headers fetched.
+
+    Note:
+        Block timestamps are assumed to be strictly increasing, which holds for Ethereum.
+
+    Example:
+        >>> resolver = tellor.resolver('blocks.idx')
+        >>> blocks = resolver.block_at_many(value.timestamp for value in values)
+        >>> resolver.save()
+    """
+
+    def __init__(self, w3, genesis: int, path: Optional[str] = None, workers: int = 8):
+        self.w3 = w3
+        self.genesis = genesis
+        self.path = path
+        self.workers = workers
+        self.blocks = array('Q')
+        self.timestamps = array('Q')
+        self.requests = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def _insert(self, headers: Dict[int, int]):
+        merged = dict(zip(self.blocks, self.timestamps))
+        merged.update(headers)
+        self.blocks = array('Q', sorted(merged))
+        self.timestamps = array('Q', (merged[number] for number in self.blocks))
+
+    def _header(self, block_identifier):
+        block = self.w3.eth.getBlock(block_identifier)
+        return block['number'], block['timestamp']
+
+    def _fetch(self, numbers: Iterable) -> Dict[int, int]:
+        numbers = list(numbers)
+        if self.workers > 1 and len(numbers) > 1:
+            with ThreadPoolExecutor(min(self.workers, len(numbers))) as executor:
+                headers = dict(executor.map(self._header, numbers))
+        else:
+            headers = dict(self._header(number) for number in numbers)
+        self.requests += len(numbers)
+        self._insert(headers)
+        return headers
+
+    def _known(self, number: int) -> Optional[int]:
+        index = bisect.bisect_left(self.blocks, number)
+        if index < len(self.blocks) and self.blocks[index] == number:
+            return self.timestamps[index]
+
+    def refresh(self):
+        """
+        Add the latest block to the index, and the genesis block if the index is empty.
+        """
+        self._fetch(['latest'] if self.blocks else [self.genesis, 'latest'])
+
+    def build(self, step: int = 10_000, to_block: Optional[int] = None):
+        """
+        Prefetch every ``step`` blocks from genesis, so queries are answered in fewer round trips.
+        """
+        to_block = self.w3.eth.blockNumber if to_block is None else to_block
+        numbers = [number for number in range(self.genesis, to_block + 1, step) if self._known(number) is None]
+        if numbers:
+            self._fetch(numbers)
+
+    def timestamp_of(self, number: int) -> int:
+        """
+        Returns:
+            Timestamp of a block, fetched if it's not in the index.
+        """
+        timestamp = self._known(number)
+        if timestamp is None:
+            timestamp = self._fetch([number])[number]
+        return timestamp
+
+    def block_at(self, timestamp: int) -> Optional[int]:
+        """
+        Returns:
+            The last block with a timestamp at or before ``timestamp``, which is the block mining a value
+            with this timestamp. ``None`` if it's before the first indexed block.
+        """
+        return self.block_at_many([timestamp])[0]
+
+    def block_at_many(self, timestamps: Iterable[int]) -> List[Optional[int]]:
+        """
+        Batched :py:meth:`block_at`. Each round fetches the guesses for all unresolved timestamps at once.
+        """
+        timestamps = list(timestamps)
+        pending = set(timestamps)
+        if not pending:
+            return []
+        if not self.blocks or max(pending) > self.timestamps[-1]:
+            self.refresh()
+        resolved = {}
+        rounds = 0
+        while pending:
+            guesses = set()
+            for timestamp in pending:
+                index = bisect.bisect_right(self.timestamps, timestamp) - 1
+                if index < 0:
+                    resolved[timestamp] = None
+                    continue
+                start, start_time = self.blocks[index], self.timestamps[index]
+                if start_time == timestamp or index == len(self.blocks) - 1 or self.blocks[index + 1] == start + 1:
+                    resolved[timestamp] = start
+                    continue
+                end, end_time = self.blocks[index + 1], self.timestamps[index + 1]
+                if rounds < INTERPOLATION_ROUNDS:
+                    guess = start + (timestamp - start_time) * (end - start) // (end_time - start_time)
+                else:
+                    guess = (start + end) // 2
+                guess = min(max(guess, start + 1), end - 1)
+                guesses.add(guess)
+                # the block after the guess is usually the one which settles it
+                if guess + 1 < end:
+                    guesses.add(guess + 1)
+            pending.difference_update(resolved)
+            if guesses:
+                self._fetch(sorted(guesses))
+            rounds += 1
+        logger.debug('resolved %d timestamps in %d rounds, %d blocks indexed', len(resolved), rounds, len(self))
+        return [resolved[timestamp] for timestamp in timestamps]
+
+    def save(self, path: Optional[str] = None):
+        """
+        Write the index to a file, defaults to the path it was loaded from.
+        """
+        path = self.path if path is None else path
+        blocks, timestamps = array('Q', self.blocks), array('Q', self.timestamps)
+        if sys.byteorder != 'little':
+            blocks.byteswap()
+            timestamps.byteswap()
+        with open(path, 'wb') as f:
+            f.write(MAGIC + COUNT.pack(len(blocks)))
+            f.write(blocks.tobytes())
+            f.write(timestamps.tobytes())
+
+    def load(self, path: str):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not a block index')
+        count, = COUNT.unpack_from(data, len(MAGIC))
+        offset = len(MAGIC) + COUNT.size
+        self.blocks = array('Q', data[offset:offset + 8 * count])
+        self.timestamps = array('Q', data[offset + 8 * count:offset + 16 * count])
+        if sys.byteorder != 'little':
+            self.blocks.byteswap()
+            self.timestamps.byteswap()
@@ -0,0 +1,186 @@
+"""
+Historical time series of slowly changing contract state.
+
+Instead of reading every block, the sampler reads the ends of a range and bisects only the intervals
+where a value differs, so the cost grows with the number of changes rather than the length of the range.
+All variables at a block are read in a single multicall, the blocks of each bisection round are read
+concurrently, and every read is memoized, also in the :py:class:`~tellor.cache.CallCache` if the wrapper has one.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from eth_utils import keccak
+
+from tellor.cache import NOT_FOUND
+from tellor.monitor import StateChange
+from tellor.types import CurrentVariables, Tributes
+
+logger = logging.getLogger(__name__)
+
+
+def _uint_var(name):
+    return ('getUintVar', keccak(text=name))
+
+
+# name -> call and a function which parses its result, named after the getters of the wrapper
+VARIABLES = {
+    'current_variables': (('getCurrentVariables',), lambda x: CurrentVariables(*x)),
+    'difficulty': (_uint_var('difficulty'), int),
+    'dispute_count': (_uint_var('disputeCount'), int),
+    'dispute_fee': (_uint_var('disputeFee'), Tributes),
+    'slot_progress': (_uint_var('slotProgress'), int),
+    'staker_count': (_uint_var('stakerCount'), int),
+    'total_supply': (('totalSupply',), Tributes),
+}
+
+
+class Point(NamedTuple):
+    block_number: int
+    value: Any
+
+
+class StateSampler:
+    """
+    Finds the blocks where contract variables change by bisection.
+
+    Args:
+        tellor: :py:class:`~tellor.contract.Tellor` instance.
+        fields: Names from :py:data:`VARIABLES` to sample, defaults to all.
+        resolution: Stop bisecting once a change is narrowed down to this many blocks.
+            The default of ``1`` finds the exact block.
+        workers: Number of concurrent ``eth_call`` requests.
+
+    Attributes:
+        requests: Number of blocks read from the node, memoized reads are not counted.
+
+    Note:
+        A value which changes and changes back between two sampled blocks is not seen.
+        Pass a ``step`` to :py:meth:`series` to sample a grid first if that's a concern.
+
+    Example:
+        >>> sampler = tellor.sampler(['difficulty', 'staker_count'])
+        >>> series = sampler.series(from_block=11_000_000)
+        >>> series['staker_count']
+        [Point(block_number=11000000, value=86), Point(block_number=11000427, value=87), ...]
+    """
+
+    def __init__(self, tellor, fields: Optional[Iterable[str]] = None, resolution: int = 1, workers: int = 8):
+        self.tellor = tellor
+        self.fields = tuple(VARIABLES if fields is None else fields)
+        unknown = set(self.fields) - set(VARIABLES)
+        if unknown:
+            raise ValueError(f'unknown fields: {", ".join(sorted(unknown))}')
+        self.resolution = max(resolution, 1)
+        self.workers = workers
+        self.requests = 0
+        self._calls = [VARIABLES[name][0] for name in self.fields]
+        self._parsers = [VARIABLES[name][1] for name in self.fields]
+        self._values: Dict[int, tuple] = {}
+        self._head = None
+        self._lock = threading.Lock()
+
+    def _fetch(self, block: int) -> tuple:
+        cache, namespace = self.tellor.cache, self.tellor.cache_namespace
+        if cache is not None:
+            values = tuple(cache.get((namespace, 'state', block, name), persistent=True) for name in self.fields)
+            if all(value is not NOT_FOUND for value in values):
+                return values
+        _, results = self.tellor.multicall.aggregate(self._calls, block)
+        values = tuple(parse(result) for parse, result in zip(self._parsers, results))
+        with self._lock:
+            self.requests += 1
+        if cache is not None:
+            # blocks at the head could still be reorged
+            for name, value in zip(self.fields, values):
+                cache.set((namespace, 'state', block, name), value, persist=block < self._head)
+        return values
+
+    def read(self, blocks: Iterable[int]) -> List[tuple]:
+        """
+        Read the sampled variables at blocks, the ones not read before are fetched concurrently.
+
+        Returns:
+            A tuple of values in :py:attr:`fields` order per block.
+        """
+        blocks = list(blocks)
+        missing = sorted({block for block in blocks if block not in self._values})
+        if missing:
+            if self._head is None:
+                self._head = self.tellor.w3.eth.blockNumber
+            if self.workers > 1 and len(missing) > 1:
+                with ThreadPoolExecutor(min(self.workers, len(missing))) as executor:
+                    fetched = list(executor.map(self._fetch, missing))
+            else:
+                fetched = [self._fetch(block) for block in missing]
+            self._values.update(zip(missing, fetched))
+        return [self._values[block] for block in blocks]
+
+    def changes(
+        self, from_block: Optional[int] = None, to_block: Optional[int] = None, step: Optional[int] = None
+    ) -> List[StateChange]:
+        """
+        Find every change of the sampled variables over a block range.
+
+        Each bisection round reads the midpoints of all intervals which still contain a change,
+        so a range with ``n`` changes costs about ``n * log2(blocks / n)`` reads over ``log2(blocks)`` rounds.
+
+        Args:
+            from_block: First block, defaults to contract genesis.
+            to_block: Last block, defaults to the latest block.
+            step: Also sample every ``step`` blocks before bisecting.
+
+        Returns:
+            :py:class:`~tellor.monitor.StateChange` items in block order. The block number is the first block
+            with the new value, or the last one of an interval of ``resolution`` blocks where it changed.
+        """
+        from_block = self.tellor.genesis if from_block is None else from_block
+        self._head = self.tellor.w3.eth.blockNumber
+        to_block = self._head if to_block is None else to_block
+        blocks = list(range(from_block, to_block, step)) if step else [from_block]
+        blocks.append(to_block)
+        values = self.read(blocks)
+        intervals = [
+            (start, end, before, after)
+            for start, end, before, after in zip(blocks, blocks[1:], values, values[1:])
+            if before != after
+        ]
+        found = []
+        rounds = 0
+        while intervals:
+            found.extend(x for x in intervals if x[1] - x[0] <= self.resolution)
+            intervals = [x for x in intervals if x[1] - x[0] > self.resolution]
+            middles = [(start + end) // 2 for start, end, _, _ in intervals]
+            split = []
+            for (start, end, before, after), middle, value in zip(intervals, middles, self.read(middles)):
+                if before != value:
+                    split.append((start, middle, before, value))
+                if value != after:
+                    split.append((middle, end, value, after))
+            intervals = split
+            rounds += 1
+        logger.debug('found %d change blocks in %d rounds, %d requests', len(found), rounds, self.requests)
+        changes = []
+        for _, end, before, after in sorted(found):
+            for name, old, new in zip(self.fields, before, after):
+                if old != new:
+                    changes.append(StateChange(name, end, old, new))
+        return changes
+
+    def series(
+        self, from_block: Optional[int] = None, to_block: Optional[int] = None, step: Optional[int] = None
+    ) -> Dict[str, List[Point]]:
+        """
+        Time series of the sampled variables, see :py:meth:`changes` for the arguments.
+
+        Returns:
+            Field name mapped to a list of :py:class:`Point`, the value at ``from_block`` followed by every change.
+        """
+        from_block = self.tellor.genesis if from_block is None else from_block
+        changes = self.changes(from_block, to_block, step)
+        initial, = self.read([from_block])
+        series = {name: [Point(from_block, value)] for name, value in zip(self.fields, initial)}
+        for change in changes:
+            series[change.field].append(Point(change.block_number, change.new))
+        return series
@@ -0,0 +1,499 @@
+"""
+In-memory fake node for tests and benchmarks.
+
+Note:
+    This is not a simulation of the contract, just enough of the JSON-RPC surface
+    to exercise the wrapper without a real node.
+"""
+import bisect
+import json
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from eth_abi import decode_abi, encode_abi
+from eth_utils import decode_hex, event_abi_to_log_topic, function_abi_to_4byte_selector, keccak, to_hex
+from web3._utils.abi import get_abi_input_types, get_abi_output_types
+from web3 import Web3
+from web3.providers.base import BaseProvider
+
+from tellor.constants import Network, MULTICALL_ADDRESS, TELLOR_ABI, TELLOR_ADDRESS, TELLOR_GENESIS
+from tellor.multicall import AGGREGATE_SELECTOR
+
+
+class RPCError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def _event_abi(name):
+    return next(x for x in TELLOR_ABI if x['type'] == 'event' and x.get('name') == name)
+
+
+def _event_topic(name):
+    return to_hex(event_abi_to_log_topic(_event_abi(name)))
+
+
+NONCE_SUBMITTED_TOPIC = _event_topic('NonceSubmitted')
+NEW_VALUE_TOPIC = _event_topic('NewValue')
+
+
+SUBMIT_MINING_SOLUTION_SELECTOR = function_abi_to_4byte_selector(
+    next(x for x in TELLOR_ABI if x.get('name') == 'submitMiningSolution')
+)
+ADD_TIP_SELECTOR = function_abi_to_4byte_selector(next(x for x in TELLOR_ABI if x.get('name') == 'addTip'))
+SLOT_PROGRESS = keccak(text='slotProgress')
+DIFFICULTY = keccak(text='difficulty')
+REQUEST_COUNT = keccak(text='requestCount')
+
+FUNCTIONS = {
+    function_abi_to_4byte_selector(abi): (abi['name'], get_abi_input_types(abi), get_abi_output_types(abi))
+    for abi in TELLOR_ABI if abi['type'] == 'function'
+}
+
+
+def _topic_address(address):
+    return '0x' + address[2:].lower().rjust(64, '0')
+
+
+def _topic_uint(value):
+    return '0x' + format(value, '064x')
+
+
+class FakeNode:
+    """
+    Fake chain with deterministic synthetic Tellor logs.
+
+    Every ``value_interval`` blocks contains five ``NonceSubmitted`` logs and a ``NewValue`` log,
+    request ids 1 to 5 take turns.
+    Contract calls are answered by ``call_<fn_name>`` methods, consistent with the logs where it matters.
+    Other events can be added with :py:meth:`emit`.
+
+    Args:
+        network: Network to pretend to be.
+        head: Latest block number.
+        max_results: Reject ``eth_getLogs`` queries which match more logs, like hosted nodes do.
+        latency: Seconds to sleep on every request.
+    """
+
+    miners = [
+        '0x5522eCa38e7C376F96d29F963ae9eEAE14F27a47',
+        '0xF1989cc4492Fe704f846c70Ff068fa554C904901',
+        '0xe060aE2E078ffd811D9fc7d613976d6EFe7f071F',
+        '0xFcEB7885efAEa565262e0e87CbDC1DCC8E0cCB4D',
+        '0x103348C47fFc3254aFf761894e7C13cA0C680465',
+    ]
+
+    def __init__(self, network=Network.MAINNET, head=None, value_interval=40, max_results=10000, latency=0):
+        self.network = network
+        self.genesis = TELLOR_GENESIS[network]
+        self.address = TELLOR_ADDRESS[network]
+        self.head = self.genesis + 100_000 if head is None else head
+        self.value_interval = value_interval
+        self.max_results = max_results
+        self.latency = latency
+        self.requests = []
+        self.balances = {}
+        self.stakers = {}
+        self.votes = set()
+        self.disputes = {}
+        self.uint_vars = {}
+        # name -> sorted (block number, value) changes
+        self.uint_var_history = {}
+        self.reorgs = 0
+        self.reorg_from = None
+        # block number -> extra (topics, data) logs
+        self.events = {}
+        # lowercase address -> sorted (block number, balance) snapshots
+        self.balance_history = {}
+        # request id -> getRequestVars result
+        self.data_requests = {}
+        # block number -> values submitted by the five miners, defaults to 1000 to 1004
+        self.submissions = {}
+        # (request id, timestamp) of values in dispute
+        self.values_in_dispute = set()
+
+    def request(self, method, params):
+        self.requests.append(method)
+        if self.latency:
+            time.sleep(self.latency)
+        handler = getattr(self, method, None)
+        if handler is None:
+            raise RPCError(-32601, f'the method {method} does not exist/is not available')
+        return handler(*params)
+
+    def web3_clientVersion(self):
+        return 'FakeNode/v1'
+
+    def eth_chainId(self):
+        return hex(self.network)
+
+    def eth_blockNumber(self):
+        return hex(self.head)
+
+    def reorg(self, number):
+        """
+        Replace blocks starting from ``number`` with a competing chain. Block hashes change, the logs are the same.
+        """
+        self.reorgs += 1
+        self.reorg_from = number
+        self.block_logs.cache_clear()
+
+    def block_hash(self, number):
+        salt = self.reorgs if self.reorg_from is not None and number >= self.reorg_from else 0
+        return (salt << 64 | number).to_bytes(32, 'big')
+
+    def block_timestamp(self, number):
+        return number * 15
+
+    def eth_getBlockByNumber(self, block, full_transactions=False):
+        number = self._block(block)
+        if number > self.head:
+            return None
+        return {
+            'number': hex(number),
+            'hash': to_hex(self.block_hash(number)),
+            'parentHash': to_hex(self.block_hash(number - 1)),
+            'timestamp': hex(self.block_timestamp(number)),
+            'transactions': [tx if full_transactions else tx['hash'] for tx in self.block_transactions(number)],
+        }
+
+    def block_transactions(self, number):
+        """
+        Transactions in a block: a ``submitMiningSolution`` per ``NonceSubmitted`` log,
+        an ``addTip`` and a transaction to another contract.
+        """
+        if number < self.genesis or (number - self.genesis) % self.value_interval:
+            return []
+        request_id = (number - self.genesis) // self.value_interval % 5 + 1
+        calls = []
+        for i, miner in enumerate(self.miners):
+            nonce = str(number * 5 + i) if number % 2 else (number * 5 + i).to_bytes(10, 'big')
+            data = encode_abi(
+                ['string' if isinstance(nonce, str) else 'bytes', 'uint256', 'uint256'], [nonce, request_id, 1000 + i]
+            )
+            calls.append((miner, self.address, SUBMIT_MINING_SOLUTION_SELECTOR + data))
+        calls.append((self.miners[0], self.address, ADD_TIP_SELECTOR + encode_abi(['uint256', 'uint256'], [request_id, 1])))
+        calls.append((self.miners[0], '0x' + '11' * 20, b'\xde\xad\xbe\xef'))
+        return [
+            {
+                'hash': to_hex((number << 16 | index).to_bytes(32, 'big')),
+                'blockHash': to_hex(self.block_hash(number)),
+                'blockNumber': hex(number),
+                'transactionIndex': hex(index),
+                'from': sender,
+                'to': to,
+                'input': to_hex(data),
+                'value': '0x0',
+                'gas': hex(300_000),
+                'gasPrice': hex(10 ** 9),
+                'nonce': hex(number),
+            }
+            for index, (sender, to, data) in enumerate(calls)
+        ]
+
+    def eth_call(self, tx, block='latest'):
+        block = self._block(block)
+        data = decode_hex(tx['data'])
+        if tx['to'].lower() == MULTICALL_ADDRESS[self.network].lower() and data[:4] == AGGREGATE_SELECTOR:
+            calls, = decode_abi(['(address,bytes)[]'], data[4:])
+            return to_hex(encode_abi(['uint256', 'bytes[]'], [block, [self.contract_call(x, block) for _, x in calls]]))
+        return to_hex(self.contract_call(data, block))
+
+    def contract_call(self, data, block):
+        name, input_types, output_types = FUNCTIONS[data[:4]]
+        handler = getattr(self, f'call_{name}', None)
+        if handler is None:
+            raise RPCError(-32000, f'execution reverted: {name} is not faked')
+        result = handler(block, *decode_abi(input_types, data[4:]))
+        return encode_abi(output_types, result if len(output_types) > 1 else [result])
+
+    def value_blocks(self, request_id, block=None):
+        """
+        Blocks with ``NewValue`` for a request id.
+        """
+        end = self.head if block is None else min(block, self.head)
+        first = self.genesis + (request_id - 1) * self.value_interval
+        return range(first, end + 1, 5 * self.value_interval)
+
+    def call_balanceOf(self, block, address):
+        return self.call_balanceOfAt(block, address, self._block(block))
+
+    def call_balanceOfAt(self, block, address, block_number):
+        if block is not None:
+            # later balances are not known yet at the block of the call
+            block_number = min(block_number, self._block(block))
+        history = self.balance_history.get(address.lower())
+        if history is None:
+            return self.balances.get(address.lower(), 0)
+        index = bisect.bisect_right(history, (block_number, float('inf')))
+        return history[index - 1][1] if index else 0
+
+    def set_balance(self, address, balance, block):
+        """
+        Set the balance of an address from a block on, which is what ``balanceOfAt`` reports.
+        """
+        history = self.balance_history.setdefault(address.lower(), [])
+        index = bisect.bisect_left(history, (block,))
+        if index < len(history) and history[index][0] == block:
+            history[index] = (block, balance)
+        else:
+            history.insert(index, (block, balance))
+        self.balances[address.lower()] = history[-1][1]
+
+    def emit(self, number, event, **args):
+        """
+        Add an arbitrary contract event to a block, after the synthetic ones.
+        """
+        abi = _event_abi(event)
+        indexed = [x for x in abi['inputs'] if x['indexed']]
+        not_indexed = [x for x in abi['inputs'] if not x['indexed']]
+        topics = [_event_topic(event)] + [
+            to_hex(encode_abi([x['type']], [args[x['name']]])) for x in indexed
+        ]
+        data = encode_abi([x['type'] for x in not_indexed], [args[x['name']] for x in not_indexed])
+        self.events.setdefault(number, []).append((topics, data))
+        self.block_logs.cache_clear()
+
+    def call_totalSupply(self, block):
+        block = self._block(block)
+        return sum(self.call_balanceOfAt(block, address, block) for address in self.balances)
+
+    def call_getStakerInfo(self, block, address):
+        return [self.stakers.get(address.lower(), 0), self.genesis]
+
+    def call_didVote(self, block, dispute_id, address):
+        return (dispute_id, address.lower()) in self.votes
+
+    def call_getAllDisputeVars(self, block, dispute_id):
+        if dispute_id not in self.disputes:
+            zero = '0x' + '00' * 20
+            return [b'\x00' * 32, False, False, False, zero, zero, zero, [0] * 9, 0]
+        return self.disputes[dispute_id]
+
+    def call_getUintVar(self, block, name):
+        if name == SLOT_PROGRESS and name not in self.uint_vars:
+            return (self._block(block) - self.genesis) % self.value_interval * 5 // self.value_interval
+        if name == REQUEST_COUNT and name not in self.uint_vars:
+            return len(self.data_requests)
+        history = self.uint_var_history.get(name)
+        if history is not None:
+            index = bisect.bisect_right(history, (self._block(block), float('inf')))
+            return history[index - 1][1] if index else 0
+        return self.uint_vars.get(name, 0)
+
+    def set_uint_var(self, name, value, block):
+        """
+        Set a ``getUintVar`` value from a block on, earlier blocks keep returning the previous value.
+        """
+        key = keccak(text=name)
+        history = self.uint_var_history.setdefault(key, [])
+        index = bisect.bisect_left(history, (block,))
+        if index < len(history) and history[index][0] == block:
+            history[index] = (block, value)
+        else:
+            history.insert(index, (block, value))
+        self.uint_vars[key] = history[-1][1]
+
+    def _next_value_block(self, block):
+        return block + self.value_interval - (block - self.genesis) % self.value_interval
+
+    def _request_id(self, number):
+        return (number - self.genesis) // self.value_interval % 5 + 1
+
+    def call_getCurrentVariables(self, block):
+        number = self._next_value_block(self._block(block))
+        request_id = self._request_id(number)
+        difficulty = self.call_getUintVar(block, DIFFICULTY)
+        return [number.to_bytes(32, 'big'), request_id, difficulty, f'request {request_id}', 1000, request_id * 10]
+
+    def call_getVariablesOnDeck(self, block):
+        request_id = self._request_id(self._next_value_block(self._block(block)) + self.value_interval)
+        return [request_id, request_id * 10, f'request {request_id}']
+
+    def add_request(self, request_id, query, symbol, granularity=1000, total_tip=0, position=0):
+        """
+        Add a data request to the catalogue returned by ``getRequestVars``.
+        """
+        query_hash = Web3.solidityKeccak(['string', 'uint256'], [query, granularity])
+        self.data_requests[request_id] = [query, symbol, query_hash, granularity, position, total_tip]
+
+    def call_getRequestVars(self, block, request_id):
+        return self.data_requests.get(request_id, ['', '', b'\x00' * 32, 0, 0, 0])
+
+    def call_getRequestQ(self, block):
+        queue = [0] * 51
+        for request_id in range(1, 6):
+            queue[request_id] = request_id * 10
+        return queue
+
+    def call_getNewValueCountbyRequestId(self, block, request_id):
+        return len(self.value_blocks(request_id, block))
+
+    def call_getTimestampbyRequestIDandIndex(self, block, request_id, index):
+        blocks = self.value_blocks(request_id, block)
+        return blocks[index] * 15 if index < len(blocks) else 0
+
+    def _value_block(self, request_id, timestamp):
+        number = timestamp // 15
+        if timestamp % 15 == 0 and number in self.value_blocks(request_id):
+            return number
+
+    def call_getMinersByRequestIdAndTimestamp(self, block, request_id, timestamp):
+        if self._value_block(request_id, timestamp) is None:
+            return ['0x' + '00' * 20] * 5
+        return self.miners
+
+    def call_getSubmissionsByTimestamp(self, block, request_id, timestamp):
+        number = self._value_block(request_id, timestamp)
+        if number is None:
+            return [0] * 5
+        return self._submissions(number)
+
+    def _submissions(self, number):
+        return self.submissions.get(number, [1000 + i for i in range(5)])
+
+    def submit(self, number, values):
+        """
+        Override the values submitted in a value block.
+        """
+        self.submissions[number] = list(values)
+        self.block_logs.cache_clear()
+
+    def call_retrieveData(self, block, request_id, timestamp):
+        number = self._value_block(request_id, timestamp)
+        if number is None or (request_id, timestamp) in self.values_in_dispute:
+            return 0
+        return sorted(self._submissions(number))[2]
+
+    def call_isInDispute(self, block, request_id, timestamp):
+        return (request_id, timestamp) in self.values_in_dispute
+
+    def eth_getLogs(self, params):
+        start = self._block(params.get('fromBlock', 'latest'))
+        end = min(self._block(params.get('toBlock', 'latest')), self.head)
+        topics = params.get('topics') or []
+        result = []
+        first = max(start, self.genesis)
+        first += -(first - self.genesis) % self.value_interval
+        numbers = set(range(first, end + 1, self.value_interval))
+        numbers.update(number for number in self.events if start <= number <= end)
+        for number in sorted(numbers):
+            result.extend(log for log in self.block_logs(number) if self._match(log, topics))
+            if len(result) > self.max_results:
+                raise RPCError(-32005, f'query returned more than {self.max_results} results')
+        return result
+
+    def _block(self, tag):
+        if tag in ('latest', 'pending'):
+            return self.head
+        if tag == 'earliest':
+            return 0
+        return int(tag, 16) if isinstance(tag, str) else tag
+
+    @staticmethod
+    def _match(log, topics):
+        for wanted, actual in zip(topics, log['topics']):
+            if wanted is None:
+                continue
+            wanted = wanted if isinstance(wanted, list) else [wanted]
+            if actual not in [to_hex(x) if isinstance(x, bytes) else x.lower() for x in wanted]:
+                return False
+        return True
+
+    @lru_cache(maxsize=4096)
+    def block_logs(self, number):
+        """
+        Raw JSON-RPC logs emitted in a block.
+        """
+        events = self.events.get(number, [])
+        if (number - self.genesis) % self.value_interval:
+            return [self._log(number, index, topics, data) for index, (topics, data) in enumerate(events)]
+        request_id = (number - self.genesis) // self.value_interval % 5 + 1
+        challenge = number.to_bytes(32, 'big')
+        values = self._submissions(number)
+        logs = []
+        for i, miner in enumerate(self.miners):
+            # every other block has a malformed byte nonce
+            nonce = str(number * 5 + i) if number % 2 else (number * 5 + i).to_bytes(10, 'big')
+            data = encode_abi(
+                ['string' if isinstance(nonce, str) else 'bytes', 'uint256', 'bytes32'],
+                [nonce, values[i], challenge],
+            )
+            topics = [NONCE_SUBMITTED_TOPIC, _topic_address(miner), _topic_uint(request_id)]
+            logs.append((topics, data))
+        data = encode_abi(['uint256', 'uint256', 'uint256', 'bytes32'], [number * 15, sorted(values)[2], 0, challenge])
+        logs.append(([NEW_VALUE_TOPIC, _topic_uint(request_id)], data))
+        logs.extend(events)
+        return [self._log(number, index, topics, data) for index, (topics, data) in enumerate(logs)]
+
+    def _log(self, number, index, topics, data):
+        return {
+            'address': self.address,
+            'topics': topics,
+            'data': to_hex(data),
+            'blockNumber': hex(number),
+            'blockHash': to_hex(self.block_hash(number)),
+            'transactionHash': to_hex((number << 16 | index).to_bytes(32, 'big')),
+            'transactionIndex': hex(index),
+            'logIndex': hex(index),
+            'removed': False,
+        }
+
+
+class FakeProvider(BaseProvider):
+    """
+    Web3 provider backed by a :py:class:`FakeNode`.
+    """
+
+    def __init__(self, node: FakeNode):
+        self.node = node
+
+    def make_request(self, method, params):
+        try:
+            return {'jsonrpc': '2.0', 'id': 0, 'result': self.node.request(method, params)}
+        except RPCError as e:
+            return {'jsonrpc': '2.0', 'id': 0, 'error': {'code': e.code, 'message': e.message}}
+
+    def isConnected(self):
+        return True
+
+
+def serve(node: FakeNode, host='127.0.0.1', port=0):
+    """
+    Serve a :py:class:`FakeNode` over HTTP JSON-RPC from a background thread.
+    Batch requests are supported.
+
+    Returns:
+        The server, call ``shutdown()`` when done, and its url.
+    """
+
+    def respond(request):
+        try:
+            return {'jsonrpc': '2.0', 'id': request.get('id'), 'result': node.request(request['method'], request['params'])}
+        except RPCError as e:
+            return {'jsonrpc': '2.0', 'id': request.get('id'), 'error': {'code': e.code, 'message': e.message}}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            result = [respond(x) for x in payload] if isinstance(payload, list) else respond(payload)
+            body = json.dumps(result).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_port}'
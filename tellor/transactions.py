@@ -0,0 +1,163 @@
+"""
+Bulk decoding of transactions sent to the contract.
+
+Calldata is decoded with the precompiled per-selector decoders from :py:func:`~tellor.func_decoders.get_func_decoders`,
+optionally across a process pool. Only raw calldata bytes are sent to worker processes.
+"""
+import logging
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+from eth_utils import decode_hex, to_int
+
+from tellor import func_decoders
+
+logger = logging.getLogger(__name__)
+
+
+class DecodedTransaction(NamedTuple):
+    block_number: int
+    transaction_index: int
+    hash: bytes
+    sender: str
+    fn_name: str
+    args: dict
+
+
+def decode_inputs(inputs: List[bytes]) -> List[Tuple[str, dict]]:
+    """
+    Decodes calldata with the shared decoder table, the same as :py:func:`~tellor.func_decoders.decode_fn_input`.
+    """
+    decoders = func_decoders.get_func_decoders()
+    return [func_decoders.decode_fn_input(data, decoders) for data in inputs]
+
+
+def iter_blocks(w3, from_block: int, to_block: int, workers: int = 8) -> Iterator[dict]:
+    """
+    Fetch blocks with full transactions concurrently.
+
+    Yields:
+        Blocks in order.
+    """
+    pending = deque()
+    with ThreadPoolExecutor(workers) as executor:
+        try:
+            for number in range(from_block, to_block + 1):
+                pending.append(executor.submit(w3.eth.getBlock, number, True))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _to_bytes(value) -> bytes:
+    return decode_hex(value) if isinstance(value, str) else bytes(value)
+
+
+def _to_int(value) -> int:
+    return to_int(hexstr=value) if isinstance(value, str) else value
+
+
+class TransactionDecoder:
+    """
+    Decodes transactions sent to an address in chunks, in a process pool if ``workers > 1``.
+    Both web3 formatted and raw JSON-RPC transactions are accepted.
+
+    Args:
+        address: Only transactions with ``to == address`` are decoded.
+        workers: Number of worker processes, ``1`` decodes in the current process.
+        chunksize: Number of transactions sent to a worker at once.
+
+    Attributes:
+        seen: Number of transactions looked at.
+        decoded: Number of transactions decoded.
+        elapsed: Wall time spent iterating, including fetching the input.
+
+    Example:
+        >>> with TransactionDecoder(tellor.address, workers=4) as decoder:
+        ...     calls = list(decoder(transactions))
+        >>> decoder.rate
+    """
+
+    def __init__(self, address: str, workers: int = 1, chunksize: int = 2000):
+        self.address = address.lower()
+        self.workers = workers
+        self.chunksize = chunksize
+        self.seen = 0
+        self.decoded = 0
+        self.elapsed = 0.0
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @property
+    def rate(self) -> float:
+        """
+        Decoded transactions per second.
+        """
+        return self.decoded / self.elapsed if self.elapsed else 0.0
+
+    def _chunks(self, transactions):
+        chunk = []
+        for tx in transactions:
+            self.seen += 1
+            if tx['to'] is None or tx['to'].lower() != self.address:
+                continue
+            chunk.append(tx)
+            if len(chunk) == self.chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _submit(self, chunk):
+        inputs = [_to_bytes(tx['input']) for tx in chunk]
+        if self.workers <= 1:
+            return chunk, decode_inputs(inputs)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+        return chunk, self._executor.submit(decode_inputs, inputs)
+
+    def __call__(self, transactions: Iterable[dict]) -> Iterator[DecodedTransaction]:
+        """
+        Yields:
+            :py:class:`DecodedTransaction` in input order.
+        """
+        began = time.perf_counter()
+        pending = deque()
+        try:
+            for chunk in self._chunks(transactions):
+                pending.append(self._submit(chunk))
+                if len(pending) > self.workers * 2:
+                    yield from self._collect(*pending.popleft())
+            while pending:
+                yield from self._collect(*pending.popleft())
+        finally:
+            for _, future in pending:
+                if not isinstance(future, list):
+                    future.cancel()
+            self.elapsed += time.perf_counter() - began
+            logger.debug('decoded %d of %d transactions, %.0f tx/sec', self.decoded, self.seen, self.rate)
+
+    def _collect(self, chunk, results):
+        if not isinstance(results, list):
+            results = results.result()
+        self.decoded += len(chunk)
+        for tx, (fn_name, args) in zip(chunk, results):
+            yield DecodedTransaction(
+                _to_int(tx['blockNumber']), _to_int(tx['transactionIndex']), _to_bytes(tx['hash']), tx['from'], fn_name, args
+            )
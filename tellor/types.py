@@ -1,11 +1,42 @@
-from dataclasses import dataclass, field
+import keyword
+import re
+from collections import namedtuple
+from dataclasses import dataclass, field, fields
 from decimal import Decimal
 from enum import IntEnum
 
 DECIMALS = 10 ** 18
 
 
+def add_slots(cls):
+    """
+    Recreates a dataclass with ``__slots__``, instances become smaller and have no ``__dict__``.
+    """
+    names = tuple(x.name for x in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items() if key not in names + ('__dict__', '__weakref__')}
+    namespace['__slots__'] = names
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+def snake_case(name: str) -> str:
+    return re.sub(r'([a-z0-9])([A-Z]+)', r'\1_\2', name.strip('_')).lower()
+
+
+def event_record(abi):
+    """
+    Creates a named tuple type for an event, with ``block_number``, ``log_index``, ``transaction_hash``
+    and the event args in snake case. Args which are keywords get a trailing underscore, e.g. ``from_``.
+    """
+    names = [snake_case(x['name']) for x in abi['inputs']]
+    names = [f'{name}_' if keyword.iskeyword(name) else name for name in names]
+    base = namedtuple(abi['name'], ['block_number', 'log_index', 'transaction_hash'] + names)
+    return type(abi['name'], (base,), {'__slots__': (), 'event': abi['name']})
+
+
 class Wei(int):
+    __slots__ = ()
     unit = 'eth'
 
     def __str__(self):
@@ -20,6 +51,7 @@ class Wei(int):
 
 
 class Tributes(Wei):
+    __slots__ = ()
     unit = 'trb'
 
 
@@ -30,6 +62,7 @@ class StakerStatus(IntEnum):
     DISPUTED = 3
 
 
+@add_slots
 @dataclass
 class CurrentVariables:
     challenge: bytes = field(repr=False)
@@ -38,3 +71,38 @@ class CurrentVariables:
     query: str
     granularity: int
     tip: int
+
+
+@add_slots
+@dataclass
+class VariablesOnDeck:
+    request: int
+    tip: int
+    query: str
+
+
+@add_slots
+@dataclass
+class StateSnapshot:
+    """
+    Mining state read at a single block.
+
+    Attributes:
+        block_number: Block all values were read at.
+        current_variables: :py:class:`CurrentVariables` of the challenge being mined.
+        on_deck: :py:class:`VariablesOnDeck`, the request which will be mined next.
+        request_q: Tips of the 50 most tipped requests, as stored by the contract.
+    """
+
+    block_number: int
+    current_variables: CurrentVariables
+    difficulty: int
+    slot_progress: int
+    staker_count: int
+    dispute_fee: Tributes
+    on_deck: VariablesOnDeck
+    request_q: list = field(repr=False)
+
+    @property
+    def challenge(self) -> bytes:
+        return self.current_variables.challenge
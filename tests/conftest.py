@@ -0,0 +1,30 @@
+import pytest
+from web3.auto import w3
+
+from tellor.constants import TELLOR_GENESIS, Network
+from tellor.testing import FakeNode, FakeProvider
+
+
+@pytest.fixture
+def make_node(monkeypatch):
+    """
+    Factory which connects ``web3.auto.w3`` to a new :py:class:`~tellor.testing.FakeNode`.
+
+    Args:
+        blocks: Number of blocks from the contract genesis to the head, defaults to the node's default.
+        node_class: :py:class:`~tellor.testing.FakeNode` subclass to create.
+        **kwds: Additional args to the node.
+    """
+
+    def make(blocks=None, node_class=FakeNode, network=Network.MAINNET, **kwds):
+        head = None if blocks is None else TELLOR_GENESIS[network] + blocks
+        node = node_class(network=network, head=head, **kwds)
+        monkeypatch.setattr(w3, 'provider', FakeProvider(node))
+        return node
+
+    return make
+
+
+@pytest.fixture
+def node(make_node):
+    return make_node()
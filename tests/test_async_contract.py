@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from tellor.async_contract import AsyncTellor
+from tellor.constants import Network
+from tellor.testing import FakeNode, serve
+
+
+@pytest.fixture
+def node():
+    node = FakeNode(latency=0.01)
+    server, node.url = serve(node)
+    yield node
+    server.shutdown()
+
+
+def test_gather_balances(node):
+    addresses = [f'0x{i:040x}' for i in range(1, 101)]
+    for i, address in enumerate(addresses):
+        node.balances[address] = i
+
+    async def main():
+        async with AsyncTellor(Network.MAINNET, node.url, concurrency=20) as tellor:
+            return await asyncio.gather(*[tellor.balance_of(address) for address in addresses])
+
+    assert asyncio.run(main()) == list(range(100))
+
+
+def test_get_value_and_logs(node):
+    timestamp = node.value_blocks(2)[0] * 15
+
+    async def main():
+        async with AsyncTellor(Network.MAINNET, node.url) as tellor:
+            value = await tellor.get_value(2, timestamp)
+            events = await tellor.get_logs(fromBlock=node.genesis, toBlock=node.genesis + node.value_interval * 2)
+            return value, events
+
+    value, events = asyncio.run(main())
+    assert value.miners == node.miners
+    assert [event.event for event in events] == (['NonceSubmitted'] * 5 + ['NewValue']) * 3
+
+
+def test_block_identifier(node):
+    node.set_uint_var('difficulty', 1000, node.genesis)
+    node.set_uint_var('difficulty', 2000, node.head - 10)
+
+    async def main():
+        async with AsyncTellor(Network.MAINNET, node.url) as tellor:
+            return await asyncio.gather(tellor.difficulty(), tellor.difficulty(node.head - 11))
+
+    assert asyncio.run(main()) == [2000, 1000]
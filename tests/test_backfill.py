@@ -0,0 +1,14 @@
+from web3 import Web3
+
+from tellor.backfill import backfill_logs
+from tellor.testing import FakeNode, FakeProvider
+
+
+def test_backfill_logs_splits_and_keeps_order():
+    node = FakeNode(max_results=100)
+    w3 = Web3(FakeProvider(node))
+    start, end = node.genesis, node.genesis + 19_999
+    batches = backfill_logs(w3.eth.getLogs, start, end, window=20_000, target=50, address=node.address)
+    keys = [(log['blockNumber'], log['logIndex']) for batch in batches for log in batch]
+    assert keys == sorted(keys)
+    assert len(keys) == len(set(keys)) == 20_000 // node.value_interval * 6
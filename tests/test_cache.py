@@ -0,0 +1,62 @@
+from tellor.cache import CallCache
+from tellor.constants import Network
+from tellor.contract import Tellor
+
+
+def test_immutable_calls_are_cached_across_blocks(node, tmp_path):
+    tellor = Tellor(Network.MAINNET, cache=CallCache(path=str(tmp_path / 'cache.db'), head_ttl=0))
+    timestamp = node.value_blocks(1)[0] * 15
+    value = tellor.get_value(1, timestamp)
+    node.head += 1
+    assert tellor.get_value(1, timestamp) == value
+    assert tellor.cache.stats()['hits'] == 2
+
+    # persisted to disk
+    tellor = Tellor(Network.MAINNET, cache=CallCache(path=str(tmp_path / 'cache.db'), head_ttl=0))
+    node.requests.clear()
+    assert tellor.get_value(1, timestamp) == value
+    assert 'eth_call' not in node.requests
+
+
+def test_networks_sharing_a_cache_file(node, make_node, tmp_path):
+    path = str(tmp_path / 'cache.db')
+    timestamp = node.value_blocks(1)[0] * 15
+    Tellor(Network.MAINNET, cache=CallCache(path=path, head_ttl=0)).get_value(1, timestamp)
+
+    rinkeby = make_node(network=Network.RINKEBY)
+    tellor = Tellor(Network.RINKEBY, cache=CallCache(path=path, head_ttl=0))
+    tellor.get_value(1, timestamp)
+    assert 'eth_call' in rinkeby.requests
+    assert tellor.cache.stats()['hits'] == 0
+
+
+def test_head_state_is_cached_per_block(node):
+    tellor = Tellor(Network.MAINNET, cache=CallCache(head_ttl=0))
+    node.balances['0x' + '11' * 20] = 1
+    assert tellor.balance_of('0x' + '11' * 20) == 1
+    node.balances['0x' + '11' * 20] = 2
+    assert tellor.balance_of('0x' + '11' * 20) == 1
+    node.head += 1
+    assert tellor.balance_of('0x' + '11' * 20) == 2
+    assert tellor.cache.stats()['misses'] == 2
+
+
+def test_lru_eviction():
+    cache = CallCache(maxsize=2)
+    for key in 'abc':
+        cache.set(key, key)
+    assert len(cache) == 2 and cache.evictions == 1
+    assert cache.get('b') == 'b'
+
+
+def test_disputed_values_are_not_cached(node):
+    tellor = Tellor(Network.MAINNET, cache=CallCache(head_ttl=0))
+    timestamp = node.value_blocks(1)[0] * 15
+    assert tellor.call.retrieveData(1, timestamp) == 1002
+    # opening a dispute zeroes the value, a failed one puts it back
+    node.values_in_dispute.add((1, timestamp))
+    node.head += 1
+    assert tellor.call.retrieveData(1, timestamp) == 0
+    node.values_in_dispute.clear()
+    node.head += 1
+    assert tellor.call.retrieveData(1, timestamp) == 1002
@@ -1,8 +1,17 @@
+import os
+import pickle
+import subprocess
+import sys
+
 import pytest
 from hexbytes import HexBytes
 from web3.datastructures import AttributeDict
 
+from tellor import log_decoders
 from tellor.auto import tellor
+from tellor.constants import Network, TELLOR_ADDRESS
+from tellor.dispute import Value, parse_dispute
+from tellor.testing import FakeNode, serve
 
 receipt_good = [
     AttributeDict(
@@ -95,6 +104,35 @@ def test_decode_logs(logs, events):
     assert tellor.decode_logs(logs) == events
 
 
+@pytest.mark.parametrize("logs,events", [(receipt_good, events_good), (receipt_bad, events_bad)])
+def test_decode_log_tuples(logs, events):
+    decoded = log_decoders.decode_log_tuples(logs, tellor.logs_decoders)
+    assert decoded == [
+        (event.event, event.blockNumber, event.logIndex, tuple(event.args[name] for name in names))
+        for event, names in zip(events, [tellor.logs_decoders[log.topics[0]].names for log in logs])
+    ]
+
+
+@pytest.mark.parametrize("logs,events", [(receipt_good, events_good), (receipt_bad, events_bad)])
+def test_decode_logs_compact(logs, events):
+    records = tellor.decode_logs(logs, compact=True)
+    assert [record.event for record in records] == [event.event for event in events]
+    for record, event, log in zip(records, events, logs):
+        assert (record.block_number, record.log_index) == (event.blockNumber, event.logIndex)
+        assert record[3:] == tuple(event.args[name] for name in tellor.logs_decoders[log.topics[0]].names)
+        assert not hasattr(record, '__dict__')
+
+
+def test_slotted_records():
+    value = Value(1, 2, ['0x'], [3])
+    assert not hasattr(value, '__dict__')
+    assert pickle.loads(pickle.dumps(value)) == value
+    dispute = parse_dispute(1, [b'\x01' * 32, True, True, False, '0x1', '0x2', '0x3', [1, 2, 3, 4, 5, 6, 7, 10, 9], 4])
+    assert not hasattr(dispute, '__dict__')
+    assert (dispute.yays, dispute.nays) == (7, 3)
+    assert isinstance(dispute.yays + dispute.nays, int) and str(dispute.fee) == '9E-18 trb'
+
+
 fn_good = HexBytes(
     "0x68c180d500000000000000000000000000000000000000000000000000000000000000600000000000000000000000000000000000000000000000000000000000000001000000000000000000000000000000000000000000000000000000000002bcbe000000000000000000000000000000000000000000000000000000000000002535383038313431333937393838383130393136323536303434333135363434353036303535000000000000000000000000000000000000000000000000000000"
 )
@@ -126,3 +164,18 @@ fn_tip_decoded = (
 ])
 def test_decode_func(data, decoded):
     assert tellor.decode_func(data) == decoded
+
+
+def test_auto_is_lazy():
+    node = FakeNode(network=Network.RINKEBY)
+    server, url = serve(node)
+    code = 'import tellor.auto as auto; print(auto.network.name, auto.tellor.address)'
+    try:
+        env = {**os.environ, 'WEB3_HTTP_PROVIDER_URI': url}
+        subprocess.run([sys.executable, '-c', 'import tellor.auto'], env=env, check=True)
+        assert node.requests == []
+        out = subprocess.run([sys.executable, '-c', code], env=env, check=True, capture_output=True, text=True)
+        assert out.stdout.split() == ['RINKEBY', TELLOR_ADDRESS[Network.RINKEBY]]
+        assert node.requests == ['web3_clientVersion', 'eth_chainId']
+    finally:
+        server.shutdown()
@@ -0,0 +1,82 @@
+import pytest
+from web3 import HTTPProvider
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.dispute_analyzer import DisputeAnalyzer
+from tellor.testing import serve
+
+E18 = 10 ** 18
+voters = [w3.toChecksumAddress(f'0x{i:040x}') for i in range(1, 5)]
+
+
+@pytest.fixture
+def node(make_node):
+    node = make_node(blocks=4_000)
+    node.uint_vars[w3.keccak(text='disputeCount')] = 2
+    for i, voter in enumerate(voters, 1):
+        node.set_balance(voter, i * E18, node.genesis)
+        # later balances must not count
+        node.set_balance(voter, 100 * E18, node.genesis + 1000)
+    return node
+
+
+def set_dispute(node, dispute_id, executed, votes, block_number):
+    yays = sum(node.call_balanceOfAt(None, voter, block_number) for voter, position in votes if position)
+    nays = sum(node.call_balanceOfAt(None, voter, block_number) for voter, position in votes if not position)
+    uint_vars = [1, block_number * 15, 1002, 0, len(votes), block_number, 2, yays + nays, 10 * E18]
+    node.disputes[dispute_id] = [
+        dispute_id.to_bytes(32, 'big'), executed, yays > nays, False,
+        node.miners[2], voters[0], '0x' + '00' * 20, uint_vars, yays - nays,
+    ]
+
+
+def test_dispute_histories(node, tmp_path):
+    genesis = node.genesis
+    node.emit(genesis + 1001, 'NewDispute', _disputeId=1, _requestId=1, _timestamp=genesis * 15, _miner=node.miners[2])
+    node.emit(genesis + 1010, 'Voted', _disputeID=1, _position=True, _voter=voters[0])
+    node.emit(genesis + 1010, 'Voted', _disputeID=1, _position=False, _voter=voters[1])
+    node.emit(genesis + 1011, 'Voted', _disputeID=1, _position=True, _voter=voters[2])
+    node.emit(genesis + 1500, 'DisputeVoteTallied', _disputeID=1, _result=2 * E18, _reportedMiner=node.miners[2],
+              _reportingParty=voters[0], _active=True)
+    set_dispute(node, 1, True, [(voters[0], True), (voters[1], False), (voters[2], True)], genesis)
+    node.emit(genesis + 2001, 'NewDispute', _disputeId=2, _requestId=2, _timestamp=(genesis + 40) * 15, _miner=node.miners[2])
+    node.emit(genesis + 2010, 'Voted', _disputeID=2, _position=False, _voter=voters[3])
+    set_dispute(node, 2, False, [(voters[3], False)], genesis + 40)
+
+    path = str(tmp_path / 'disputes.pickle')
+    histories = DisputeAnalyzer(Tellor(Network.MAINNET), path).update()
+    first = histories[1]
+    assert [vote.weight for vote in first.votes] == [E18, 2 * E18, 3 * E18]
+    assert (first.yays, first.nays) == (4 * E18, 2 * E18)
+    assert first.yays == first.dispute.yays and first.nays == first.dispute.nays
+    assert (first.opened_at, first.tallied_at) == (genesis + 1001, genesis + 1500)
+    assert all(history.reconciled for history in histories.values())
+    assert histories[2].tallied_at is None
+
+    # a new vote in the open dispute, the rest comes from the saved state
+    node.head += 100
+    node.emit(node.head, 'Voted', _disputeID=2, _position=True, _voter=voters[0])
+    set_dispute(node, 2, False, [(voters[3], False), (voters[0], True)], genesis + 40)
+    node.requests.clear()
+    histories = DisputeAnalyzer(Tellor(Network.MAINNET), path).update()
+    assert node.requests.count('eth_getLogs') == 1
+    assert node.requests.count('eth_call') == 3  # dispute count, open dispute and a new weight
+    assert histories[1] == first
+    assert [vote.voter for vote in histories[2].votes] == [voters[3], voters[0]]
+    assert histories[2].reconciled
+
+
+def test_update_over_http(node):
+    genesis = node.genesis
+    node.emit(genesis + 1001, 'NewDispute', _disputeId=1, _requestId=1, _timestamp=genesis * 15, _miner=node.miners[2])
+    node.emit(genesis + 1010, 'Voted', _disputeID=1, _position=True, _voter=voters[0])
+    set_dispute(node, 1, False, [(voters[0], True)], genesis)
+    node.uint_vars[w3.keccak(text='disputeCount')] = 1
+    server, url = serve(node)
+    try:
+        histories = DisputeAnalyzer(Tellor(Network.MAINNET, provider=HTTPProvider(url))).update()
+        assert [vote.weight for vote in histories[1].votes] == [E18]
+    finally:
+        server.shutdown()
@@ -0,0 +1,61 @@
+import pytest
+from web3.auto import w3
+
+from tellor import log_decoders
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.dispute import Value
+
+np = pytest.importorskip('numpy')
+export = pytest.importorskip('tellor.export')
+
+
+def test_events_to_arrays(node):
+    tellor = Tellor(Network.MAINNET)
+    logs = w3.eth.getLogs({'address': tellor.address, 'fromBlock': node.genesis, 'toBlock': node.genesis + 2000})
+    arrays = export.events_to_arrays(tellor.decode_logs(logs))
+    assert len(arrays['NonceSubmitted']) == 5 * len(arrays['NewValue'])
+    assert arrays['NonceSubmitted'].dtype['miner'] == np.dtype('S20')
+    assert arrays['NewValue'].dtype['value'] == np.dtype('i8')
+    from_tuples = export.events_to_arrays(log_decoders.decode_log_tuples(logs, tellor.logs_decoders))
+    assert (from_tuples['NewValue'] == arrays['NewValue']).all()
+    from_records = export.events_to_arrays(tellor.decode_logs(logs, compact=True))
+    for name in ['NewValue', 'NonceSubmitted']:
+        assert (from_records[name] == arrays[name]).all()
+    values = export.submissions_to_values(arrays['NonceSubmitted'], arrays['NewValue'])
+    keys = list(zip(values['request_id'].tolist(), values['timestamp'].tolist()))
+    assert (export.values_to_array(tellor.get_value_many(keys)) == values).all()
+
+
+def test_values_round_trip():
+    miners = [f'0x{i:040x}' for i in range(1, 6)]
+    values = [Value(1, 100, miners, [5, 1, 4, 2, 3]), Value(2, 200, miners, [2 ** 200, 1, 2, 3, 4]), None]
+    array = export.values_to_array(values)
+    assert array.dtype['values'].base == np.dtype('O')
+    assert export.array_to_values(array) == values[:2]
+    assert export.medians(array).tolist() == [3, 3]
+
+
+def test_helpers():
+    miners = [f'0x{i:040x}' for i in range(1, 6)]
+    values = [
+        Value(1, 0, miners, [90, 100, 100, 100, 110]),
+        Value(1, 60, miners, [200, 200, 200, 200, 200]),
+        Value(1, 3600, miners, [300, 300, 300, 300, 300]),
+        Value(2, 0, miners, [10, 10, 10, 10, 10]),
+    ]
+    array = export.values_to_array(values)
+    assert export.deviation(array)[0].tolist() == [-0.1, 0, 0, 0, 0.1]
+    stats = export.miner_deviation(array)
+    assert stats['count'].tolist() == [4] * 5
+    assert stats['max'].tolist() == pytest.approx([0.1, 0, 0, 0, 0.1])
+    assert export.bucket(array['timestamp'], 3600).tolist() == [0, 0, 3600, 0]
+    assert export.bucket_medians(array, 3600).tolist() == [(1, 0, 2, 200), (1, 3600, 1, 300), (2, 0, 1, 10)]
+
+
+def test_to_arrow():
+    pa = pytest.importorskip('pyarrow')
+    miners = [f'0x{i:040x}' for i in range(1, 6)]
+    table = export.to_arrow(export.values_to_array([Value(1, 100, miners, [2 ** 200, 1, 2, 3, 4])]))
+    assert table.schema.field('miners').type == pa.list_(pa.binary(20), 5)
+    assert table.column('values').to_pylist() == [[str(2 ** 200), '1', '2', '3', '4']]
@@ -0,0 +1,67 @@
+import pytest
+from web3 import HTTPProvider
+
+from tellor.constants import TELLOR_GENESIS, Network
+from tellor.contract import Tellor
+from tellor.testing import FakeNode, serve
+
+
+@pytest.fixture
+def node(make_node):
+    return make_node(blocks=1_000)
+
+
+def test_follow_with_reorg(node):
+    follower = Tellor(Network.MAINNET).follow(events=['NewValue'], confirmations=2)
+    assert follower.poll() == []
+
+    node.head += 80
+    events = follower.poll()
+    assert [event.blockNumber for event in events] == [node.genesis + 1_000, node.genesis + 1_040]
+    assert follower.poll() == []
+
+    node.reorg(node.genesis + 1_030)
+    node.head += 40
+    events = follower.poll()
+    assert [(event.blockNumber, event.removed) for event in events] == [
+        (node.genesis + 1_040, True),
+        (node.genesis + 1_040, False),
+        (node.genesis + 1_080, False),
+    ]
+    assert events[0].blockHash != events[1].blockHash
+
+
+def test_reorg_while_fetching_logs(node):
+    tellor = Tellor(Network.MAINNET)
+    follower = tellor.follow(events=['NewValue'])
+    follower.poll()
+    get_logs = tellor._get_logs
+
+    def reorg_after(params):
+        logs = get_logs(params)
+        node.reorg(node.genesis + 1_030)
+        return logs
+
+    tellor._get_logs = reorg_after
+    node.head += 60
+    # the hash of the last block is already from the new branch
+    assert [event.blockNumber for event in follower.poll()] == [node.genesis + 1_040]
+    tellor._get_logs = get_logs
+    node.head += 1
+    events = follower.poll()
+    assert [(event.blockNumber, event.removed) for event in events] == [
+        (node.genesis + 1_040, True),
+        (node.genesis + 1_040, False),
+    ]
+
+
+def test_follow_over_http():
+    node = FakeNode(head=TELLOR_GENESIS[Network.MAINNET] + 1_000)
+    server, url = serve(node)
+    try:
+        follower = Tellor(Network.MAINNET, provider=HTTPProvider(url)).follow(events=['NewValue'])
+        assert follower.poll() == []
+        node.head += 80
+        assert [event.blockNumber for event in follower.poll()] == [node.genesis + 1_040, node.genesis + 1_080]
+    finally:
+        server.shutdown()
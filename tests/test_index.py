@@ -0,0 +1,74 @@
+import pytest
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.index import EventIndex
+from tellor.instrumentation import Instrumentation
+
+
+@pytest.fixture
+def node(make_node):
+    return make_node(blocks=4_000)
+
+
+def test_incremental_sync_and_reorg(node, tmp_path):
+    index = EventIndex(str(tmp_path / 'index.db'), Tellor(Network.MAINNET))
+    assert index.sync() == 101 * 6
+    assert index.checkpoint == node.head
+    assert len(index.query('NewValue')) == 101
+    assert len(index.query('NewValue', request_id=1)) == 21
+    assert index.query('NonceSubmitted', miner=node.miners[0], limit=1)[0]['miner'] == node.miners[0]
+
+    node.head += 400
+    assert index.sync() == 10 * 6
+
+    # blocks from the last value on are replaced
+    node.reorg(node.head - 30)
+    node.head += 40
+    assert index.sync() == 2 * 6
+    assert len(index.query('NewValue')) == 101 + 10 + 1
+
+
+def test_removed_logs(node):
+    tellor = Tellor(Network.MAINNET)
+    index = EventIndex(':memory:', tellor)
+    logs = w3.eth.getLogs({'fromBlock': node.genesis, 'toBlock': node.genesis})
+    index.add_logs(logs)
+    assert len(index.query('NonceSubmitted')) == 5
+    index.add_logs([{**log, 'removed': True} for log in logs[:2]])
+    assert len(index.query('NonceSubmitted')) == 3
+
+
+def test_query_order_by(node):
+    index = EventIndex(':memory:', Tellor(Network.MAINNET))
+    index.sync(node.genesis + 400)
+    rows = index.query('NewValue', order_by='request_id desc, block_number', limit=2)
+    assert [row['request_id'] for row in rows] == [5, 5]
+    assert rows[0]['block_number'] < rows[1]['block_number']
+    for order_by in ['block_number; drop table blocks', 'nonsense', 'block_number sideways']:
+        with pytest.raises(ValueError):
+            index.query('NewValue', order_by=order_by)
+
+
+def test_wide_integers(node):
+    sender, receiver = node.miners[:2]
+    amounts = [5, 2 ** 63 - 1, 2 ** 63, 10 ** 24, 2 ** 256 - 1]
+    for i, value in enumerate(amounts):
+        node.emit(node.genesis + 1 + i, 'Transfer', _from=sender, _to=receiver, _value=value)
+    for i, result in enumerate([-10 ** 24, -(2 ** 63) - 1, -5, 0, 10 ** 24], 1):
+        node.emit(node.genesis + 10 + i, 'DisputeVoteTallied', _disputeID=i, _result=result, _reportedMiner=sender,
+                  _reportingParty=receiver, _active=False)
+    instrumentation = Instrumentation()
+    index = EventIndex(':memory:', Tellor(Network.MAINNET, instrumentation=instrumentation))
+    index.sync(node.genesis + 20)
+    # only the indexed events are fetched, through the instrumented wrapper
+    assert instrumentation.stats()['logs', 'eth_getLogs']['items'] == 5 + 5 + 6
+
+    rows = index.query('Transfer', value=(2 ** 63 - 1, 10 ** 24))
+    assert [row['value'] for row in rows] == amounts[1:4]
+    assert [row['value'] for row in index.query('Transfer', order_by='value desc', limit=2)] == [2 ** 256 - 1, 10 ** 24]
+    results = [row['result'] for row in index.query('DisputeVoteTallied', order_by='result')]
+    assert results == sorted(results)
+    rows = index.query('DisputeVoteTallied', result=(-(2 ** 63) - 1, 0))
+    assert [row['result'] for row in rows] == [-(2 ** 63) - 1, -5, 0]
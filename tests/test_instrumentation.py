@@ -0,0 +1,60 @@
+import pytest
+from web3 import Web3
+from web3.auto import w3
+
+from tellor.cache import CallCache
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.instrumentation import Instrumentation, InstrumentedCaller
+from tellor.testing import FakeProvider
+
+
+@pytest.fixture
+def node(make_node):
+    return make_node(blocks=400)
+
+
+def test_instrumentation(node):
+    observed = []
+    instrumentation = Instrumentation(hooks=[lambda *args: observed.append(args)])
+    tellor = Tellor(Network.MAINNET, cache=CallCache(), instrumentation=instrumentation)
+    timestamps = [number * 15 for number in node.value_blocks(1)]
+    for timestamp in timestamps:
+        tellor.get_value(1, timestamp)
+    tellor.get_value_many([(1, timestamp) for timestamp in timestamps])
+    events = tellor.get_logs(fromBlock=node.genesis, toBlock=node.head)
+    tx = w3.eth.getBlock(node.genesis, True)['transactions'][0]
+    tellor.decode_func(tx['input'])
+
+    stats = instrumentation.stats()
+    assert stats['call', 'getMinersByRequestIdAndTimestamp']['calls'] == len(timestamps)
+    batch = stats['multicall', 'getMinersByRequestIdAndTimestamp+getSubmissionsByTimestamp']
+    assert batch['calls'] == 1 and batch['items'] == 2 * len(timestamps)
+    assert stats['logs', 'eth_getLogs']['items'] == len(events)
+    assert stats['logs', 'eth_getLogs']['size'] > 0
+    assert stats['decode_logs', 'dict']['items'] == len(events)
+    assert stats['decode_func', 'submitMiningSolution']['size'] == len(tx['input']) // 2 - 1
+    assert instrumentation.top(1)[0][0] == ('call', 'getMinersByRequestIdAndTimestamp')
+    assert len(observed) == sum(x['calls'] for x in stats.values())
+
+    text = instrumentation.to_prometheus()
+    assert f'tellor_requests_seconds_count{{kind="call",name="getSubmissionsByTimestamp"}} {len(timestamps)}' in text
+    assert f'tellor_items_total{{kind="logs",name="eth_getLogs"}} {len(events)}' in text
+    assert 'tellor_cache_misses_total{cache="0"} ' in text
+
+
+def test_rpc_middleware(node):
+    instrumentation = Instrumentation()
+    web3 = Web3(FakeProvider(node))
+    web3.middleware_onion.inject(instrumentation.middleware, 'instrumentation', layer=0)
+    web3.eth.blockNumber
+    web3.eth.getLogs({'fromBlock': node.genesis, 'toBlock': node.head})
+    stats = instrumentation.stats()
+    assert stats['rpc', 'eth_blockNumber']['calls'] == 1
+    assert stats['rpc', 'eth_getLogs']['size'] > stats['rpc', 'eth_blockNumber']['size']
+
+
+def test_disabled(node):
+    tellor = Tellor(Network.MAINNET)
+    assert tellor.instrumentation is None and tellor.multicall.instrumentation is None
+    assert not isinstance(tellor.call, InstrumentedCaller)
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+from web3 import HTTPProvider
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.ledger import TRANSFER_TOPIC, ZERO_ADDRESS, Ledger
+from tellor.testing import serve
+
+E18 = 10 ** 18
+holders = [w3.toChecksumAddress(f'0x{i:040x}') for i in range(1, 21)]
+
+
+@pytest.fixture
+def node(make_node):
+    return make_node(blocks=4_000)
+
+
+def transfer(node, number, sender, receiver, value):
+    node.emit(number, 'Transfer', _from=sender, _to=receiver, _value=value)
+    if sender != node.address:
+        node.set_balance(sender, node.call_balanceOfAt(None, sender, number) - value, number)
+    if int(receiver, 16):
+        node.set_balance(receiver, node.call_balanceOfAt(None, receiver, number) + value, number)
+
+
+def test_ledger_matches_balance_of_at(node):
+    rng = random.Random(42)
+    for number in range(node.genesis, node.head, 10):
+        # mining rewards come from the contract
+        transfer(node, number, node.address, rng.choice(holders), 5 * E18)
+        sender, receiver = rng.sample(holders, 2)
+        balance = node.call_balanceOfAt(None, sender, number)
+        if balance:
+            transfer(node, number, sender, receiver, rng.randint(1, balance))
+    transfer(node, node.head, holders[0], '0x' + '00' * 20, node.balances[holders[0].lower()])
+
+    tellor = Tellor(Network.MAINNET)
+    ledger = Ledger(tellor)
+    assert ledger.sync(to_block=node.head - 2000) > 0
+    assert ledger.sync() > 0
+    assert len(ledger) == len(holders)
+    keys = [(address, rng.randrange(node.genesis - 10, node.head + 10)) for address in holders * 5]
+    assert [ledger.balance_of_at(*key) for key in keys] == tellor.balance_of_at_many(keys)
+    assert [ledger.balance_of(address) for address in holders] == tellor.balance_of_many(holders)
+    assert ledger.balance_of(holders[0]) == 0
+    assert ledger.total_supply() == sum(node.balances.values())
+    top = ledger.top(3)
+    assert top == ledger.holders()[:3]
+    assert [balance for _, balance in top] == sorted(node.balances.values(), reverse=True)[:3]
+    assert ledger.checkpoints(holders[1])[-1][1] == ledger.balance_of(holders[1])
+
+
+def test_seed():
+    ledger = Ledger(mint_addresses=[])
+    with pytest.raises(ValueError):
+        ledger.apply(1, holders[0], holders[1], 1)
+    ledger.seed({holders[0]: 10}, 1)
+    ledger.apply(2, holders[0], holders[1], 4)
+    ledger.apply(2, holders[1], holders[2], 1)
+    assert ledger.holders() == [(holders[0], 6), (holders[1], 3), (holders[2], 1)]
+    assert ledger.holders(1) == [(holders[0], 10)]
+    assert ledger.checkpoints(holders[1]) == [(2, 3)]
+
+
+def test_transfers_to_the_contract(node):
+    # a mining reward, then a tip paid back into the contract
+    transfer(node, node.genesis + 10, node.address, holders[0], 10 * E18)
+    transfer(node, node.genesis + 20, holders[0], node.address, 3 * E18)
+    server, url = serve(node)
+    try:
+        ledger = Ledger(Tellor(Network.MAINNET, provider=HTTPProvider(url)))
+        assert ledger.sync() == 2
+    finally:
+        server.shutdown()
+    assert ledger.balance_of(holders[0]) == 7 * E18
+    assert ledger.total_supply() == 7 * E18
+    assert ledger.total_supply(node.genesis + 10) == 10 * E18
+    assert ledger.holders() == [(holders[0], 7 * E18)]
+    assert ledger.balance_of(node.address) == ledger.balance_of(ZERO_ADDRESS) == 0
+
+    tellor = Tellor(Network.MAINNET)
+    records = tellor.get_logs(compact=True, fromBlock=node.genesis, toBlock=node.head, topics=[TRANSFER_TOPIC])
+    from_records = Ledger(tellor)
+    from_records.add_events(records)
+    assert from_records.checkpoints(holders[0]) == ledger.checkpoints(holders[0])
+    assert from_records.total_supply() == ledger.total_supply()
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+from web3 import Web3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.log_files import convert, detect_format, read_logs, read_packed, write_logs
+from tellor.parallel import LogDecoderPool
+from tellor.testing import FakeProvider
+
+
+@pytest.fixture
+def node(make_node):
+    return make_node(blocks=2000)
+
+
+@pytest.fixture
+def logs(node):
+    return Web3(FakeProvider(node)).eth.getLogs({'fromBlock': node.genesis, 'toBlock': node.head})
+
+
+@pytest.mark.parametrize('format', ['binary', 'jsonl'])
+def test_round_trip(node, logs, tmp_path, format):
+    tellor = Tellor(Network.MAINNET)
+    path = str(tmp_path / 'logs')
+    assert write_logs(path, logs[:100], format) == 100
+    assert write_logs(path, logs[100:], format, append=True) == len(logs) - 100
+    assert detect_format(path) == format
+    assert list(read_logs(path)) == [dict(log) for log in logs]
+    assert list(tellor.decode_file(path)) == tellor.decode_logs(logs)
+    assert list(tellor.decode_file(path, compact=True)) == tellor.decode_logs(logs, compact=True)
+
+
+def test_json_dump(node, logs, tmp_path):
+    dump = tmp_path / 'logs.json'
+    dump.write_text(json.dumps(node.eth_getLogs({'fromBlock': node.genesis, 'toBlock': node.head}), indent=2))
+    assert detect_format(str(dump)) == 'json'
+    assert list(read_logs(str(dump))) == [dict(log) for log in logs]
+
+    path = str(tmp_path / 'logs.bin')
+    assert convert(str(dump), path) == len(logs)
+    assert (tmp_path / 'logs.bin').stat().st_size < dump.stat().st_size / 2
+    with LogDecoderPool(workers=1) as pool:
+        decoded = list(pool.decode_packed(read_packed(path, chunksize=100)))
+    assert decoded == Tellor(Network.MAINNET).decode_logs(logs)
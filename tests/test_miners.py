@@ -0,0 +1,79 @@
+import pytest
+from web3 import HTTPProvider
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.miners import MinerLeaderboard
+from tellor.testing import serve
+from tellor.types import StakerStatus
+
+E18 = 10 ** 18
+
+
+@pytest.fixture
+def node(make_node):
+    node = make_node(blocks=2000)
+    for i, miner in enumerate(node.miners):
+        node.stakers[miner.lower()] = StakerStatus.STAKED
+        for number in node.value_blocks(i + 1):
+            node.emit(number, 'Transfer', _from=node.address, _to=miner, _value=(i + 1) * E18)
+    node.emit(node.genesis + 500, 'Transfer', _from=node.miners[0], _to=node.miners[1], _value=1000 * E18)
+    for dispute_id, number, result in [(1, node.genesis + 700, 10), (2, node.genesis + 900, -10)]:
+        node.emit(
+            number, 'DisputeVoteTallied', _disputeID=dispute_id, _result=result,
+            _reportedMiner=node.miners[2], _reportingParty=node.miners[0], _active=False,
+        )
+    node.emit(node.genesis + 1200, 'StakeWithdrawRequested', _sender=node.miners[3])
+    return node
+
+
+def test_leaderboard(node, tmp_path):
+    tellor = Tellor(Network.MAINNET)
+    path = str(tmp_path / 'miners.pickle')
+    leaderboard = MinerLeaderboard(tellor, path, period=1000)
+    assert leaderboard.update(to_block=node.genesis + 1000) == 5
+    slots = len(range(node.genesis, node.genesis + 1001, node.value_interval))
+    assert [stats.submissions for stats in leaderboard.top(5)] == [slots] * 5
+    assert leaderboard[node.miners[2]].disputes_lost == leaderboard[node.miners[2]].disputes_won == 1
+    assert leaderboard.top(1, by='disputes_lost')[0].miner == node.miners[2]
+
+    # catch up from the checkpoint in a new process
+    node.stakers[node.miners[3].lower()] = StakerStatus.WITHDRAWING
+    leaderboard = MinerLeaderboard(tellor, path, period=1000)
+    node.requests.clear()
+    leaderboard.update()
+    assert node.requests.count('eth_getLogs') == 2
+    assert leaderboard.checkpoint == node.head
+
+    # every miner gets a reward for the request id it's named after, for every value
+    rewards = [(i + 1) * E18 * len(node.value_blocks(i + 1)) for i in range(5)]
+    assert [stats.rewards for stats in leaderboard.top(5, by='rewards')] == sorted(rewards, reverse=True)
+    assert leaderboard[node.miners[3]].status == StakerStatus.WITHDRAWING
+    assert leaderboard[node.miners[0]].status == StakerStatus.STAKED
+    assert sum(leaderboard[node.miners[0]].requests.values()) == leaderboard[node.miners[0]].submissions
+
+    value_blocks = range(node.genesis, node.head + 1, node.value_interval)
+    rollups = leaderboard.rollups()
+    assert sum(rollup.submissions for rollup in rollups) == 5 * len(value_blocks)
+    assert sum(rollup.rewards for rollup in rollups) == sum(rewards)
+    rollup = leaderboard.rollup(node.genesis + 1500)
+    assert rollup.start_block <= node.genesis + 1500 < rollup.start_block + 1000
+    in_period = [number for number in value_blocks if rollup.start_block <= number < rollup.start_block + 1000]
+    assert rollup.miners[node.miners[4]][0] == rollup.submissions // 5 == len(in_period)
+    assert leaderboard.rollups(node.genesis + 1500, node.genesis + 1500) == [rollup]
+
+    with pytest.raises(ValueError):
+        MinerLeaderboard(tellor, path, period=5760)
+
+
+def test_update_over_http(node):
+    expected = MinerLeaderboard(Tellor(Network.MAINNET))
+    expected.update()
+    server, url = serve(node)
+    try:
+        leaderboard = MinerLeaderboard(Tellor(Network.MAINNET, provider=HTTPProvider(url)))
+        assert leaderboard.update() == 5
+    finally:
+        server.shutdown()
+    assert leaderboard.miners == expected.miners
+    assert leaderboard[node.miners[0]].rewards > 0
@@ -0,0 +1,55 @@
+import pytest
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.testing import DIFFICULTY
+
+
+@pytest.fixture
+def node(make_node):
+    node = make_node(blocks=401)
+    node.uint_vars[DIFFICULTY] = 1000
+    return node
+
+
+def test_snapshot(node):
+    tellor = Tellor(Network.MAINNET)
+    node.requests.clear()
+    snapshot = tellor.snapshot()
+    assert node.requests.count('eth_call') == 1
+    assert snapshot.block_number == node.head
+    assert snapshot.current_variables == tellor.current_variables
+    assert snapshot.challenge == (node.genesis + 440).to_bytes(32, 'big')
+    assert snapshot.difficulty == tellor.difficulty == 1000
+    assert snapshot.slot_progress == tellor.slot_progress == 0
+    assert snapshot.staker_count == tellor.staker_count
+    assert snapshot.dispute_fee == tellor.dispute_fee
+    assert snapshot.on_deck.request == snapshot.current_variables.request % 5 + 1
+    assert len(snapshot.request_q) == 51
+    assert tellor.snapshot(node.head - 2).current_variables.request == snapshot.current_variables.request - 1
+
+
+def test_monitor(node):
+    tellor = Tellor(Network.MAINNET)
+    monitor = tellor.monitor(min_interval=0.01, max_interval=5, block_time=2)
+    assert monitor.poll() == [] and monitor.requests == 2
+    assert monitor.poll() == [] and monitor.requests == 3
+
+    node.head += 8
+    assert [(x.field, x.old, x.new) for x in monitor.poll()] == [('slot_progress', 0, 1)]
+
+    node.head += 32
+    node.uint_vars[DIFFICULTY] = 1100
+    changes = {x.field: x for x in monitor.poll()}
+    assert set(changes) == {'challenge', 'request', 'tip', 'difficulty', 'slot_progress', 'on_deck'}
+    assert changes['challenge'].new == (node.genesis + 480).to_bytes(32, 'big')
+    assert changes['difficulty'].block_number == node.head
+    assert monitor.requests == 7
+    assert 0.01 <= monitor.next_interval() <= 5
+    assert monitor.block_time < 2
+
+    monitor = tellor.monitor(fields=['difficulty'])
+    monitor.poll()
+    node.head += 40
+    node.uint_vars[DIFFICULTY] = 1200
+    assert [x.field for x in monitor.poll()] == ['difficulty']
@@ -0,0 +1,46 @@
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+
+
+def test_balance_of_many(node):
+    tellor = Tellor(Network.MAINNET)
+    tellor.multicall.max_calls = 10
+    addresses = [w3.toChecksumAddress(f'0x{i:040x}') for i in range(1, 26)]
+    for i, address in enumerate(addresses):
+        node.balances[address.lower()] = i * 10 ** 18
+    node.requests.clear()
+    assert tellor.balance_of_many(addresses) == [tellor.balance_of(address) for address in addresses]
+    assert node.requests.count('eth_call') == 3 + len(addresses)
+
+
+def test_get_value_many(node):
+    tellor = Tellor(Network.MAINNET)
+    keys = [(1, node.value_blocks(1)[0] * 15), (2, node.value_blocks(2)[3] * 15), (1, 1)]
+    assert tellor.get_value_many(keys) == [tellor.get_value(*key) for key in keys]
+    assert tellor.get_value_many(keys)[-1] is None
+
+
+def test_iter_values(node):
+    node.head = node.genesis + 20_000
+    tellor = Tellor(Network.MAINNET)
+    count = tellor.call.getNewValueCountbyRequestId(1)
+    expected = [
+        tellor.get_value(1, tellor.call.getTimestampbyRequestIDandIndex(1, index))
+        for index in range(count)
+    ]
+    node.requests.clear()
+    assert list(tellor.iter_values(1, batch_size=50)) == expected
+    batches = -(-count // 50)
+    assert node.requests.count('eth_call') == 1 + 2 * batches
+    assert list(tellor.iter_values(1, reverse=True, batch_size=7)) == expected[::-1]
+    assert list(tellor.iter_values(1, start=10, end=20)) == expected[10:20]
+    values = tellor.iter_values(1, batch_size=10, workers=2)
+    head = [next(values) for _ in range(15)]
+    values.close()
+    assert head + list(tellor.iter_values(1, start=15)) == expected
+    pairs = list(tellor.iter_values(1, reverse=True, batch_size=7, with_index=True))
+    assert pairs == list(enumerate(expected))[::-1]
+    index, _ = pairs[14]
+    assert pairs[:15] + list(tellor.iter_values(1, end=index, reverse=True, with_index=True)) == pairs
@@ -0,0 +1,94 @@
+import random
+import statistics
+
+import pytest
+from web3 import HTTPProvider
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.outliers import OutlierDetector, RollingStats, median_mad
+from tellor.testing import serve
+
+
+def test_median_mad():
+    random.seed(1)
+    for _ in range(1000):
+        values = sorted(random.randrange(100) for _ in range(random.randint(1, 40)))
+        median = statistics.median(values)
+        assert median_mad(values) == (median, statistics.median(abs(x - median) for x in values))
+
+
+def test_rolling_stats():
+    random.seed(2)
+    stats = RollingStats(window=50)
+    values = [random.randrange(1000) for _ in range(500)]
+    for i, value in enumerate(values):
+        stats.add(value)
+        window = sorted(values[max(0, i - 49):i + 1])
+        assert len(stats) == len(window)
+        assert stats.median_mad() == median_mad(window)
+        assert stats.quantile(0.9) == window[int(0.9 * len(window))]
+
+
+def slot(block_number, request_id, values, miners=None):
+    challenge = block_number.to_bytes(32, 'big')
+    miners = miners or [f'0x{i:040x}' for i in range(1, 6)]
+    events = [
+        ('NonceSubmitted', block_number, i, (miner, '', request_id, value, challenge))
+        for i, (miner, value) in enumerate(zip(miners, values))
+    ]
+    events.append(('NewValue', block_number, 5, (request_id, block_number * 15, sorted(values)[2], 0, challenge)))
+    return events
+
+
+def test_flags():
+    detector = OutlierDetector(min_history=5)
+    events = []
+    for i in range(20):
+        events += slot(100 + i, 1, [1000 + i, 1001 + i, 1002 + i, 1003 + i, 1004 + i])
+    assert detector.add_events(events) == []
+    assert detector.submissions == 100
+
+    flags = detector.add_events(slot(200, 1, [1010, 1011, 1012, 1013, 5000]))
+    assert [(flag.value, flag.reason, flag.request_id, flag.timestamp) for flag in flags] == [(5000, 'slot', 1, 3000)]
+    assert flags[0].median == 1012 and flags[0].score > 100
+
+    # the whole slot moved away from the history
+    flags = detector.add_events(slot(201, 1, [2000, 2001, 2002, 2003, 2004]))
+    assert [flag.reason for flag in flags] == ['history'] * 5
+    # other requests have their own history
+    assert detector.add_events(slot(202, 2, [2000, 2001, 2002, 2003, 2004])) == []
+
+
+@pytest.fixture
+def node(make_node):
+    return make_node(blocks=4000)
+
+
+def test_replay_and_enrich(node):
+    bad = node.value_blocks(3)[5]
+    node.submit(bad, [1000, 1001, 1002, 1003, 9999])
+    node.values_in_dispute.add((3, bad * 15))
+    tellor = Tellor(Network.MAINNET)
+    detector = OutlierDetector(tellor)
+    flags = detector.update(to_block=node.head - 1000)
+    assert detector.submissions == len(range(node.genesis, node.head - 999, node.value_interval)) * 5
+    assert flags == [(3, bad * 15, node.miners[4], 9999, 'slot', 1002, flags[0].score, bad, True)]
+
+    bad = node.value_blocks(1)[-1]
+    node.submit(bad, [1, 1000, 1001, 1002, 1003])
+    flags = detector.update()
+    assert [(flag.block_number, flag.value, flag.in_dispute) for flag in flags] == [(bad, 1, False)]
+    assert detector.checkpoint == node.head
+
+
+def test_update_over_http(node):
+    bad = node.value_blocks(2)[3]
+    node.submit(bad, [1000, 1001, 1002, 1003, 9999])
+    server, url = serve(node)
+    try:
+        detector = OutlierDetector(Tellor(Network.MAINNET, provider=HTTPProvider(url)))
+        flags = detector.update()
+    finally:
+        server.shutdown()
+    assert [(flag.block_number, flag.value, flag.in_dispute) for flag in flags] == [(bad, 9999, False)]
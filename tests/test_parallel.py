@@ -0,0 +1,45 @@
+import json
+
+import pytest
+from web3 import Web3
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.parallel import LogDecoderPool
+from tellor.raw_logs import format_log, pack_logs, unpack_logs
+from tellor.testing import FakeProvider
+
+
+@pytest.fixture
+def node(make_node):
+    return make_node(blocks=2000)
+
+
+def test_pack_logs(node):
+    logs = Web3(FakeProvider(node)).eth.getLogs({'fromBlock': node.genesis, 'toBlock': node.head})
+    assert unpack_logs(pack_logs(logs)) == [dict(log) for log in logs]
+    raw = node.eth_getLogs({'fromBlock': node.genesis, 'toBlock': node.head})
+    assert pack_logs(raw) == pack_logs(logs)
+    assert [format_log(log) for log in raw] == [dict(log) for log in logs]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+@pytest.mark.parametrize('compact', [False, True])
+def test_decoder_pool(node, workers, compact):
+    tellor = Tellor(Network.MAINNET)
+    logs = w3.eth.getLogs({'fromBlock': node.genesis, 'toBlock': node.head})
+    expected = tellor.decode_logs(logs, compact)
+    with LogDecoderPool(workers, chunksize=37, compact=compact) as pool:
+        decoded = list(pool.decode(logs))
+        assert decoded == expected
+        assert [type(event) for event in decoded] == [type(event) for event in expected]
+        raw = node.eth_getLogs({'fromBlock': node.genesis, 'toBlock': node.head})
+        lines = [json.dumps(log) + '\n' for log in raw]
+        assert list(pool.decode_jsonl(lines)) == expected
+    assert pool.seen == 2 * len(logs) and pool.decoded == 2 * len(expected)
+
+
+def test_iter_logs_processes(node):
+    tellor = Tellor(Network.MAINNET)
+    assert list(tellor.iter_logs(processes=2)) == list(tellor.iter_logs())
@@ -0,0 +1,94 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+import requests
+from web3 import Web3
+
+from tellor.constants import TELLOR_GENESIS, Network
+from tellor.contract import Tellor
+from tellor.pool import PooledProvider
+from tellor.testing import FakeNode, FakeProvider, serve
+
+
+def dead_url():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return f'http://127.0.0.1:{s.getsockname()[1]}'
+
+
+@pytest.fixture
+def nodes():
+    nodes, servers = [], []
+    for latency in [0, 0.01, 0.02]:
+        node = FakeNode(head=TELLOR_GENESIS[Network.MAINNET] + 1000, latency=latency)
+        server, node.url = serve(node)
+        nodes.append(node)
+        servers.append(server)
+    yield nodes
+    for server in servers:
+        server.shutdown()
+
+
+def test_tellor_with_pool(nodes):
+    provider = PooledProvider([node.url for node in nodes])
+    tellor = Tellor(Network.MAINNET, provider=provider)
+    expected = Tellor(Network.MAINNET, provider=FakeProvider(FakeNode(head=nodes[0].head)))
+    timestamps = [number * 15 for number in nodes[0].value_blocks(1)]
+    for timestamp in timestamps:
+        assert tellor.get_value(1, timestamp) == expected.get_value(1, timestamp)
+    assert list(tellor.iter_logs(workers=2)) == list(expected.iter_logs())
+    stats = provider.stats()
+    assert sum(x['requests'] for x in stats) == sum(len(node.requests) for node in nodes)
+    assert sum(1 for node in nodes if node.requests) >= 2
+    assert all(x['errors'] == 0 for x in stats)
+
+
+def test_failover(nodes):
+    provider = PooledProvider([dead_url(), nodes[0].url, dead_url()], backoff=0.01)
+    web3 = Web3(provider)
+    for _ in range(20):
+        assert web3.eth.blockNumber == nodes[0].head
+    dead = [provider.stats()[0], provider.stats()[2]]
+    assert all(x['errors'] == x['requests'] for x in dead)
+    assert sum(x['errors'] for x in dead) >= 1
+    assert provider.stats()[1]['errors'] == 0
+
+    provider = PooledProvider([dead_url(), dead_url()], retries=2, backoff=0.01)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        Web3(provider).eth.blockNumber
+    assert sum(x['requests'] for x in provider.stats()) == 3
+
+
+def test_hedging(nodes):
+    fast, slow = nodes[0], nodes[2]
+    slow.latency = 0.2
+    provider = PooledProvider([fast.url, slow.url], hedge_delay=0.1)
+    web3 = Web3(provider)
+    for _ in range(30):
+        web3.eth.blockNumber
+    assert provider.stats()[0]['p95'] < slow.latency
+
+    # the preferred endpoint stalls, requests are answered by the other one
+    hedged = provider.stats()[0]['hedged']
+    fast.latency = 2.0
+    began = time.perf_counter()
+    assert web3.eth.blockNumber == fast.head
+    assert time.perf_counter() - began < 1.0
+    assert provider.stats()[0]['hedged'] == hedged + 1
+
+    total = sum(x['hedged'] for x in provider.stats())
+    provider.hedge_methods = frozenset()
+    slow.latency = 0
+    web3.eth.blockNumber
+    assert sum(x['hedged'] for x in provider.stats()) == total
+
+
+def test_auto_pool(nodes):
+    code = 'import tellor.auto as auto; print(auto.network.name, type(auto.tellor.w3.provider).__name__)'
+    env = {**os.environ, 'TELLOR_PROVIDER_URIS': ','.join(node.url for node in nodes)}
+    out = subprocess.run([sys.executable, '-c', code], env=env, check=True, capture_output=True, text=True)
+    assert out.stdout.split() == ['MAINNET', 'PooledProvider']
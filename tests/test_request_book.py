@@ -0,0 +1,66 @@
+import pytest
+from web3 import HTTPProvider
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.request_book import RequestBook
+from tellor.testing import serve
+
+SENDER = '0x5522eCa38e7C376F96d29F963ae9eEAE14F27a47'
+
+
+@pytest.fixture
+def node(make_node):
+    node = make_node(blocks=1000)
+    for request_id, symbol in enumerate(['BTC/USD', 'ETH/USD', 'TRB/USD'], 1):
+        node.add_request(request_id, f'json(https://example.com/{symbol})', symbol, total_tip=request_id * 10)
+    return node
+
+
+def test_request_book(node):
+    book = RequestBook(Tellor(Network.MAINNET))
+    node.requests.clear()
+    assert book.update() == 0
+    assert node.requests.count('eth_call') == 2
+    assert len(book) == 3 and book.checkpoint == node.head
+    assert [x.request_id for x in book.top(2)] == [3, 2]
+    assert book[1].query_hash == node.data_requests[1][2]
+
+    start = node.head
+    node.emit(start + 1, 'TipAdded', _sender=SENDER, _requestId=1, _tip=50, _totalTips=60)
+    node.emit(start + 2, 'DataRequested', _sender=SENDER, _query='json(https://example.com/XAU/USD)',
+              _querySymbol='XAU/USD', _granularity=1000, _requestId=4, _totalTips=40)
+    node.emit(start + 3, 'NewChallenge', _currentChallenge=b'\x01' * 32, _currentRequestId=3, _difficulty=1,
+              _multiplier=1, _query='', _totalTips=30)
+    node.emit(start + 3, 'NewRequestOnDeck', _requestId=2, _query='', _onDeckQueryHash=b'\x02' * 32, _onDeckTotalTips=25)
+    node.emit(start + 6000, 'TipAdded', _sender=SENDER, _requestId=4, _tip=5, _totalTips=45)
+    node.head += 6000
+    assert book.update() == 5
+
+    assert book.most_tipped().request_id == 1
+    assert [(x.request_id, x.total_tip) for x in book.top(5)] == [(1, 60), (4, 45), (2, 25), (3, 0)]
+    assert book[4].symbol == 'XAU/USD' and book[4].query_hash == book.tellor.contract.web3.solidityKeccak(
+        ['string', 'uint256'], ['json(https://example.com/XAU/USD)', 1000]
+    )
+    assert book.on_deck == 2
+    assert [x.request_id for x in book.top_tipped(1)] == [1]
+    buckets = book.tips_over_time(interval=5760)
+    assert sum(tips for _, tips in buckets) == 55 and len(buckets) == 2
+    assert book.tips_over_time(4) == [(node.head - node.head % 5760, 5)]
+
+    fresh = RequestBook(book.tellor)
+    fresh.bootstrap()
+    assert len(fresh) == 3
+
+
+def test_update_over_http(node):
+    server, url = serve(node)
+    try:
+        book = RequestBook(Tellor(Network.MAINNET, provider=HTTPProvider(url)))
+        book.update()
+        node.emit(node.head + 1, 'TipAdded', _sender=SENDER, _requestId=1, _tip=50, _totalTips=60)
+        node.head += 10
+        assert book.update() == 1
+        assert book[1].total_tip == 60
+    finally:
+        server.shutdown()
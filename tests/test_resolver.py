@@ -0,0 +1,64 @@
+import pytest
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.resolver import BlockResolver
+from tellor.testing import FakeNode
+
+
+class IrregularNode(FakeNode):
+    def block_timestamp(self, number):
+        return 13 * number + number % 5
+
+
+@pytest.fixture
+def node(make_node):
+    return make_node(node_class=IrregularNode)
+
+
+def brute_force(node, timestamp):
+    return max(number for number in range(node.genesis, node.head + 1) if node.block_timestamp(number) <= timestamp)
+
+
+def test_block_at(node):
+    resolver = Tellor(Network.MAINNET).resolver()
+    timestamps = [node.block_timestamp(node.genesis + 12_345), node.block_timestamp(node.genesis + 50_000) + 3]
+    timestamps += [node.block_timestamp(node.genesis) + 1, node.block_timestamp(node.head) - 1]
+    assert resolver.block_at_many(timestamps) == [brute_force(node, timestamp) for timestamp in timestamps]
+    assert resolver.block_at(node.block_timestamp(node.genesis) - 1) is None
+    assert resolver.block_at(node.block_timestamp(node.head) + 100) == node.head
+    assert resolver.timestamp_of(node.genesis + 777) == node.block_timestamp(node.genesis + 777)
+
+    # resolved queries stay local
+    requests = resolver.requests
+    assert resolver.block_at_many(timestamps) == [brute_force(node, timestamp) for timestamp in timestamps]
+    assert resolver.requests == requests
+
+
+def test_bulk_join(make_node):
+    node = make_node()
+    tellor = Tellor(Network.MAINNET)
+    values = list(tellor.iter_values(1, end=200))
+    resolver = tellor.resolver()
+    resolver.build(step=1000)
+    requests = resolver.requests
+    assert resolver.block_at_many(value.timestamp for value in values) == list(node.value_blocks(1)[:200])
+    # interpolation hits the exact block right away
+    assert resolver.requests - requests <= 2 * len(values)
+
+
+def test_persist(node, tmp_path):
+    path = str(tmp_path / 'blocks.idx')
+    resolver = BlockResolver(w3, node.genesis, path)
+    timestamp = node.block_timestamp(node.genesis + 4321) + 2
+    block = resolver.block_at(timestamp)
+    resolver.save()
+
+    loaded = BlockResolver(w3, node.genesis, path)
+    assert list(loaded.blocks) == list(resolver.blocks) and list(loaded.timestamps) == list(resolver.timestamps)
+    assert loaded.block_at(timestamp) == block and loaded.requests == 0
+
+    (tmp_path / 'bad.idx').write_bytes(b'nonsense')
+    with pytest.raises(ValueError):
+        BlockResolver(w3, node.genesis, str(tmp_path / 'bad.idx'))
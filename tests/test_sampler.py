@@ -0,0 +1,87 @@
+import pytest
+
+from tellor.cache import CallCache
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.sampler import Point
+
+HOLDER = '0x' + '11' * 20
+
+
+@pytest.fixture
+def node(make_node):
+    node = make_node()
+    start = node.genesis
+    for block, value in [(start, 1000), (start + 12_345, 1100), (start + 12_346, 1200), (start + 70_001, 900)]:
+        node.set_uint_var('difficulty', value, block)
+    for block, value in [(start, 80), (start + 50_000, 81)]:
+        node.set_uint_var('stakerCount', value, block)
+    node.set_balance(HOLDER, 10, start)
+    node.set_balance(HOLDER, 15, start + 99_000)
+    return node
+
+
+def test_pinned_getters(node):
+    tellor = Tellor(Network.MAINNET)
+    past = tellor.at(node.genesis + 20_000)
+    assert tellor.difficulty == 900 and past.difficulty == 1200
+    assert tellor.staker_count == 81 and past.staker_count == 80
+    assert past.current_variables.difficulty == 1200
+    assert tellor.total_supply == 15 and past.total_supply == 10
+    assert tellor.balance_of(HOLDER) == 15
+    assert tellor.balance_of(HOLDER, block_identifier=node.genesis) == past.balance_of(HOLDER) == 10
+    assert past.balance_of(HOLDER, block_identifier='latest') == 15
+    assert past.balance_of_at(HOLDER, node.head) == past.balance_of_at_many([(HOLDER, node.head)])[0] == 10
+    assert tellor.balance_of_at(HOLDER, node.head, block_identifier=node.genesis + 20_000) == 10
+    assert tellor.balance_of_at_many([(HOLDER, node.head)], block_identifier=node.genesis + 20_000) == [10]
+    assert tellor.snapshot(node.genesis + 12_345).difficulty == past.at(node.genesis + 12_345).snapshot().difficulty == 1100
+    assert tellor.block_identifier == 'latest'
+
+
+def test_pinned_reads_are_cached(node):
+    tellor = Tellor(Network.MAINNET, cache=CallCache(head_ttl=60))
+    block = node.genesis + 20_000
+    assert tellor.at(block).difficulty == 1200
+    node.requests.clear()
+    assert tellor.at(block).difficulty == 1200
+    assert tellor.difficulty == 900
+    assert node.requests.count('eth_call') == 1
+
+
+def test_sampler(node):
+    tellor = Tellor(Network.MAINNET)
+    sampler = tellor.sampler(['difficulty', 'staker_count', 'total_supply'])
+    series = sampler.series()
+    start = node.genesis
+    assert series['difficulty'] == [
+        Point(start, 1000), Point(start + 12_345, 1100), Point(start + 12_346, 1200), Point(start + 70_001, 900)
+    ]
+    assert series['staker_count'] == [Point(start, 80), Point(start + 50_000, 81)]
+    assert series['total_supply'] == [Point(start, 10), Point(start + 99_000, 15)]
+    # a few changes over 100k blocks take a few dozen reads
+    assert sampler.requests == node.requests.count('eth_call') < 100
+
+    # memoized
+    node.requests.clear()
+    assert sampler.series() == series
+    assert sampler.requests < 100 and 'eth_call' not in node.requests
+
+    coarse = tellor.sampler(['difficulty'], resolution=1000).changes()
+    assert [change.new for change in coarse] == [1200, 900]
+    assert all(0 <= change.block_number - block < 1000 for change, block in zip(coarse, [start + 12_346, start + 70_001]))
+
+    with pytest.raises(ValueError):
+        tellor.sampler(['nonsense'])
+
+
+def test_sampler_step(node):
+    start = node.genesis
+    node.set_uint_var('difficulty', 1000, start + 70_000)
+    node.set_uint_var('difficulty', 1200, start + 70_100)
+    tellor = Tellor(Network.MAINNET)
+    # the value at both ends is the same, only a grid sees the changes in between
+    assert tellor.sampler(['difficulty']).changes(start + 60_000, start + 80_000) == []
+    changes = tellor.sampler(['difficulty']).changes(start + 60_000, start + 80_000, step=1000)
+    assert [(change.block_number - start, change.old, change.new) for change in changes] == [
+        (70_000, 1200, 1000), (70_001, 1000, 900), (70_100, 900, 1200)
+    ]
@@ -0,0 +1,33 @@
+import pytest
+from web3.auto import w3
+
+from tellor.constants import Network
+from tellor.contract import Tellor
+from tellor.transactions import TransactionDecoder
+
+
+@pytest.fixture
+def node(make_node):
+    return make_node(blocks=400)
+
+
+def test_iter_transactions(node):
+    tellor = Tellor(Network.MAINNET)
+    txs = [tx for number in range(node.genesis, node.head + 1) for tx in w3.eth.getBlock(number, True)['transactions']]
+    expected = [tellor.decode_func(tx['input']) for tx in txs if tx['to'] == tellor.address]
+    decoded = list(tellor.iter_transactions(block_workers=4))
+    assert [(tx.fn_name, tx.args) for tx in decoded] == expected
+    assert {tx.fn_name for tx in decoded} == {'submitMiningSolution', 'addTip'}
+    assert [(tx.block_number, tx.transaction_index) for tx in decoded] == sorted(
+        (tx['blockNumber'], tx['transactionIndex']) for tx in txs if tx['to'] == tellor.address
+    )
+
+
+def test_process_pool(node):
+    tellor = Tellor(Network.MAINNET)
+    txs = [tx for number in range(node.genesis, node.head + 1) for tx in w3.eth.getBlock(number, True)['transactions']]
+    with TransactionDecoder(tellor.address, workers=2, chunksize=7) as decoder:
+        decoded = list(decoder(txs))
+    assert decoded == list(tellor.decode_transactions(txs))
+    assert decoder.seen == len(txs) and decoder.decoded == len(decoded)
+    assert decoder.rate > 0